@@ -9,33 +9,47 @@ from __future__ import print_function
 from __future__ import division
 from __future__ import absolute_import
 
-import glob
+import atexit
+import heapq
+import itertools
 import multiprocessing
 import os
+import resource
 import shlex
 import shutil
 import signal
 import sys
+import threading
 import time
 import traceback
 import zipfile
 
-from threading import Timer
-
 import psutil
 
 from codechecker_analyzer import env
-from codechecker_common import plist_parser
+from codechecker_common import plist_parser, result_manifest
 from codechecker_common.logger import get_logger
+from codechecker_common.output_formatters import twodim_to_str
 
+from . import dependency_index
+from . import distributed
+from . import failure_collector
 from . import gcc_toolchain
+from . import memory_governor
+from . import tracer
 
 from .analyzers import analyzer_types
 from .analyzers.clangsa.analyzer import ClangSA
 from .analyzers.clangsa.statistics_collector import SpecialReturnValueCollector
+from .analyzers.clangtidy.analyzer import ClangTidy
+from .analyzers.clangtidy.result_handler import \
+    generate_plists_from_batch_result
 
 LOG = get_logger('analyzer')
 
+# Number of the slowest analyses printed in the summary.
+SLOWEST_ANALYSES_NUM = 10
+
 
 def print_analyzer_statistic_summary(statistics, status, msg=None):
     """
@@ -54,9 +68,36 @@ def print_analyzer_statistic_summary(statistics, status, msg=None):
             LOG.info("  %s: %s", analyzer_type, successful)
 
 
-def worker_result_handler(results, metadata, output_path, analyzer_binaries):
+def print_slowest_analyses(resource_usage, limit=SLOWEST_ANALYSES_NUM):
+    """
+    Print the analyses with the longest wall time.
     """
-    Print the analysis summary.
+    analyses = [(analyzer_type, usage)
+                for analyzer_type, usages in resource_usage.items()
+                for usage in usages]
+    if not analyses:
+        return
+
+    analyses.sort(key=lambda analysis: analysis[1]['wall_time'],
+                  reverse=True)
+
+    rows = [[os.path.basename(usage['source']),
+             analyzer_type,
+             '%.2f' % usage['wall_time'],
+             '%.2f' % (usage['user_time'] + usage['sys_time']),
+             usage['max_rss'] // (1024 * 1024)]
+            for analyzer_type, usage in analyses[:limit]]
+
+    LOG.info("Slowest analyses:\n%s",
+             twodim_to_str('table', ['File', 'Analyzer', 'Wall time (s)',
+                                     'CPU time (s)', 'Max RSS (MB)'], rows))
+
+
+@tracer.traced('Merge results into metadata')
+def worker_result_handler(results, metadata, output_path, analyzer_binaries,
+                          sharded=False):
+    """
+    Print the analysis summary and write the manifest of the result files.
     """
 
     if metadata is None:
@@ -65,8 +106,14 @@ def worker_result_handler(results, metadata, output_path, analyzer_binaries):
     skipped_num = 0
     reanalyzed_num = 0
     statistics = {}
+    resource_usage = {}
+    memory_usage = {}
+
+    # The analyzed source files of the result files.
+    source_map = {}
 
-    for res, skipped, reanalyzed, analyzer_type, _, sources in results:
+    for res, skipped, reanalyzed, analyzer_type, result_file, sources, \
+            usage in results:
         if skipped:
             skipped_num += 1
         else:
@@ -82,15 +129,37 @@ def worker_result_handler(results, metadata, output_path, analyzer_binaries):
                     "failed": 0,
                     "failed_sources": [],
                     "successful": 0,
-                    "version": analyzer_version
+                    "version": analyzer_version,
+                    "analysis_time": 0,
+                    "cpu_time": 0,
+                    "max_rss": 0,
+                    "output_size": 0
                 }
 
             if res == 0:
                 statistics[analyzer_type]['successful'] += 1
+                if result_file:
+                    source_map[result_file] = sources.replace(r'\ ', ' ')
             else:
                 statistics[analyzer_type]['failed'] += 1
                 statistics[analyzer_type]['failed_sources'].append(sources)
 
+            if usage:
+                stat = statistics[analyzer_type]
+                stat['analysis_time'] += usage['wall_time']
+                stat['cpu_time'] += usage['user_time'] + usage['sys_time']
+                stat['max_rss'] = max(stat['max_rss'], usage['max_rss'])
+                stat['output_size'] += usage['output_size']
+
+                usage = dict(usage, source=sources)
+                resource_usage.setdefault(analyzer_type, []).append(usage)
+
+                # The peak memory usage of a batch is not the memory usage of
+                # its source files.
+                if not usage.get('batch_size'):
+                    memory_usage[memory_governor.get_memory_usage_key(
+                        analyzer_type, sources)] = usage['max_rss']
+
     LOG.info("----==== Summary ====----")
     print_analyzer_statistic_summary(statistics,
                                      'successful',
@@ -100,6 +169,8 @@ def worker_result_handler(results, metadata, output_path, analyzer_binaries):
                                      'failed',
                                      'Failed to analyze')
 
+    print_slowest_analyses(resource_usage)
+
     if reanalyzed_num:
         LOG.info("Reanalyzed compilation commands: %d", reanalyzed_num)
     if skipped_num:
@@ -107,60 +178,56 @@ def worker_result_handler(results, metadata, output_path, analyzer_binaries):
 
     metadata['skipped'] = skipped_num
     metadata['analyzer_statistics'] = statistics
+    metadata['resource_usage'] = resource_usage
 
-    # check() created the result .plist files and additional, per-analysis
-    # meta information in forms of .plist.source files.
-    # We now soak these files into the metadata dict, as they are not needed
-    # as loose files on the disk... but synchronizing LARGE dicts between
-    # threads would be more error prone.
-    source_map = {}
-    for f in glob.glob(os.path.join(output_path, "*.source")):
-        with open(f, 'r') as sfile:
-            source_map[f[:-7]] = sfile.read().strip()
-        os.remove(f)
+    memory_governor.save_memory_usage(output_path, memory_usage)
 
-    for f in glob.glob(os.path.join(output_path, 'failed', "*.error")):
-        err_file, _ = os.path.splitext(f)
-        plist_file = os.path.basename(err_file) + ".plist"
-        plist_file = os.path.join(output_path, plist_file)
-        metadata['result_source_files'].pop(plist_file, None)
+    # The result files and their source files are returned by check(), so
+    # they are merged into the metadata without touching the output
+    # directory.
+    metadata.setdefault('result_source_files', {}).update(source_map)
 
-    metadata['result_source_files'].update(source_map)
+    # The result files of the previous analyses are also listed, only the
+    # ones written by this analysis have to be checked.
+    with tracer.span('Write result manifest'):
+        result_manifest.write(output_path, metadata['result_source_files'],
+                              sharded, source_map)
 
 
 # Progress reporting.
 progress_checked_num = None
 progress_actions = None
 
+# The memory governor which admits the analyzers of the worker process.
+analysis_memory_governor = None
+
 
-def init_worker(checked_num, action_num):
-    global progress_checked_num, progress_actions
+def init_worker(checked_num, action_num, governor=None):
+    global progress_checked_num, progress_actions, analysis_memory_governor
     progress_checked_num = checked_num
     progress_actions = action_num
+    analysis_memory_governor = governor
+    tracer.set_process_name('Analysis worker')
 
 
-def save_output(base_file_name, out, err):
+def save_output(base_file_name, out_file, err_file):
     try:
-        if out:
-            with open(base_file_name + ".stdout.txt", 'w') as outf:
-                outf.write(out)
-
-        if err:
-            with open(base_file_name + ".stderr.txt", 'w') as outf:
-                outf.write(err)
-    except IOError as ioerr:
+        if out_file and os.path.getsize(out_file):
+            shutil.copyfile(out_file, base_file_name + ".stdout.txt")
+
+        if err_file and os.path.getsize(err_file):
+            shutil.copyfile(err_file, base_file_name + ".stderr.txt")
+    except (IOError, OSError) as ioerr:
         LOG.debug("Failed to save analyzer output")
         LOG.debug(ioerr)
 
 
-def save_metadata(result_file, analyzer_result_file, analyzed_source_file):
+def save_result_file(result_file, analyzer_result_file):
     """
-    Save some extra information next to the plist, .source
-    acting as an extra metadata file.
+    Move the result file of the analyzer to its final place. The analyzed
+    source file of the result file is returned by check() and it is saved
+    to the metadata by worker_result_handler().
     """
-    with open(result_file + ".source", 'w') as orig:
-        orig.write(analyzed_source_file.replace(r'\ ', ' ') + "\n")
-
     if os.path.exists(analyzer_result_file) and \
             not os.path.exists(result_file):
         os.rename(analyzer_result_file, result_file)
@@ -179,10 +246,13 @@ def is_ctu_active(source_analyzer):
 
 def prepare_check(action, analyzer_config_map, output_dir,
                   severity_map, skip_handler, statistics_data,
-                  disable_ctu=False):
+                  disable_ctu=False, sharded=False):
     """
     Construct the source analyzer build the analysis command
     and result handler for the analysis.
+
+    If sharded is True, the result file goes to a subdirectory of the output
+    directory.
     """
     reanalyzed = False
 
@@ -221,6 +291,7 @@ def prepare_check(action, analyzer_config_map, output_dir,
                                                   output_dir,
                                                   severity_map,
                                                   skip_handler)
+    rh.sharded = sharded
 
     # NOTICE!
     # The currently analyzed source file needs to be set before the
@@ -238,6 +309,7 @@ def prepare_check(action, analyzer_config_map, output_dir,
     return source_analyzer, analyzer_cmd, rh, reanalyzed
 
 
+@tracer.traced('Postprocess result')
 def handle_success(rh, result_file, result_base, skip_handler,
                    capture_analysis_output, success_dir):
     """
@@ -248,26 +320,28 @@ def handle_success(rh, result_file, result_base, skip_handler,
     """
     if capture_analysis_output:
         save_output(os.path.join(success_dir, result_base),
-                    rh.analyzer_stdout, rh.analyzer_stderr)
+                    rh.analyzer_stdout_file, rh.analyzer_stderr_file)
 
     rh.postprocess_result()
     # Generated reports will be handled separately at store.
 
-    save_metadata(result_file, rh.analyzer_result_file,
-                  rh.analyzed_source_file)
+    save_result_file(result_file, rh.analyzer_result_file)
 
     if skip_handler:
         # We need to check the plist content because skipping
         # reports in headers can be done only this way.
-        plist_parser.skip_report_from_plist(result_file,
-                                            skip_handler)
+        with tracer.span('Skip reports'):
+            plist_parser.skip_report_from_plist(result_file,
+                                                skip_handler)
 
 
+@tracer.traced('Create failure archive')
 def handle_failure(source_analyzer, rh, zip_file, result_base, actions_map):
     """
     If the analysis fails a debug zip is packed together which contains
-    build, analysis information and source files to be able to
-    reproduce the failed analysis.
+    build and analysis information. The source files to be able to
+    reproduce the failed analysis are collected to it after the analysis by
+    the failure collector.
     """
     other_files = set()
     action = rh.buildaction
@@ -306,21 +380,18 @@ def handle_failure(source_analyzer, rh, zip_file, result_base, actions_map):
         else:
             LOG.debug("Could not find %s in build actions.", key)
 
-    from tu_collector import tu_collector
-
-    tu_collector.zip_tu_files(zip_file, buildactions)
-
-    # TODO: What about the dependencies of the other_files?
-    tu_collector.add_sources_to_zip(
-        zip_file,
-        map(lambda path: os.path.join(action.directory, path), other_files))
-
-    with zipfile.ZipFile(zip_file, 'a') as archive:
+    with zipfile.ZipFile(zip_file, 'w') as archive:
         LOG.debug("[ZIP] Writing analyzer STDOUT to /stdout")
-        archive.writestr("stdout", rh.analyzer_stdout)
+        if rh.analyzer_stdout_file and os.path.exists(rh.analyzer_stdout_file):
+            archive.write(rh.analyzer_stdout_file, "stdout")
+        else:
+            archive.writestr("stdout", rh.analyzer_stdout)
 
         LOG.debug("[ZIP] Writing analyzer STDERR to /stderr")
-        archive.writestr("stderr", rh.analyzer_stderr)
+        if rh.analyzer_stderr_file and os.path.exists(rh.analyzer_stderr_file):
+            archive.write(rh.analyzer_stderr_file, "stderr")
+        else:
+            archive.writestr("stderr", rh.analyzer_stderr)
 
         LOG.debug("[ZIP] Writing extra information...")
         archive.writestr("build-action", action.original_command)
@@ -332,6 +403,12 @@ def handle_failure(source_analyzer, rh, zip_file, result_base, actions_map):
         if toolchain:
             archive.writestr("gcc-toolchain-path", toolchain)
 
+    # The source files are collected after the analysis.
+    # TODO: What about the dependencies of the other_files?
+    failure_collector.defer_source_collection(
+        zip_file, buildactions,
+        [os.path.join(action.directory, path) for path in other_files])
+
     LOG.debug("ZIP file written at '%s'", zip_file)
 
     # Remove files that successfully analyzed earlier on.
@@ -376,6 +453,155 @@ def kill_process_tree(parent_pid, recursive=False):
         n += 1
 
 
+class ProcessWatchdog(object):
+    """
+    Kills the watched processes which run longer than their timeout.
+
+    A single thread watches every process registered in the current worker
+    process, instead of starting a new timer thread for every analyzer
+    invocation. The deadlines are stored in a heap, and the thread sleeps
+    until the earliest one.
+    """
+
+    def __init__(self):
+        self.__cond = threading.Condition()
+        self.__deadlines = []
+        self.__counter = itertools.count()
+        self.__stopped = False
+
+        self.__thread = threading.Thread(target=self.__run,
+                                         name='ProcessWatchdog')
+        self.__thread.daemon = True
+        self.__thread.start()
+
+    def stop(self):
+        """
+        Stop the watchdog thread. The processes which are still watched are
+        not killed anymore.
+        """
+        with self.__cond:
+            self.__stopped = True
+            self.__cond.notify()
+
+        self.__thread.join()
+
+    def watch(self, pid, timeout, failure_callback=None):
+        """
+        Register a process to be killed after `timeout` seconds. Returns the
+        watch object which can be passed to `cancel()`.
+        """
+        watch = {'pid': pid,
+                 'counting': True,
+                 'killed': False,
+                 'failure_callback': failure_callback}
+
+        with self.__cond:
+            watch['entry'] = (time.time() + timeout, next(self.__counter),
+                              watch)
+            heapq.heappush(self.__deadlines, watch['entry'])
+            self.__cond.notify()
+
+        return watch
+
+    def cancel(self, watch):
+        """
+        Stop watching the process of the given watch. Returns whether or not
+        the process was killed by the watchdog.
+        """
+        with self.__cond:
+            if watch['counting']:
+                # The deadline is removed, so the watchdog thread does not
+                # wake up for it if no other processes are watched.
+                watch['counting'] = False
+                self.__deadlines.remove(watch['entry'])
+                heapq.heapify(self.__deadlines)
+
+            return watch['killed']
+
+    def __next_expired(self):
+        """
+        Wait for the earliest deadline which expires while its process is
+        still watched, and return its watch. None is returned if the watchdog
+        is stopped.
+        """
+        with self.__cond:
+            while True:
+                if self.__stopped:
+                    return None
+
+                if not self.__deadlines:
+                    self.__cond.wait()
+                    continue
+
+                deadline, _, watch = self.__deadlines[0]
+                remaining = deadline - time.time()
+                if remaining > 0:
+                    self.__cond.wait(remaining)
+                    continue
+
+                heapq.heappop(self.__deadlines)
+                watch['counting'] = False
+                watch['killed'] = True
+                return watch
+
+    def __run(self):
+        """
+        Kill the processes of the expired watches.
+        """
+        while True:
+            watch = self.__next_expired()
+            if not watch:
+                return
+
+            # Stopping a process tree may take seconds, so it is done in a
+            # separate thread which does not delay the other deadlines.
+            # These threads are started only for the killed processes.
+            kill_thread = threading.Thread(target=self.__kill,
+                                           args=(watch,),
+                                           name='ProcessWatchdogKill')
+            kill_thread.daemon = False
+            kill_thread.start()
+
+    @staticmethod
+    def __kill(watch):
+        """
+        Helper function to execute the killing of a hung process.
+        """
+        LOG.debug("Process %s has ran for too long, killing it!",
+                  watch['pid'])
+        try:
+            kill_process_tree(watch['pid'], True)
+        except psutil.NoSuchProcess:
+            pass
+
+        if watch['failure_callback']:
+            watch['failure_callback']()
+
+
+# The process watchdog of the current process and the process identifier it
+# was started in. Threads are not inherited by forked worker processes, so
+# every worker process starts its own watchdog.
+_watchdog = (None, None)
+
+
+def get_process_watchdog():
+    """
+    Returns the process watchdog of the current process.
+    """
+    global _watchdog
+
+    pid, watchdog = _watchdog
+    if pid != os.getpid():
+        watchdog = ProcessWatchdog()
+        _watchdog = (os.getpid(), watchdog)
+
+        # The thread is stopped before the interpreter shuts down, so it is
+        # not woken up while the modules are torn down.
+        atexit.register(watchdog.stop)
+
+    return watchdog
+
+
 def setup_process_timeout(proc, timeout,
                           failure_callback=None):
     """
@@ -396,37 +622,14 @@ def setup_process_timeout(proc, timeout,
       subprocess.Process.communicate())) figures out that the called process
       has terminated. (See below for what this called function returns.)
     """
+    watchdog = get_process_watchdog()
+    watch = watchdog.watch(proc.pid, timeout, failure_callback)
 
-    # The watch dict encapsulated the captured variables for the timeout watch.
-    watch = {'pid': proc.pid,
-             'timer': None,  # Will be created later.
-             'counting': False,
-             'killed': False}
-
-    def __kill():
-        """
-        Helper function to execute the killing of a hung process.
-        """
-        LOG.debug("Process %s has ran for too long, killing it!",
-                  watch['pid'])
-        watch['counting'] = False
-        watch['killed'] = True
-        kill_process_tree(watch['pid'], True)
-
-        if failure_callback:
-            failure_callback()
-
-    timer = Timer(timeout, __kill)
-    watch['timer'] = timer
-
-    LOG.debug("Setup timeout of %s for PID %s", proc.pid, timeout)
-    timer.start()
-    watch['counting'] = True
+    LOG.debug("Setup timeout of %s for PID %s", timeout, proc.pid)
 
     def __cleanup_timeout():
         """
-        Stops the timer associated with the timeout watch if the process
-        finished within the grace period.
+        Stops watching the process if it finished within the grace period.
 
         Due to race conditions and the possibility of the OS, or another
         process also using signals to kill the watched process in particular,
@@ -444,16 +647,12 @@ def setup_process_timeout(proc, timeout,
           is False, the process could have finished gracefully, or could have
           been destroyed by other means.
         """
-        if watch['counting'] and not watch['killed'] and watch['timer']:
-            watch['timer'].cancel()
-            watch['timer'] = None
-            watch['counting'] = False
-
-        return watch['killed']
+        return watchdog.cancel(watch)
 
     return __cleanup_timeout
 
 
+@tracer.traced('Check')
 def check(check_data):
     """
     Invoke clang with an action which called by processes.
@@ -463,13 +662,14 @@ def check(check_data):
     """
     actions_map, action, context, analyzer_config_map, \
         output_dir, skip_handler, quiet_output_on_stdout, \
-        capture_analysis_output, analysis_timeout, \
-        analyzer_environment, ctu_reanalyze_on_failure, \
+        capture_analysis_output, analysis_timeout, cpu_timeout, \
+        memory_limit, analyzer_environment, ctu_reanalyze_on_failure, \
         output_dirs, statistics_data = check_data
 
     failed_dir = output_dirs["failed"]
     success_dir = output_dirs["success"]
 
+    rh = None
     try:
         # If one analysis fails the check fails.
         return_codes = 0
@@ -480,39 +680,66 @@ def check(check_data):
         source_analyzer, analyzer_cmd, rh, reanalyzed = \
             prepare_check(action, analyzer_config_map,
                           output_dir, context.severity_map,
-                          skip_handler, statistics_data)
+                          skip_handler, statistics_data,
+                          sharded=output_dirs['sharded'])
 
         # The analyzer invocation calls __create_timeout as a callback
         # when the analyzer starts. This callback creates the timeout
         # watcher over the analyzer process, which in turn returns a
         # function, that can later be used to check if the analyzer quit
-        # because we killed it due to a timeout.
+        # because we killed it due to a timeout. It also starts measuring
+        # the memory usage of the analyzer if the memory governor is used.
         #
         # We need to capture the "function pointer" returned by
         # setup_process_timeout as reference, so that we may call it
         # later. To work around scoping issues, we use a list here so the
         # "function pointer" is captured by reference.
         timeout_cleanup = [lambda: False]
-
-        if analysis_timeout and analysis_timeout > 0:
-            def __create_timeout(analyzer_process):
-                """
-                Once the analyzer process is started, this method is
-                called. Set up a timeout for the analysis.
-                """
+        memory_job = None
+
+        def __create_timeout(analyzer_process):
+            """
+            Once the analyzer process is started, this method is
+            called. Set up a timeout for the analysis.
+            """
+            if analysis_timeout and analysis_timeout > 0:
                 timeout_cleanup[0] = setup_process_timeout(
                     analyzer_process, analysis_timeout)
-        else:
-            def __create_timeout(analyzer_process):
-                # If no timeout is given by the client, this callback
-                # shouldn't do anything.
-                pass
+
+            if memory_job:
+                memory_job.track(analyzer_process)
+
+        # The CPU time limit is enforced by the kernel, which sends SIGXCPU
+        # to the analyzer process when it is exceeded. The address space
+        # limit makes the memory allocations of the analyzer fail.
+        resource_limits = {}
+        if cpu_timeout and cpu_timeout > 0:
+            resource_limits[resource.RLIMIT_CPU] = cpu_timeout
+        if memory_limit and memory_limit > 0:
+            resource_limits[resource.RLIMIT_AS] = memory_limit * 1024 * 1024
 
         result_file_exists = os.path.exists(rh.analyzer_result_file)
 
+        # Wait until the expected memory usage of the analyzer fits in the
+        # memory budget.
+        if analysis_memory_governor:
+            with tracer.span('Wait for memory'):
+                memory_job = analysis_memory_governor.admit(
+                    memory_governor.get_memory_usage_key(
+                        action.analyzer_type, action.source))
+
         # Fills up the result handler with the analyzer information.
-        source_analyzer.analyze(analyzer_cmd, rh, analyzer_environment,
-                                __create_timeout)
+        peak_memory = 0
+        try:
+            with tracer.span(os.path.basename(action.source),
+                             action.analyzer_type,
+                             source=action.source):
+                source_analyzer.analyze(analyzer_cmd, rh,
+                                        analyzer_environment,
+                                        __create_timeout, resource_limits)
+        finally:
+            if memory_job:
+                peak_memory = memory_job.finish()
 
         # If execution reaches this line, the analyzer process has quit.
         if timeout_cleanup[0]():
@@ -523,6 +750,15 @@ def check(check_data):
             rh.analyzer_stderr = (">>> CodeChecker: Analysis timed out "
                                   "after {0} seconds. <<<\n{1}") \
                 .format(analysis_timeout, rh.analyzer_stderr)
+        elif cpu_timeout and cpu_timeout > 0 and \
+                rh.analyzer_returncode in (-signal.SIGXCPU, -signal.SIGKILL):
+            LOG.warning("Analyzer ran too long, exceeding CPU time limit "
+                        "of %d seconds.", cpu_timeout)
+            LOG.warning("Considering this analysis as failed...")
+            rh.analyzer_returncode = -1
+            rh.analyzer_stderr = (">>> CodeChecker: Analysis exceeded the "
+                                  "CPU time limit of {0} seconds. <<<\n{1}") \
+                .format(cpu_timeout, rh.analyzer_stderr)
 
         # If source file contains escaped spaces ("\ " tokens), then
         # clangSA writes the plist file with removing this escape
@@ -531,6 +767,15 @@ def check(check_data):
         result_file = rh.analyzer_result_file.replace(r'\ ', ' ')
         result_base = os.path.basename(result_file)
 
+        resource_usage = None
+        if rh.analyzer_resource_usage:
+            resource_usage = dict(rh.analyzer_resource_usage)
+            resource_usage['max_rss'] = max(resource_usage['max_rss'],
+                                            peak_memory)
+            resource_usage['output_size'] = \
+                os.path.getsize(result_file) \
+                if os.path.exists(result_file) else 0
+
         ctu_active = is_ctu_active(source_analyzer)
 
         ctu_suffix = '_CTU'
@@ -575,8 +820,9 @@ def check(check_data):
             if skip_handler:
                 # We need to check the plist content because skipping
                 # reports in headers can be done only this way.
-                plist_parser.skip_report_from_plist(result_file,
-                                                    skip_handler)
+                with tracer.span('Skip reports'):
+                    plist_parser.skip_report_from_plist(result_file,
+                                                        skip_handler)
 
         else:
             LOG.error("Analyzing %s with %s %s failed!",
@@ -601,13 +847,16 @@ def check(check_data):
                                   context.severity_map,
                                   skip_handler,
                                   statistics_data,
-                                  True)
+                                  True,
+                                  output_dirs['sharded'])
 
                 # Fills up the result handler with
                 # the analyzer information.
                 source_analyzer.analyze(analyzer_cmd,
                                         rh,
-                                        analyzer_environment)
+                                        analyzer_environment,
+                                        None,
+                                        resource_limits)
 
                 return_codes = rh.analyzer_returncode
                 if rh.analyzer_returncode == 0:
@@ -648,13 +897,219 @@ def check(check_data):
         progress_checked_num.value += 1
 
         return return_codes, False, reanalyzed, action.analyzer_type, \
-            result_file, action.source
+            result_file, action.source, resource_usage
 
     except Exception as e:
         LOG.debug_analyzer(str(e))
         traceback.print_exc(file=sys.stdout)
         return 1, False, reanalyzed, action.analyzer_type, None, \
-            action.source
+            action.source, None
+    finally:
+        # The complete analyzer outputs are not needed anymore.
+        if rh:
+            rh.clean_output_files()
+
+
+def get_tidy_batch_key(action):
+    """
+    Returns the key of the clang-tidy actions which can be analyzed by the
+    same clang-tidy invocation. Only the source files of these actions
+    differ, their compiler options are the same.
+    """
+    lang = action.lang
+    return (action.directory,
+            lang,
+            tuple(action.analyzer_options),
+            action.target.get(lang, ''),
+            tuple(action.compiler_includes.get(lang, [])),
+            action.compiler_standard.get(lang, ''))
+
+
+def batch_actions(analyzed_actions, batch_size):
+    """
+    Group the clang-tidy actions with the same compiler options into batches
+    of at most batch_size actions. Every other action is a batch of its own.
+    """
+    batches = []
+    open_batches = {}
+    for check_data in analyzed_actions:
+        action = check_data[1]
+        if not batch_size or batch_size <= 1 or \
+                action.analyzer_type != ClangTidy.ANALYZER_NAME:
+            batches.append([check_data])
+            continue
+
+        key = get_tidy_batch_key(action)
+        batch = open_batches.get(key)
+        if batch is None or len(batch) == batch_size:
+            batch = []
+            open_batches[key] = batch
+            batches.append(batch)
+
+        batch.append(check_data)
+
+    return batches
+
+
+def get_failed_results(batch):
+    """
+    Returns the results of check() for the actions of a batch which could
+    not be analyzed.
+    """
+    return [(1, False, False, check_data[1].analyzer_type, None,
+             check_data[1].source, None) for check_data in batch]
+
+
+def check_batch(batch):
+    """
+    Analyze a batch of clang-tidy actions created by batch_actions() with a
+    single clang-tidy invocation, so the process start and the checker
+    registration are paid only once. Returns the results of check() for
+    every action of the batch.
+
+    If the analysis of the batch fails, its actions are analyzed one by one,
+    so the failure is reported for the failing source file.
+    """
+    if len(batch) == 1:
+        return [check(batch[0])]
+
+    _, _, context, analyzer_config_map, output_dir, \
+        skip_handler, quiet_output_on_stdout, capture_analysis_output, \
+        analysis_timeout, cpu_timeout, memory_limit, analyzer_environment, \
+        _, output_dirs, statistics_data = batch[0]
+
+    actions = [check_data[1] for check_data in batch]
+    prepared = []
+    try:
+        prepared = [prepare_check(action, analyzer_config_map, output_dir,
+                                  context.severity_map, skip_handler,
+                                  statistics_data,
+                                  sharded=output_dirs['sharded'])
+                    for action in actions]
+
+        source_analyzer, analyzer_cmd, rh, _ = prepared[0]
+        result_handlers = [prepared_rh for _, _, prepared_rh, _ in prepared]
+
+        # The source files of the batch are analyzed in place of the source
+        # file of the first action.
+        source_idx = analyzer_cmd.index(source_analyzer.source_file)
+        analyzer_cmd = analyzer_cmd[:source_idx] + \
+            [action.source for action in actions] + \
+            analyzer_cmd[source_idx + 1:]
+
+        timeout_cleanup = [lambda: False]
+        memory_job = None
+
+        def __create_timeout(analyzer_process):
+            if analysis_timeout and analysis_timeout > 0:
+                timeout_cleanup[0] = setup_process_timeout(
+                    analyzer_process, analysis_timeout * len(batch))
+
+            if memory_job:
+                memory_job.track(analyzer_process)
+
+        resource_limits = {}
+        if cpu_timeout and cpu_timeout > 0:
+            resource_limits[resource.RLIMIT_CPU] = cpu_timeout * len(batch)
+        if memory_limit and memory_limit > 0:
+            resource_limits[resource.RLIMIT_AS] = memory_limit * 1024 * 1024
+
+        if analysis_memory_governor:
+            with tracer.span('Wait for memory'):
+                memory_job = analysis_memory_governor.admit(
+                    *[memory_governor.get_memory_usage_key(
+                        action.analyzer_type, action.source)
+                      for action in actions])
+
+        peak_memory = 0
+        try:
+            with tracer.span('Batch of %d files' % len(batch),
+                             ClangTidy.ANALYZER_NAME,
+                             sources=[action.source for action in actions]):
+                source_analyzer.analyze(analyzer_cmd, rh,
+                                        analyzer_environment,
+                                        __create_timeout, resource_limits)
+        finally:
+            if memory_job:
+                peak_memory = memory_job.finish()
+
+        if timeout_cleanup[0]() or rh.analyzer_returncode != 0:
+            LOG.warning("Analyzing a batch of %d files with %s failed, "
+                        "analyzing them one by one...",
+                        len(batch), ClangTidy.ANALYZER_NAME)
+            return [check(check_data) for check_data in batch]
+
+        with tracer.span('Postprocess result'):
+            if capture_analysis_output:
+                save_output(os.path.join(
+                    output_dirs['success'],
+                    os.path.basename(rh.analyzer_result_file)),
+                    rh.analyzer_stdout_file, rh.analyzer_stderr_file)
+
+            with open(rh.analyzer_stdout_file, 'r') as tidy_stdout:
+                generate_plists_from_batch_result(
+                    tidy_stdout, result_handlers,
+                    lambda action_rh: dependency_index.gather_dependencies(
+                        (action_rh.buildaction.source,
+                         action_rh.buildaction.original_command,
+                         action_rh.buildaction.directory)))
+
+        if not quiet_output_on_stdout:
+            LOG.debug_analyzer('\n%s', rh.analyzer_stdout)
+            LOG.debug_analyzer('\n%s', rh.analyzer_stderr)
+
+        results = []
+        for action, (_, _, action_rh, reanalyzed) in zip(actions, prepared):
+            result_file = action_rh.analyzer_result_file.replace(r'\ ', ' ')
+
+            save_result_file(result_file, action_rh.analyzer_result_file)
+
+            if skip_handler:
+                with tracer.span('Skip reports'):
+                    plist_parser.skip_report_from_plist(result_file,
+                                                        skip_handler)
+
+            # The times used by the batch are distributed evenly among its
+            # source files. The peak memory usage is of the whole batch, so
+            # it is not recorded as the memory usage of the source files.
+            resource_usage = None
+            if rh.analyzer_resource_usage:
+                resource_usage = dict(rh.analyzer_resource_usage)
+                for key in ['wall_time', 'user_time', 'sys_time']:
+                    resource_usage[key] /= len(batch)
+                resource_usage['max_rss'] = max(resource_usage['max_rss'],
+                                                peak_memory)
+                resource_usage['batch_size'] = len(batch)
+                resource_usage['output_size'] = \
+                    os.path.getsize(result_file) \
+                    if os.path.exists(result_file) else 0
+
+            LOG.info("[%d/%d] %s analyzed %s successfully.",
+                     progress_checked_num.value, progress_actions.value,
+                     action.analyzer_type, os.path.basename(action.source))
+            progress_checked_num.value += 1
+
+            results.append((0, False, reanalyzed, action.analyzer_type,
+                            result_file, action.source, resource_usage))
+
+        return results
+
+    except Exception as e:
+        LOG.debug_analyzer(str(e))
+        traceback.print_exc(file=sys.stdout)
+        return get_failed_results(batch)
+    finally:
+        for _, _, prepared_rh, _ in prepared:
+            prepared_rh.clean_output_files()
+
+
+def check_shared_batch(batch, actions_map):
+    """
+    Analyze a batch of the distributed analysis with the actions map which is
+    shared by the batches of the worker.
+    """
+    return check_batch([(actions_map,) + check_data[1:]
+                        for check_data in batch])
 
 
 def skip_cpp(compile_actions, skip_handler):
@@ -682,29 +1137,72 @@ def start_workers(actions_map, actions, context, analyzer_config_map,
                   jobs, output_path, skip_handler, metadata,
                   quiet_analyze, capture_analysis_output, timeout,
                   ctu_reanalyze_on_failure, statistics_data, manager,
-                  compile_cmd_count):
+                  compile_cmd_count, cpu_timeout=None, memory_budget=None,
+                  memory_limit=None, tidy_batch_size=None,
+                  distributed_address=None, sharded_output=False,
+                  failed_dir_size_limit=None):
     """
     Start the workers in the process pool.
     For every build action there is worker which makes the analysis.
+
+    The actions are a list of build actions or an iterable of lists of build
+    actions if the compilation database is still being written. The lists
+    are analyzed as soon as they are produced.
+
+    If a memory budget is given (in MB), analyzers are only started if their
+    expected memory usage fits in the budget together with the already
+    running analyzers.
+
+    If tidy_batch_size is greater than 1, the clang-tidy actions with the
+    same compiler options are analyzed in batches of this size.
+
+    If a distributed address is given, the batches are analyzed by the
+    analysis workers which connect to this address instead of a local
+    process pool.
+
+    If sharded_output is True, the result files are put in subdirectories of
+    the output directory.
+
+    The source files of the failed analyses are stored in the failed
+    directory only up to failed_dir_size_limit (in MB).
     """
 
     # Handle SIGINT to stop this script running.
     def signal_handler(signum, frame):
         try:
-            pool.terminate()
+            if pool is not None:
+                pool.terminate()
             manager.shutdown()
         finally:
             sys.exit(128 + signum)
 
     signal.signal(signal.SIGINT, signal_handler)
-    actions, skipped_actions = skip_cpp(actions, skip_handler)
+    action_chunks = [actions] if isinstance(actions, list) else actions
+    skipped_actions = []
     # Start checking parallel.
     checked_var = multiprocessing.Value('i', 1)
-    actions_num = multiprocessing.Value('i', len(actions))
-    pool = multiprocessing.Pool(jobs,
-                                initializer=init_worker,
-                                initargs=(checked_var,
-                                          actions_num))
+    actions_num = multiprocessing.Value('i', 0)
+
+    governor = None
+    if memory_budget and memory_budget > 0:
+        budget = memory_budget * 1024 * 1024
+        governor = memory_governor.MemoryGovernor(
+            budget, budget // jobs,
+            memory_governor.load_memory_usage(output_path))
+
+    pool = None
+    if distributed_address:
+        # The proxies of the shared objects can't be used on other hosts, so
+        # their copies are sent to the workers.
+        analyzer_config_map = dict(analyzer_config_map)
+        if statistics_data:
+            statistics_data = dict(statistics_data)
+    else:
+        pool = multiprocessing.Pool(jobs,
+                                    initializer=init_worker,
+                                    initargs=(checked_var,
+                                              actions_num,
+                                              governor))
 
     failed_dir = os.path.join(output_path, "failed")
     # If the analysis has failed, we help debugging.
@@ -718,42 +1216,67 @@ def start_workers(actions_map, actions, context, analyzer_config_map,
         os.makedirs(success_dir)
 
     output_dirs = {'success': success_dir,
-                   'failed': failed_dir}
+                   'failed': failed_dir,
+                   'sharded': sharded_output}
 
     # Construct analyzer env.
     analyzer_environment = env.extend(context.path_env_extra,
                                       context.ld_lib_path_extra)
 
-    analyzed_actions = [(actions_map,
-                         build_action,
-                         context,
-                         analyzer_config_map,
-                         output_path,
-                         skip_handler,
-                         quiet_analyze,
-                         capture_analysis_output,
-                         timeout,
-                         analyzer_environment,
-                         ctu_reanalyze_on_failure,
-                         output_dirs,
-                         statistics_data)
-                        for build_action in actions]
-
-    if analyzed_actions:
+    def analyzed_batches():
+        for chunk in action_chunks:
+            chunk, skipped = skip_cpp(chunk, skip_handler)
+            skipped_actions.extend(skipped)
+
+            with actions_num.get_lock():
+                actions_num.value += len(chunk)
+
+            # The actions map is sent to the workers of the distributed
+            # analysis only once.
+            analyzed_actions = [(None if distributed_address
+                                 else actions_map,
+                                 build_action,
+                                 context,
+                                 analyzer_config_map,
+                                 output_path,
+                                 skip_handler,
+                                 quiet_analyze,
+                                 capture_analysis_output,
+                                 timeout,
+                                 cpu_timeout,
+                                 memory_limit,
+                                 analyzer_environment,
+                                 ctu_reanalyze_on_failure,
+                                 output_dirs,
+                                 statistics_data)
+                                for build_action in chunk]
+
+            for batch in batch_actions(analyzed_actions, tidy_batch_size):
+                yield batch
+
+    if distributed_address:
+        with tracer.span('Distributed analysis'):
+            coordinator = distributed.Coordinator(distributed_address,
+                                                  distributed.get_authkey(),
+                                                  check_shared_batch,
+                                                  get_failed_results,
+                                                  dict(actions_map))
+            results = coordinator.run(analyzed_batches())
+    else:
         try:
-
-            # Workaround, equivalent of map.
-            # The main script does not get signal
-            # while map or map_async function is running.
-            # It is a python bug, this does not happen if a timeout is
-            # specified, then receive the interrupt immediately.
-            pool.map_async(check,
-                           analyzed_actions,
-                           1,
-                           callback=lambda results: worker_result_handler(
-                               results, metadata, output_path,
-                               context.analyzer_binaries)
-                           ).get(31557600)
+            # The batches are dispatched by the main process, so the
+            # analysis of the produced batches starts while the next ones
+            # are produced.
+            with tracer.span('Analysis'):
+                async_results = [pool.apply_async(check_batch, (batch,))
+                                 for batch in analyzed_batches()]
+
+                # Workaround, the main script does not get signal while
+                # waiting for the result. It is a python bug, this does not
+                # happen if a timeout is specified, then receive the
+                # interrupt immediately.
+                results = [async_result.get(31557600)
+                           for async_result in async_results]
 
             pool.close()
         except Exception:
@@ -761,6 +1284,11 @@ def start_workers(actions_map, actions, context, analyzer_config_map,
             raise
         finally:
             pool.join()
+
+    if results:
+        worker_result_handler(list(itertools.chain.from_iterable(results)),
+                              metadata, output_path,
+                              context.analyzer_binaries, sharded_output)
     else:
         LOG.info("----==== Summary ====----")
 
@@ -777,8 +1305,28 @@ def start_workers(actions_map, actions, context, analyzer_config_map,
                  compile_cmd_count.skipped + len(skipped_actions))
 
     LOG.info("----=================----")
+
+    with tracer.span('Collect failure sources'):
+        size_limit = failure_collector.FAILED_DIR_SIZE_LIMIT
+        if failed_dir_size_limit and failed_dir_size_limit > 0:
+            size_limit = failed_dir_size_limit * 1024 * 1024
+        failure_collector.collect_sources(failed_dir, jobs, size_limit)
     if not os.listdir(success_dir):
         shutil.rmtree(success_dir)
 
     if not os.listdir(failed_dir):
         shutil.rmtree(failed_dir)
+
+
+def start_remote_worker(address, authkey, jobs, wait):
+    """
+    Analyze the batches of the coordinator at the given address in a pool
+    of jobs processes until the distributed analysis is finished.
+    """
+    checked_var = multiprocessing.Value('i', 1)
+    actions_num = multiprocessing.Value('i', 0)
+
+    distributed.run_worker(address, authkey, jobs, wait,
+                           initializer=init_worker,
+                           initargs=(checked_var, actions_num),
+                           item_count=actions_num)
@@ -0,0 +1,411 @@
+# -------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -------------------------------------------------------------------------
+"""
+Long-running analysis server.
+
+The analysis server runs the analyses of the analyze command in a single
+process, so the state of the process is kept between the analyses: the
+imported modules, the detected compiler includes and targets, the translated
+compiler flags and the configurations of the analyzers.
+
+The analyze command sends its arguments to the server over a UNIX socket and
+the server streams the output of the analysis back. The output is closed by
+a zero byte which is followed by the result of the analysis in JSON format.
+
+If the server watches the analyzed files, the translation units which include
+a modified file are analyzed again in the background in the output directory
+of the analysis, so the parse command shows the latest results.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import argparse
+import ctypes
+import ctypes.util
+import errno
+import json
+import os
+import select
+import signal
+import socket
+import struct
+import sys
+import tempfile
+import time
+import traceback
+
+from codechecker_common import logger
+
+from . import analyzer, capability_cache, tracer
+from .dependency_index import DependencyIndex
+
+LOG = logger.get_logger('analyzer')
+
+# The default socket of the analysis server.
+DEFAULT_SOCKET = os.path.join(os.path.expanduser('~'),
+                              '.codechecker.analyze-server.sock')
+
+# Closes the output of the analysis in the response of the server.
+END_OF_OUTPUT = b'\x00'
+
+# The arguments of the analyze command which are not sent to the server.
+CLIENT_ARGS = frozenset(['func', 'func_process_config_file', 'server'])
+
+# The arguments of an analysis which are not reused when the analysis is run
+# again for the modified files.
+ONE_SHOT_ARGS = frozenset(['clean', 'changed_files', 'since_git_rev',
+                           'trace_file'])
+
+
+def request_analysis(socket_file, args):
+    """
+    Run the analysis of the given arguments of the analyze command in the
+    server which listens on the given socket and print the output of the
+    analysis. Returns the exit code of the analysis or None if the server
+    can't be reached.
+    """
+    request = {'cwd': os.getcwd(),
+               'argv': sys.argv,
+               'args': dict((name, value) for name, value
+                            in vars(args).items() if name not in CLIENT_ARGS)}
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_file)
+    except socket.error as err:
+        LOG.debug("Failed to connect to the analysis server at '%s': %s",
+                  socket_file, err)
+        sock.close()
+        return None
+
+    output = getattr(sys.stdout, 'buffer', sys.stdout)
+    result = None
+    try:
+        sock.sendall(json.dumps(request).encode('utf-8') + b'\n')
+
+        while True:
+            data = sock.recv(65536)
+            if not data:
+                break
+
+            if result is None:
+                data, end, rest = data.partition(END_OF_OUTPUT)
+                output.write(data)
+                output.flush()
+                if end:
+                    result = rest
+            else:
+                result += data
+    finally:
+        sock.close()
+
+    if result is None:
+        LOG.error("The analysis server closed the connection before the "
+                  "analysis finished.")
+        return 1
+
+    return json.loads(result.decode('utf-8'))['exit_code']
+
+
+def is_server_running(socket_file):
+    """ Returns True if a server listens on the given socket. """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_file)
+        return True
+    except socket.error:
+        return False
+    finally:
+        sock.close()
+
+
+class InotifyWatcher(object):
+    """
+    Watches directories for modified files with the inotify API of Linux.
+    """
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+
+    # The events of the modification of a file. The editors usually save a
+    # file by writing it or by moving a new version in its place.
+    MODIFICATION_EVENTS = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | \
+        IN_DELETE
+
+    # The header of the inotify_event structure: wd, mask, cookie, len.
+    EVENT_HEADER = struct.Struct('iIII')
+
+    def __init__(self):
+        """
+        Raises OSError if the inotify API is not available.
+        """
+        try:
+            self.__libc = ctypes.CDLL(ctypes.util.find_library('c') or
+                                      'libc.so.6', use_errno=True)
+            inotify_init1 = self.__libc.inotify_init1
+        except (OSError, AttributeError):
+            raise OSError(errno.ENOSYS, "The inotify API is not available.")
+
+        self.fd = inotify_init1(os.O_NONBLOCK)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+
+        # The watched directories by their watch descriptors.
+        self.__directories = {}
+
+    def watch(self, directory):
+        """ Watch the files of the given directory. """
+        if directory in self.__directories.values():
+            return
+
+        wd = self.__libc.inotify_add_watch(
+            self.fd, directory.encode('utf-8'), self.MODIFICATION_EVENTS)
+        if wd < 0:
+            err = ctypes.get_errno()
+            LOG.debug("Failed to watch the directory '%s': %s", directory,
+                      os.strerror(err))
+            return
+
+        self.__directories[wd] = directory
+
+    def read(self):
+        """ Returns the paths of the modified files. """
+        paths = set()
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except OSError as err:
+                if err.errno == errno.EAGAIN:
+                    return paths
+                raise
+
+            pos = 0
+            while pos + self.EVENT_HEADER.size <= len(data):
+                wd, _, _, length = self.EVENT_HEADER.unpack_from(data, pos)
+                pos += self.EVENT_HEADER.size
+                name = data[pos:pos + length].rstrip(b'\x00')
+                pos += length
+
+                directory = self.__directories.get(wd)
+                if directory and name:
+                    paths.add(os.path.join(directory, name.decode('utf-8')))
+
+    def close(self):
+        os.close(self.fd)
+
+
+class AnalysisServer(object):
+    """
+    Runs the analysis requests of the clients one after the other.
+    """
+
+    def __init__(self, socket_file, watcher=None, verbose=None,
+                 debounce=1.0):
+        """
+        watcher -- An InotifyWatcher if the analyzed files are watched.
+        debounce -- The modified files are analyzed again if no other file
+                    was modified in this many seconds.
+        """
+        self.__socket_file = socket_file
+        self.__watcher = watcher
+        self.__verbose = verbose
+        self.__debounce = debounce
+
+        # The requests of the watched analyses by their output directories.
+        self.__watched = {}
+
+        # The configurations of the analyzers are reused by the analyses.
+        analyzer.keep_configs()
+
+    def serve_forever(self):
+        """
+        Serve the analysis requests until the process is stopped.
+        """
+        if os.path.exists(self.__socket_file):
+            if is_server_running(self.__socket_file):
+                LOG.error("An analysis server already listens on '%s'.",
+                          self.__socket_file)
+                sys.exit(1)
+            os.remove(self.__socket_file)
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            server.bind(self.__socket_file)
+            os.chmod(self.__socket_file, 0o600)
+            server.listen(16)
+
+            LOG.info("Analysis server is listening on '%s'.",
+                     self.__socket_file)
+
+            modified_files = set()
+            last_modification = None
+            while True:
+                readable = [server]
+                timeout = None
+                if self.__watcher:
+                    readable.append(self.__watcher.fd)
+                    if modified_files:
+                        timeout = max(0, last_modification +
+                                      self.__debounce - time.time())
+
+                ready, _, _ = select.select(readable, [], [], timeout)
+
+                if self.__watcher and self.__watcher.fd in ready:
+                    modified_files |= self.__watcher.read()
+                    last_modification = time.time()
+                elif modified_files and not ready:
+                    self.__analyze_modified_files(modified_files)
+                    modified_files = set()
+
+                if server in ready:
+                    conn, _ = server.accept()
+                    try:
+                        self.__serve(conn)
+                    finally:
+                        conn.close()
+        finally:
+            server.close()
+            if os.path.exists(self.__socket_file):
+                os.remove(self.__socket_file)
+            if self.__watcher:
+                self.__watcher.close()
+
+    def __serve(self, conn):
+        """ Run the analysis request of the given connection. """
+        request = conn.makefile('rb').readline()
+        if not request:
+            return
+
+        request = json.loads(request.decode('utf-8'))
+
+        # The watched files are looked up in the dependency index, so it is
+        # created by the analyses of a watching server.
+        if self.__watcher:
+            request['args']['dependency_index'] = True
+
+        LOG.info("Analyzing '%s' in '%s'...",
+                 ' '.join(request['args'].get('logfile', [])),
+                 request['cwd'])
+
+        output = conn.makefile('wb', 0)
+        try:
+            exit_code = self.__run(request, output)
+            output.write(END_OF_OUTPUT +
+                         json.dumps({'exit_code': exit_code}).encode('utf-8'))
+        except socket.error as err:
+            LOG.warning("Failed to send the output of the analysis: %s", err)
+            return
+        finally:
+            output.close()
+
+        LOG.info("Analysis finished with exit code %d.", exit_code)
+
+        if self.__watcher and exit_code == 0:
+            watched = dict(request)
+            watched['args'] = dict((name, value) for name, value
+                                   in request['args'].items()
+                                   if name not in ONE_SHOT_ARGS)
+            output_path = os.path.abspath(os.path.join(
+                request['cwd'], request['args']['output_path']))
+            self.__watched[output_path] = watched
+            self.__watch_analysis(output_path)
+
+    def __run(self, request, output):
+        """
+        Run the analyze command with the arguments of the request in the
+        working directory of the request and write its output to the given
+        file. Returns the exit code of the analysis.
+        """
+        from codechecker_analyzer.cmd import analyze
+
+        cwd = os.getcwd()
+        argv = sys.argv
+        stdout, stderr = sys.stdout, sys.stderr
+        handlers = dict((signum, signal.getsignal(signum))
+                        for signum in (signal.SIGINT, signal.SIGTERM))
+        cache_file = capability_cache.get_cache_file()
+
+        args = argparse.Namespace(**request['args'])
+        exit_code = 0
+        try:
+            os.chdir(request['cwd'])
+            sys.argv = request['argv']
+            # The handlers of the loggers write to the current standard
+            # streams, so the logs of the analysis are sent to the client.
+            sys.stdout = sys.stderr = output
+
+            analyze.main(args)
+        except SystemExit as ex:
+            exit_code = ex.code if isinstance(ex.code, int) else \
+                int(ex.code is not None)
+        except Exception:
+            traceback.print_exc(file=output)
+            exit_code = 1
+        finally:
+            # The trace is not finished if the analysis is stopped early.
+            tracer.finish()
+
+            os.chdir(cwd)
+            sys.argv = argv
+            sys.stdout, sys.stderr = stdout, stderr
+            for signum, handler in handlers.items():
+                signal.signal(signum, handler)
+
+            if capability_cache.get_cache_file() != cache_file:
+                capability_cache.enable(cache_file)
+
+            logger.setup_logger(self.__verbose)
+
+        return exit_code
+
+    def __watch_analysis(self, output_path):
+        """
+        Watch the directories of the files of the translation units which
+        were analyzed into the given output directory.
+        """
+        index = DependencyIndex.load(output_path)
+        if index is None:
+            LOG.warning("The files of the analysis in '%s' are not watched, "
+                        "because there is no dependency index.", output_path)
+            return
+
+        directories = set(os.path.dirname(path) for path in index.get_files())
+        for directory in directories:
+            self.__watcher.watch(directory)
+
+        LOG.info("Watching the files of the analysis in '%s' (%d "
+                 "directories).", output_path, len(directories))
+
+    def __analyze_modified_files(self, modified_files):
+        """
+        Analyze the translation units of the watched analyses which include
+        the modified files again.
+        """
+        for output_path, request in self.__watched.items():
+            index = DependencyIndex.load(output_path)
+            if index is None or not index.get_dependents(modified_files):
+                continue
+
+            LOG.info("Analyzing the modified files of '%s' again...",
+                     output_path)
+
+            with tempfile.NamedTemporaryFile('w', suffix='.txt') as f:
+                f.write('\n'.join(modified_files) + '\n')
+                f.flush()
+
+                request = dict(request)
+                request['args'] = dict(request['args'],
+                                       changed_files=f.name)
+                exit_code = self.__run(request, sys.stdout)
+
+            LOG.info("Analysis finished with exit code %d.", exit_code)
+
+            # The translation units might include new files.
+            self.__watch_analysis(output_path)
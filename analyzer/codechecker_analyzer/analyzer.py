@@ -21,6 +21,7 @@ import time
 from codechecker_common.logger import get_logger
 
 from . import analysis_manager, pre_analysis_manager, env, checkers
+from . import dependency_index, tracer
 from .analyzers import analyzer_types
 from .analyzers.config_handler import CheckerState
 from .analyzers.clangsa.analyzer import ClangSA
@@ -31,6 +32,31 @@ from .analyzers.clangsa.statistics_collector import ReturnValueCollector
 
 LOG = get_logger('analyzer')
 
+# The configurations and the versions of the analyzers by the arguments of the
+# analyses. The configurations are built for every analysis if it is None,
+# see keep_configs().
+_config_cache = None
+
+# The arguments of the analysis which don't affect the configurations of the
+# analyzers.
+NON_CONFIG_ARGS = frozenset([
+    'capture_analysis_output', 'changed_files', 'clean', 'compile_uniqueing',
+    'compiler_info_file', 'cpu_timeout', 'dependency_index',
+    'failed_dir_size_limit', 'jobs', 'keep_gcc_include_fixed', 'logfile',
+    'memory_budget', 'memory_limit', 'name', 'no_cache', 'output_format',
+    'output_path', 'quiet', 'sharded_output', 'since_git_rev', 'skipfile',
+    'tidy_batch_size', 'timeout', 'trace_file', 'verbose'])
+
+
+def keep_configs():
+    """
+    Keep the configurations of the analyzers between the analyses of the
+    process, e.g. in the analysis server. A configuration is built again if
+    the arguments of the analysis or the files given in them change.
+    """
+    global _config_cache
+    _config_cache = {}
+
 
 def prepare_actions(actions, enabled_analyzers):
     """
@@ -45,6 +71,23 @@ def prepare_actions(actions, enabled_analyzers):
     return res
 
 
+def prepare_action_chunks(action_chunks, enabled_analyzers, actions_map,
+                          build_actions):
+    """
+    Set the analyzer type for the build actions of each list like
+    prepare_actions() does, while the lists are produced. The build actions
+    are collected to the build_actions list and the prepared actions are
+    added to the given actions map.
+    """
+    for chunk in action_chunks:
+        build_actions.extend(chunk)
+        chunk = prepare_actions(chunk, enabled_analyzers)
+        for act in chunk:
+            actions_map[act.source, act.target[act.lang]] = act
+
+        yield chunk
+
+
 def create_actions_map(actions, manager):
     """
     Create a dict for the build actions which is shareable
@@ -91,6 +134,47 @@ def __get_analyzer_version(context, analyzer_config_map):
     return versions
 
 
+def __get_config_key(args, analyzers):
+    """
+    Returns the key of the configurations of the analyzers in the cache.
+    """
+    key = [os.getcwd(), tuple(analyzers)]
+    for name, value in sorted(vars(args).items()):
+        if name in NON_CONFIG_ARGS or callable(value):
+            continue
+
+        key.append((name, repr(value)))
+
+        # The configuration files can change between the analyses.
+        if isinstance(value, (str, type(u''))) and os.path.isfile(value):
+            key.append((name, os.path.getmtime(value)))
+
+    return tuple(key)
+
+
+def __build_analyzer_configs(args, context, analyzers):
+    """
+    Build the configurations of the enabled analyzers and get the versions of
+    the analyzer binaries. The previous configurations are returned if they
+    are kept and the arguments of the analysis didn't change.
+    """
+    key = None
+    if _config_cache is not None and 'ctu_phases' not in args:
+        key = __get_config_key(args, analyzers)
+        if key in _config_cache:
+            LOG.debug("Using the analyzer configurations of a previous "
+                      "analysis.")
+            return _config_cache[key]
+
+    config_map = analyzer_types.build_config_handlers(args, context, analyzers)
+    versions = __get_analyzer_version(context, config_map)
+
+    if key is not None:
+        _config_cache[key] = config_map, versions
+
+    return config_map, versions
+
+
 def __mgr_init():
     """
     This function is set for the SyncManager object which handles shared data
@@ -139,6 +223,10 @@ def perform_analysis(args, skip_handler, context, actions, metadata,
     Perform static analysis via the given (or if not, all) analyzers,
     in the given analysis context for the supplied build actions.
     Additionally, insert statistical information into the metadata dict.
+
+    The build actions can also be given as an iterable of lists of build
+    actions, e.g. if the compilation database is still being written during
+    the analysis. The pre-analysis is not supported in this case.
     """
 
     analyzers = args.analyzers if 'analyzers' in args \
@@ -164,8 +252,10 @@ def perform_analysis(args, skip_handler, context, actions, metadata,
                       "the Clang Static Analyzer.")
             return
 
-    actions = prepare_actions(actions, analyzers)
-    config_map = analyzer_types.build_config_handlers(args, context, analyzers)
+    build_actions = actions
+    if isinstance(actions, list):
+        actions = prepare_actions(actions, analyzers)
+    config_map, versions = __build_analyzer_configs(args, context, analyzers)
 
     available_checkers = set()
     # Add profile names to the checkers list so we will not warn
@@ -206,7 +296,6 @@ def perform_analysis(args, skip_handler, context, actions, metadata,
             ReturnValueCollector.checker_collect, False)
 
     # Save some metadata information.
-    versions = __get_analyzer_version(context, config_map)
     metadata['versions'].update(versions)
 
     metadata['checkers'] = {}
@@ -218,12 +307,19 @@ def perform_analysis(args, skip_handler, context, actions, metadata,
             metadata['checkers'][analyzer].update(
                 {check: state == CheckerState.enabled})
 
-    if ctu_collect:
-        shutil.rmtree(ctu_dir, ignore_errors=True)
-    elif ctu_analyze and not os.path.exists(ctu_dir):
+    # The results of the previous CTU collection are not removed, because
+    # the ASTs of the unchanged translation units are reused.
+    if ctu_analyze and not ctu_collect and not os.path.exists(ctu_dir):
         LOG.error("CTU directory: '%s' does not exist.", ctu_dir)
         return
 
+    # The command templates of the analyzers are built before the
+    # configurations are shared with the workers, so the workers only add
+    # the parts of the translation units to them.
+    for analyzer_name, analyzer_cfg in config_map.items():
+        analyzer_types.supported_analyzers[analyzer_name] \
+            .get_analyzer_cmd_template(analyzer_cfg)
+
     start_time = time.time()
 
     # Use Manager to create data objects which can be
@@ -232,7 +328,13 @@ def perform_analysis(args, skip_handler, context, actions, metadata,
     manager.start(__mgr_init)
 
     config_map = manager.dict(config_map)
-    actions_map = create_actions_map(actions, manager)
+    if isinstance(actions, list):
+        actions_map = create_actions_map(actions, manager)
+    else:
+        actions_map = manager.dict()
+        build_actions = []
+        actions = prepare_action_chunks(actions, analyzers, actions_map,
+                                        build_actions)
 
     # Setting to not None value will enable statistical analysis features.
     statistics_data = __get_statistics_data(args, manager)
@@ -292,7 +394,31 @@ def perform_analysis(args, skip_handler, context, actions, metadata,
                                        ctu_reanalyze_on_failure,
                                        statistics_data,
                                        manager,
-                                       compile_cmd_count)
+                                       compile_cmd_count,
+                                       args.cpu_timeout
+                                       if 'cpu_timeout' in args else None,
+                                       args.memory_budget
+                                       if 'memory_budget' in args else None,
+                                       args.memory_limit
+                                       if 'memory_limit' in args else None,
+                                       args.tidy_batch_size
+                                       if 'tidy_batch_size' in args
+                                       else None,
+                                       args.distributed
+                                       if 'distributed' in args else None,
+                                       'sharded_output' in args,
+                                       args.failed_dir_size_limit
+                                       if 'failed_dir_size_limit' in args
+                                       else None)
+
+        if 'dependency_index' in args or 'changed_files' in args or \
+                'since_git_rev' in args or os.path.exists(
+                    dependency_index.DependencyIndex.get_index_file(
+                        args.output_path)):
+            with tracer.span('Update dependency index'):
+                dependency_index.update(args.output_path, build_actions,
+                                        args.jobs)
+
         LOG.info("Analysis finished.")
         LOG.info("To view results in the terminal use the "
                  "\"CodeChecker parse\" command.")
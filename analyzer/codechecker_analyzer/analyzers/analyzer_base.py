@@ -12,15 +12,92 @@ from __future__ import division
 from __future__ import absolute_import
 
 from abc import ABCMeta, abstractmethod
+import errno
 import os
+import resource
 import signal
 import subprocess
 import sys
+import time
 
 from codechecker_common.logger import get_logger
 
 LOG = get_logger('analyzer')
 
+# The amount of the standard output and error of an analyzer in bytes which
+# is kept in memory for error reporting. The complete outputs are written to
+# files.
+OUTPUT_TAIL_SIZE = 64 * 1024
+
+
+class ResourceUsagePopen(subprocess.Popen):
+    """
+    Subprocess which keeps the resource usage of the finished process
+    returned by os.wait4().
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.rusage = None
+        super(ResourceUsagePopen, self).__init__(*args, **kwargs)
+
+    def wait(self):
+        while self.returncode is None:
+            try:
+                _, sts, self.rusage = os.wait4(self.pid, 0)
+            except OSError as err:
+                if err.errno == errno.EINTR:
+                    continue
+                raise
+
+            # The method is defined by the POSIX implementation of Popen.
+            # pylint: disable=no-member
+            self._handle_exitstatus(sts)
+
+        return self.returncode
+
+
+def get_resource_usage(rusage, wall_time):
+    """
+    Returns the resource usage of a finished process as a dict. The maximum
+    resident set size is converted to bytes.
+    """
+    max_rss = rusage.ru_maxrss
+    if sys.platform != 'darwin':
+        # The size is in kilobytes on Linux.
+        max_rss *= 1024
+
+    return {'wall_time': wall_time,
+            'user_time': rusage.ru_utime,
+            'sys_time': rusage.ru_stime,
+            'max_rss': max_rss}
+
+
+def read_output_tail(path, size=OUTPUT_TAIL_SIZE):
+    """
+    Returns the last size bytes of the given analyzer output file. If the
+    output is longer, the beginning of the returned text tells how much of it
+    was omitted.
+    """
+    try:
+        with open(path, 'rb') as output:
+            output.seek(0, os.SEEK_END)
+            length = output.tell()
+
+            output.seek(max(0, length - size))
+            tail = output.read()
+    except IOError as ioerr:
+        LOG.debug("Failed to read analyzer output: %s", ioerr)
+        return ''
+
+    if not isinstance(tail, str):
+        tail = tail.decode('utf-8', 'replace')
+
+    if length <= size:
+        return tail
+
+    return ">>> CodeChecker: the first {0} bytes of the output were " \
+           "omitted. <<<\n{1}".format(length - size, tail)
+
 
 class SourceAnalyzer(object):
     """
@@ -46,6 +123,27 @@ class SourceAnalyzer(object):
     def construct_analyzer_cmd(self, result_handler):
         raise NotImplementedError("Subclasses should implement this!")
 
+    @classmethod
+    def construct_analyzer_cmd_template(cls, config_handler):
+        """
+        Construct the parts of the analyzer command which depend only on the
+        given configuration, so they are the same for every translation unit.
+        """
+        raise NotImplementedError("Subclasses should implement this!")
+
+    @classmethod
+    def get_analyzer_cmd_template(cls, config_handler):
+        """
+        Return the command template of the given configuration. The template
+        is constructed only once and it is shared by the analyzer commands of
+        all translation units.
+        """
+        if config_handler.analyzer_cmd_template is None:
+            config_handler.analyzer_cmd_template = \
+                cls.construct_analyzer_cmd_template(config_handler)
+
+        return config_handler.analyzer_cmd_template
+
     @classmethod
     def resolve_missing_binary(cls, configured_binary, environ):
         """
@@ -78,24 +176,59 @@ class SourceAnalyzer(object):
         """
         raise NotImplementedError("Subclasses should implement this!")
 
-    def analyze(self, analyzer_cmd, res_handler, env=None, proc_callback=None):
+    def analyze(self, analyzer_cmd, res_handler, env=None, proc_callback=None,
+                resource_limits=None):
         """
         Run the analyzer.
+
+        resource_limits is an optional dict which maps the resource
+        identifiers of the resource module to the soft limits of the analyzer
+        process, e.g. {resource.RLIMIT_CPU: 60}.
+
+        The wall time, the CPU time and the maximum resident set size of the
+        analyzer process are stored in the analyzer_resource_usage attribute
+        of the result handler.
+
+        The standard output and error of the analyzer are written to the
+        output files of the result handler, only their ends are kept in
+        memory.
         """
         LOG.debug('Running analyzer ...')
 
         LOG.debug_analyzer('\n%s', ' '.join(analyzer_cmd))
 
         res_handler.analyzer_cmd = analyzer_cmd
+
+        procs = []
+
+        def __started(proc):
+            procs.append(proc)
+            if proc_callback:
+                proc_callback(proc)
+
         try:
-            ret_code, stdout, stderr \
-                = SourceAnalyzer.run_proc(analyzer_cmd,
-                                          env,
-                                          res_handler.buildaction.directory,
-                                          proc_callback)
+            start_time = time.time()
+            stdout, stderr = res_handler.open_output_files()
+            with stdout, stderr:
+                ret_code, _, _ = SourceAnalyzer.run_proc(
+                    analyzer_cmd,
+                    env,
+                    res_handler.buildaction.directory,
+                    __started,
+                    resource_limits,
+                    stdout,
+                    stderr)
+
             res_handler.analyzer_returncode = ret_code
-            res_handler.analyzer_stdout = stdout
-            res_handler.analyzer_stderr = stderr
+            res_handler.analyzer_stdout = \
+                read_output_tail(res_handler.analyzer_stdout_file)
+            res_handler.analyzer_stderr = \
+                read_output_tail(res_handler.analyzer_stderr_file)
+
+            if procs and procs[0].rusage:
+                res_handler.analyzer_resource_usage = get_resource_usage(
+                    procs[0].rusage, time.time() - start_time)
+
             return res_handler
 
         except Exception as ex:
@@ -111,12 +244,26 @@ class SourceAnalyzer(object):
         raise NotImplementedError("Subclasses should implement this!")
 
     @staticmethod
-    def run_proc(command, env=None, cwd=None, proc_callback=None):
+    def run_proc(command, env=None, cwd=None, proc_callback=None,
+                 resource_limits=None, stdout=subprocess.PIPE,
+                 stderr=subprocess.PIPE):
         """
         Just run the given command and return the return code
         and the stdout and stderr outputs of the process.
+
+        If stdout or stderr is a file, the output is written to the file
+        instead of being returned.
         """
 
+        def preexec():
+            os.setsid()
+
+            for res, limit in (resource_limits or {}).items():
+                _, hard = resource.getrlimit(res)
+                if hard != resource.RLIM_INFINITY:
+                    limit = min(limit, hard)
+                resource.setrlimit(res, (limit, hard))
+
         def signal_handler(signum, frame):
             # Clang does not kill its child processes, so I have to.
             try:
@@ -127,14 +274,14 @@ class SourceAnalyzer(object):
 
         signal.signal(signal.SIGINT, signal_handler)
 
-        proc = subprocess.Popen(command,
-                                bufsize=-1,
-                                env=env,
-                                preexec_fn=os.setsid,
-                                cwd=cwd,
-                                stdout=subprocess.PIPE,
-                                stderr=subprocess.PIPE,
-                                universal_newlines=True)
+        proc = ResourceUsagePopen(command,
+                                  bufsize=-1,
+                                  env=env,
+                                  preexec_fn=preexec,
+                                  cwd=cwd,
+                                  stdout=stdout,
+                                  stderr=stderr,
+                                  universal_newlines=True)
 
         # Send the created analyzer process' object if somebody wanted it.
         if proc_callback:
@@ -11,6 +11,7 @@ from __future__ import print_function
 from __future__ import division
 from __future__ import absolute_import
 
+from collections import namedtuple
 import os
 import re
 import shlex
@@ -18,6 +19,7 @@ import subprocess
 
 from codechecker_common.logger import get_logger
 
+from codechecker_analyzer import capability_cache
 from codechecker_analyzer import host_check
 from codechecker_analyzer import env
 
@@ -34,6 +36,14 @@ from .result_handler import ResultHandlerClangSA
 
 LOG = get_logger('analyzer')
 
+# The parts of the analyzer command which are the same for every translation
+# unit. The output file and the checker configuration of the translation unit
+# are placed between the head and the checkers. The flags are the language
+# related flags which are already given by the template.
+CommandTemplate = namedtuple('CommandTemplate', ['head', 'checkers',
+                                                 'ctu_display_progress',
+                                                 'flags'])
+
 
 def parse_checkers(clangsa_output):
     """
@@ -124,13 +134,89 @@ class ClangSA(analyzer_base.SourceAnalyzer):
         command = [analyzer_binary, "-cc1"]
         command.extend(checkers_list_args)
 
+        # The checkers of the loaded plugins are listed too, so the result
+        # is valid until a plugin changes.
+        probe = ' '.join(command[1:])
+        if cfg_handler.analyzer_plugins:
+            probe += ' ' + capability_cache.get_files_identity(
+                cfg_handler.analyzer_plugins)
+
         try:
-            result = subprocess.check_output(command, env=environ,
-                                             universal_newlines=True)
-            return parse_checkers(result)
+            return capability_cache.cached(
+                analyzer_binary, probe,
+                lambda: parse_checkers(subprocess.check_output(
+                    command, env=environ, universal_newlines=True)))
         except (subprocess.CalledProcessError, OSError):
             return []
 
+    @classmethod
+    def construct_analyzer_cmd_template(cls, config_handler):
+        """
+        Construct the parts of the analyzer command which are the same for
+        every translation unit.
+        """
+        config = config_handler
+
+        head = [config.analyzer_binary, '--analyze',
+                # Do not warn about the unused gcc/g++ arguments.
+                '-Qunused-arguments']
+
+        for plugin in config.analyzer_plugins:
+            head.extend(["-Xclang", "-plugin",
+                         "-Xclang", "checkercfg",
+                         "-Xclang", "-load",
+                         "-Xclang", plugin])
+
+        analyzer_mode = 'plist-multi-file'
+        head.extend(['-Xclang',
+                     '-analyzer-opt-analyze-headers',
+                     '-Xclang',
+                     '-analyzer-output=' + analyzer_mode])
+
+        # Expand macros in plist output on the bug path.
+        head.extend(['-Xclang',
+                     '-analyzer-config',
+                     '-Xclang',
+                     'expand-macros=true'])
+
+        # Config handler stores which checkers are enabled or disabled.
+        checkers = []
+        for checker_name, value in config.checks().items():
+            state, _ = value
+            if state == CheckerState.enabled:
+                checkers.extend(['-Xclang',
+                                 '-analyzer-checker=' + checker_name])
+            elif state == CheckerState.disabled:
+                checkers.extend(['-Xclang',
+                                 '-analyzer-disable-checker=' +
+                                 checker_name])
+
+        # Enable aggressive-binary-operation-simplification option.
+        checkers.extend(
+            clang_options.get_abos_options(config.version_info))
+
+        # Enable the z3 solver backend.
+        if config.enable_z3:
+            checkers.extend(['-Xclang', '-analyzer-constraints=z3'])
+
+        if config.enable_z3_refutation and not config.enable_z3:
+            checkers.extend(['-Xclang',
+                             '-analyzer-config',
+                             '-Xclang',
+                             'crosscheck-with-z3=true'])
+
+        ctu_display_progress = None
+        if config.ctu_dir:
+            ctu_display_progress = config.ctu_capability.display_progress
+
+        fixed_args = head + checkers
+        return CommandTemplate(
+            tuple(head),
+            tuple(checkers),
+            tuple(ctu_display_progress or []),
+            frozenset(flag for flag in ['-x', '--target', '-std']
+                      if has_flag(flag, fixed_args)))
+
     def construct_analyzer_cmd(self, result_handler):
         """
         Called by the analyzer method.
@@ -140,63 +226,19 @@ class ClangSA(analyzer_base.SourceAnalyzer):
             # Get an output file from the result handler.
             analyzer_output_file = result_handler.analyzer_result_file
 
-            # Get the checkers list from the config_handler.
-            # Checker order matters.
             config = self.config_handler
+            template = self.get_analyzer_cmd_template(config)
 
-            analyzer_cmd = [config.analyzer_binary, '--analyze',
-                            # Do not warn about the unused gcc/g++ arguments.
-                            '-Qunused-arguments']
-
-            for plugin in config.analyzer_plugins:
-                analyzer_cmd.extend(["-Xclang", "-plugin",
-                                     "-Xclang", "checkercfg",
-                                     "-Xclang", "-load",
-                                     "-Xclang", plugin])
-
-            analyzer_mode = 'plist-multi-file'
-            analyzer_cmd.extend(['-Xclang',
-                                 '-analyzer-opt-analyze-headers',
-                                 '-Xclang',
-                                 '-analyzer-output=' + analyzer_mode,
-                                 '-o', analyzer_output_file])
-
-            # Expand macros in plist output on the bug path.
-            analyzer_cmd.extend(['-Xclang',
-                                 '-analyzer-config',
-                                 '-Xclang',
-                                 'expand-macros=true'])
+            analyzer_cmd = list(template.head)
+            analyzer_cmd.extend(['-o', analyzer_output_file])
 
             # Checker configuration arguments needs to be set before
             # the checkers.
-            if self.__checker_configs:
-                for cfg in self.__checker_configs:
-                    analyzer_cmd.extend(cfg)
-
-            # Config handler stores which checkers are enabled or disabled.
-            for checker_name, value in config.checks().items():
-                state, _ = value
-                if state == CheckerState.enabled:
-                    analyzer_cmd.extend(['-Xclang',
-                                         '-analyzer-checker=' + checker_name])
-                elif state == CheckerState.disabled:
-                    analyzer_cmd.extend(['-Xclang',
-                                         '-analyzer-disable-checker=' +
-                                         checker_name])
-
-            # Enable aggressive-binary-operation-simplification option.
-            analyzer_cmd.extend(
-                clang_options.get_abos_options(config.version_info))
-
-            # Enable the z3 solver backend.
-            if config.enable_z3:
-                analyzer_cmd.extend(['-Xclang', '-analyzer-constraints=z3'])
-
-            if config.enable_z3_refutation and not config.enable_z3:
-                analyzer_cmd.extend(['-Xclang',
-                                     '-analyzer-config',
-                                     '-Xclang',
-                                     'crosscheck-with-z3=true'])
+            for cfg in self.__checker_configs:
+                analyzer_cmd.extend(cfg)
+
+            # Checker order matters.
+            analyzer_cmd.extend(template.checkers)
 
             if config.ctu_dir and not self.__disable_ctu:
                 analyzer_cmd.extend(
@@ -204,20 +246,18 @@ class ClangSA(analyzer_base.SourceAnalyzer):
                      'experimental-enable-naive-ctu-analysis=true',
                      '-Xclang', '-analyzer-config', '-Xclang',
                      'ctu-dir=' + self.get_ctu_dir()])
-                ctu_display_progress = config.ctu_capability.display_progress
-                if ctu_display_progress:
-                    analyzer_cmd.extend(ctu_display_progress)
+                analyzer_cmd.extend(template.ctu_display_progress)
 
             compile_lang = self.buildaction.lang
-            if not has_flag('-x', analyzer_cmd):
+            if '-x' not in template.flags:
                 analyzer_cmd.extend(['-x', compile_lang])
 
-            if not has_flag('--target', analyzer_cmd) and \
+            if '--target' not in template.flags and \
                     self.buildaction.target.get(compile_lang, "") != "":
                 analyzer_cmd.append("--target=" +
                                     self.buildaction.target.get(compile_lang))
 
-            if not has_flag('-std', analyzer_cmd) and \
+            if '-std' not in template.flags and \
                     self.buildaction.compiler_standard.get(compile_lang, "") \
                     != "":
                 analyzer_cmd.append(
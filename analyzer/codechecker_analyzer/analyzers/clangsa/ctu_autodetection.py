@@ -14,7 +14,7 @@ from __future__ import absolute_import
 import subprocess
 
 from codechecker_common.logger import get_logger
-from codechecker_analyzer import host_check
+from codechecker_analyzer import capability_cache, host_check
 from codechecker_analyzer.analyzers.clangsa import clang_options, version
 
 LOG = get_logger('analyzer.clangsa')
@@ -64,11 +64,12 @@ class CTUAutodetection(object):
                 'set!')
             return None
 
-        analyzer_version = invoke_binary_checked(
-            self.__analyzer_binary, ['--version'], self.environ)
-
-        if analyzer_version is False:
-            LOG.debug('Failed to invoke command to get Clang version!')
+        try:
+            analyzer_version = version.get_output(self.__analyzer_binary,
+                                                  self.environ)
+        except (subprocess.CalledProcessError, OSError) as e:
+            LOG.debug('Failed to invoke command to get Clang version! '
+                      'Details: %s', e)
             return None
 
         version_parser = version.ClangVersionInfoParser()
@@ -165,5 +166,7 @@ class CTUAutodetection(object):
         if not tool_path:
             return False
 
-        return invoke_binary_checked(tool_path, ['-version'], self.environ) \
-            is not False
+        return capability_cache.cached(
+            tool_path, 'runnable',
+            lambda: invoke_binary_checked(tool_path, ['-version'],
+                                          self.environ) is not False)
@@ -11,51 +11,88 @@ from __future__ import division
 from __future__ import absolute_import
 
 import glob
+import hashlib
+import heapq
+import itertools
+import json
 import os
 import shutil
 import tempfile
 
 from codechecker_common.logger import get_logger
 
+from ... import capability_cache
 from .. import analyzer_base
 from . import ctu_triple_arch
 
 LOG = get_logger('analyzer')
 
+# Directory in the CTU directory which contains the manifests and function
+# maps of the already collected translation units. Its name starts with a dot
+# so it is not mistaken for a triple arch directory.
+CTU_CACHE_FOLDER = '.ast-cache'
 
-def generate_func_map_lines(fnmap_dir):
-    """ Iterate over all lines of input files in random order. """
+# Maximum number of the temporary function map files which are opened at the
+# same time when they are merged into the global function map.
+FNMAP_MERGE_FAN_IN = 128
 
-    files = glob.glob(os.path.join(fnmap_dir, '*'))
-    for filename in files:
-        with open(filename, 'r') as in_file:
-            for line in in_file:
+# Content hashes of the dependency files calculated in this process. The
+# key is (path, modification time, size), so modified files are hashed
+# again.
+_file_hash_cache = {}
+
+
+def generate_func_map_lines(fnmap_file):
+    """ Iterate over the non-empty lines of a function map file. """
+
+    with open(fnmap_file, 'r') as in_file:
+        for line in in_file:
+            line = line.rstrip('\n')
+            if line:
                 yield line
 
 
+def merge_sorted_func_maps(fnmap_files, work_dir):
+    """ Returns an iterator over the lines of the given sorted function map
+    files in sorted order.
+
+    The files are merged by a k-way merge. At most FNMAP_MERGE_FAN_IN files
+    are opened at the same time, so if there are more files they are merged
+    into intermediate sorted files in work_dir first. """
+
+    fnmap_files = list(fnmap_files)
+    while len(fnmap_files) > FNMAP_MERGE_FAN_IN:
+        merged_files = []
+        for i in range(0, len(fnmap_files), FNMAP_MERGE_FAN_IN):
+            with tempfile.NamedTemporaryFile(mode='w', dir=work_dir,
+                                             delete=False) as out_file:
+                for line in heapq.merge(
+                        *[generate_func_map_lines(f) for f in
+                          fnmap_files[i:i + FNMAP_MERGE_FAN_IN]]):
+                    out_file.write(line + '\n')
+            merged_files.append(out_file.name)
+        fnmap_files = merged_files
+
+    return heapq.merge(*[generate_func_map_lines(f) for f in fnmap_files])
+
+
 def create_global_ctu_function_map(func_map_lines):
     """ Takes iterator of individual function maps and creates a global map
     keeping only unique names. We leave conflicting names out of CTU.
     A function map contains the id of a function (mangled name) and the
-    originating source (the corresponding AST file) name."""
+    originating source (the corresponding AST file) name.
 
-    mangled_to_asts = {}
+    The lines have to be sorted, so the occurrences of a function name are
+    next to each other. Only the occurrences of one name are kept in memory
+    at the same time. """
 
-    for line in func_map_lines:
-        mangled_name, ast_file = line.strip().split(' ', 1)
-        # We collect all occurences of a function name into a list
-        if mangled_name not in mangled_to_asts:
-            mangled_to_asts[mangled_name] = {ast_file}
-        else:
-            mangled_to_asts[mangled_name].add(ast_file)
+    def mangled_name(line):
+        return line.split(' ', 1)[0]
 
-    mangled_ast_pairs = []
-
-    for mangled_name, ast_files in mangled_to_asts.items():
+    for name, lines in itertools.groupby(func_map_lines, mangled_name):
+        ast_files = set(line.split(' ', 1)[1] for line in lines)
         if len(ast_files) == 1:
-            mangled_ast_pairs.append((mangled_name, ast_files.pop()))
-
-    return mangled_ast_pairs
+            yield name, ast_files.pop()
 
 
 def write_global_map(ctu_dir, arch, ctu_func_map_file, mangled_ast_pairs):
@@ -75,7 +112,10 @@ def merge_ctu_func_maps(ctu_dir, ctu_func_map_file, ctu_temp_fnmap_folder):
     These function maps contain the mangled names of functions and the source
     (AST generated from the source) which had them.
     These files should be merged at the end into a global map file:
-    ctu_func_map_file."""
+    ctu_func_map_file.
+
+    The temporary function maps are sorted by the workers, so the global map
+    is built by merging them without loading all of them into memory."""
 
     triple_arches = glob.glob(os.path.join(ctu_dir, '*'))
     for triple_path in triple_arches:
@@ -84,21 +124,35 @@ def merge_ctu_func_maps(ctu_dir, ctu_func_map_file, ctu_temp_fnmap_folder):
             fnmap_dir = os.path.join(ctu_dir, triple_arch,
                                      ctu_temp_fnmap_folder)
 
-            func_map_lines = generate_func_map_lines(fnmap_dir)
-            mangled_ast_pairs = create_global_ctu_function_map(func_map_lines)
-            write_global_map(ctu_dir, triple_arch, ctu_func_map_file,
-                             mangled_ast_pairs)
+            work_dir = tempfile.mkdtemp(dir=fnmap_dir)
+            try:
+                func_map_lines = merge_sorted_func_maps(
+                    [f for f in glob.glob(os.path.join(fnmap_dir, '*'))
+                     if os.path.isfile(f)], work_dir)
+                mangled_ast_pairs = \
+                    create_global_ctu_function_map(func_map_lines)
+                write_global_map(ctu_dir, triple_arch, ctu_func_map_file,
+                                 mangled_ast_pairs)
+            finally:
+                # Remove all temporary files
+                shutil.rmtree(fnmap_dir, ignore_errors=True)
+
+
+def get_ast_path(ctu_dir, triple_arch, source):
+    """ Returns the path of the AST file generated from the given source. """
+    ast_joined_path = os.path.join(ctu_dir, triple_arch, 'ast',
+                                   os.path.realpath(source)[1:] + '.ast')
+    return os.path.abspath(ast_joined_path)
 
-            # Remove all temporary files
-            shutil.rmtree(fnmap_dir, ignore_errors=True)
 
+def generate_ast(triple_arch, action, source, config, env, dep_file=None):
+    """ Generates ASTs for the current compilation command.
 
-def generate_ast(triple_arch, action, source, config, env):
-    """ Generates ASTs for the current compilation command. """
+    If a dependency file path is given, the list of the files the AST was
+    generated from is written to that file in Makefile format.
+    Returns True if the AST was generated successfully. """
 
-    ast_joined_path = os.path.join(config.ctu_dir, triple_arch, 'ast',
-                                   os.path.realpath(source)[1:] + '.ast')
-    ast_path = os.path.abspath(ast_joined_path)
+    ast_path = get_ast_path(config.ctu_dir, triple_arch, source)
     ast_dir = os.path.dirname(ast_path)
     if not os.path.isdir(ast_dir):
         try:
@@ -110,6 +164,9 @@ def generate_ast(triple_arch, action, source, config, env):
     # __clang__analyzer__ macro needs to be set in the imported TUs too.
     cmd.extend(['-emit-ast', '-D__clang_analyzer__', '-w', '-o', ast_path])
 
+    if dep_file:
+        cmd.extend(['-MD', '-MF', dep_file])
+
     cmdstr = ' '.join(cmd)
     LOG.debug_analyzer("Generating AST using '%s'", cmdstr)
     ret_code, _, err = analyzer_base.SourceAnalyzer.run_proc(cmd,
@@ -118,6 +175,9 @@ def generate_ast(triple_arch, action, source, config, env):
     if ret_code != 0:
         LOG.error("Error generating AST.\n\ncommand:\n\n%s\n\nstderr:\n\n%s",
                   cmdstr, err)
+        return False
+
+    return True
 
 
 def func_map_list_src_to_ast(func_src_list):
@@ -140,7 +200,10 @@ def func_map_list_src_to_ast(func_src_list):
 
 def map_functions(triple_arch, action, source, config, env,
                   func_map_cmd, temp_fnmap_folder):
-    """ Generate function map file for the current source. """
+    """ Generate function map file for the current source.
+
+    Returns the function map lines of the source or None if the function
+    mapping failed. """
 
     cmd = ctu_triple_arch.get_compile_command(action, config)
     cmd[0] = func_map_cmd
@@ -156,11 +219,22 @@ def map_functions(triple_arch, action, source, config, env,
     if ret_code != 0:
         LOG.error("Error generating function map."
                   "\n\ncommand:\n\n%s\n\nstderr:\n\n%s", cmdstr, err)
-        return
+        return None
 
     func_src_list = stdout.splitlines()
     func_ast_list = func_map_list_src_to_ast(func_src_list)
-    extern_fns_map_folder = os.path.join(config.ctu_dir, triple_arch,
+    write_temp_func_map(config.ctu_dir, triple_arch, temp_fnmap_folder,
+                        func_ast_list)
+
+    return func_ast_list
+
+
+def write_temp_func_map(ctu_dir, triple_arch, temp_fnmap_folder,
+                        func_ast_list):
+    """ Write the function map lines of a source into a temporary file which
+    is merged into the global function map at the end of the collection. """
+
+    extern_fns_map_folder = os.path.join(ctu_dir, triple_arch,
                                          temp_fnmap_folder)
     if not os.path.isdir(extern_fns_map_folder):
         try:
@@ -169,7 +243,239 @@ def map_functions(triple_arch, action, source, config, env,
             pass
 
     if func_ast_list:
+        # The function maps are sorted here, in the collect workers, so the
+        # global map can be created by merging them.
         with tempfile.NamedTemporaryFile(mode='w',
                                          dir=extern_fns_map_folder,
                                          delete=False) as out_file:
-            out_file.write("\n".join(func_ast_list) + "\n")
+            out_file.write("\n".join(sorted(func_ast_list)) + "\n")
+
+
+def parse_dependency_file(content):
+    """ Returns the list of the dependencies from the content of a Makefile
+    format dependency file generated by the '-MD' compiler option. """
+
+    # Remove the line continuations and the target of the rule.
+    content = content.replace('\\\n', ' ')
+    _, _, deps = content.partition(': ')
+
+    # Spaces in the file paths are escaped by backslashes.
+    deps = deps.replace('\\ ', '\0')
+    return [dep.replace('\0', ' ') for dep in deps.split()]
+
+
+def get_file_hash(path):
+    """ Returns the content hash of the given file or None if the file can
+    not be read. """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    key = (path, stat.st_mtime, stat.st_size)
+    if key not in _file_hash_cache:
+        hasher = hashlib.sha256()
+        try:
+            with open(path, 'rb') as dep_file:
+                for chunk in iter(lambda: dep_file.read(1 << 20), b''):
+                    hasher.update(chunk)
+        except (IOError, OSError):
+            return None
+        _file_hash_cache[key] = hasher.hexdigest()
+
+    return _file_hash_cache[key]
+
+
+def get_tu_cache_key(action, config):
+    """ Returns the key of the collected data of a translation unit. The key
+    is the hash of the compilation command which is used for the AST
+    generation, of its working directory and of the identity of the clang
+    binary, because the ASTs of another clang version can't be loaded. """
+
+    cmd = ctu_triple_arch.get_compile_command(action, config, action.source)
+    identity = capability_cache.get_binary_identity(config.analyzer_binary)
+    hasher = hashlib.sha256()
+    hasher.update('\n'.join([action.directory, json.dumps(identity)] + cmd)
+                  .encode('utf-8'))
+    return hasher.hexdigest()
+
+
+def __get_cache_paths(ctu_dir, key):
+    """ Returns the manifest and function map path of the given key. """
+    cache_dir = os.path.join(ctu_dir, CTU_CACHE_FOLDER)
+    return os.path.join(cache_dir, key + '.json'), \
+        os.path.join(cache_dir, key + '.fnmap')
+
+
+def load_cached_tu(ctu_dir, key):
+    """ Returns the manifest of the collected translation unit with the
+    given key if its AST and function map can be reused, otherwise None.
+
+    The collected data can be reused if none of the files the AST was
+    generated from changed and the AST file was not overwritten since. """
+
+    manifest_path, fnmap_path = __get_cache_paths(ctu_dir, key)
+    try:
+        with open(manifest_path, 'r') as manifest_file:
+            manifest = json.load(manifest_file)
+    except (IOError, OSError, ValueError):
+        return None
+
+    try:
+        ast_stat = os.stat(manifest['ast'])
+        if not os.path.isfile(fnmap_path) or \
+                [ast_stat.st_mtime, ast_stat.st_size] != manifest['ast_stat']:
+            return None
+
+        for dep, dep_hash in manifest['dependencies'].items():
+            if get_file_hash(dep) != dep_hash:
+                LOG.debug("'%s' of '%s' changed.", dep, manifest['source'])
+                return None
+    except (KeyError, OSError):
+        return None
+
+    return manifest
+
+
+def load_cached_func_map(ctu_dir, key):
+    """ Returns the function map lines of the collected translation unit with
+    the given key. """
+
+    _, fnmap_path = __get_cache_paths(ctu_dir, key)
+    with open(fnmap_path, 'r') as fnmap_file:
+        return fnmap_file.read().splitlines()
+
+
+def store_cached_tu(ctu_dir, key, triple_arch, action, dep_file,
+                    func_ast_list):
+    """ Save the manifest and the function map of a collected translation
+    unit, so they can be reused by the next collection if none of its
+    dependencies changes. Returns False if they could not be saved. """
+    source = action.source
+
+    manifest_path, fnmap_path = __get_cache_paths(ctu_dir, key)
+    cache_dir = os.path.dirname(manifest_path)
+    if not os.path.isdir(cache_dir):
+        try:
+            os.makedirs(cache_dir)
+        except OSError:
+            pass
+
+    try:
+        with open(dep_file, 'r') as dep:
+            dependencies = parse_dependency_file(dep.read())
+    except (IOError, OSError):
+        LOG.debug("No dependency file was generated for '%s'.", source)
+        return False
+
+    # Relative paths in the dependency file are relative to the working
+    # directory of the compilation.
+    dep_hashes = {}
+    for dep in dependencies:
+        dep = os.path.normpath(os.path.join(action.directory, dep))
+        dep_hashes[dep] = get_file_hash(dep)
+
+    ast_path = get_ast_path(ctu_dir, triple_arch, source)
+    ast_stat = os.stat(ast_path)
+
+    with open(fnmap_path, 'w') as fnmap_file:
+        fnmap_file.write('\n'.join(func_ast_list))
+
+    # The manifest is written last, so an interrupted write does not leave
+    # a valid entry behind.
+    with tempfile.NamedTemporaryFile(mode='w', dir=cache_dir,
+                                     delete=False) as manifest_file:
+        json.dump({'source': source,
+                   'triple_arch': triple_arch,
+                   'ast': ast_path,
+                   'ast_stat': [ast_stat.st_mtime, ast_stat.st_size],
+                   'dependencies': dep_hashes}, manifest_file)
+    os.rename(manifest_file.name, manifest_path)
+
+    return True
+
+
+def collect_tu(action, config, env, ctu_data):
+    """ Generate the AST and the function map of a translation unit or reuse
+    them from the previous collection if its dependencies did not change.
+
+    Returns the cache key of the translation unit if its collected data can
+    be reused by the next collection, otherwise None. """
+
+    ctu_dir = ctu_data.get('ctu_dir')
+    temp_fnmap_folder = ctu_data.get('ctu_temp_fnmap_folder')
+    key = get_tu_cache_key(action, config)
+
+    manifest = load_cached_tu(ctu_dir, key)
+    if manifest:
+        LOG.debug_analyzer("Reusing the AST of '%s'.", action.source)
+        write_temp_func_map(ctu_dir, manifest['triple_arch'],
+                            temp_fnmap_folder,
+                            load_cached_func_map(ctu_dir, key))
+        return key
+
+    triple_arch = ctu_triple_arch.get_triple_arch(action, action.source,
+                                                  config, env)
+
+    dep_file = tempfile.NamedTemporaryFile(suffix='.d', delete=False)
+    dep_file.close()
+    try:
+        ast_generated = generate_ast(triple_arch, action, action.source,
+                                     config, env, dep_file.name)
+        func_ast_list = map_functions(triple_arch, action, action.source,
+                                      config, env,
+                                      ctu_data.get('ctu_func_map_cmd'),
+                                      temp_fnmap_folder)
+
+        if ast_generated and func_ast_list is not None and \
+                store_cached_tu(ctu_dir, key, triple_arch, action,
+                                dep_file.name, func_ast_list):
+            return key
+    finally:
+        os.remove(dep_file.name)
+
+    return None
+
+
+def prune_ctu_cache(ctu_dir, used_keys):
+    """ Remove the collected data of the translation units whose cache keys
+    were not used by the last collection and the AST files which are not
+    needed by any of the used translation units. """
+
+    cache_dir = os.path.join(ctu_dir, CTU_CACHE_FOLDER)
+    if not os.path.isdir(cache_dir):
+        return
+
+    used_asts = set()
+    stale_asts = set()
+    for manifest_path in glob.glob(os.path.join(cache_dir, '*.json')):
+        try:
+            with open(manifest_path, 'r') as manifest_file:
+                ast_path = json.load(manifest_file).get('ast')
+        except (IOError, OSError, ValueError):
+            ast_path = None
+
+        key = os.path.splitext(os.path.basename(manifest_path))[0]
+        if key in used_keys:
+            used_asts.add(ast_path)
+            continue
+
+        stale_asts.add(ast_path)
+        os.remove(manifest_path)
+        fnmap_path = os.path.splitext(manifest_path)[0] + '.fnmap'
+        if os.path.exists(fnmap_path):
+            os.remove(fnmap_path)
+
+    for ast_path in stale_asts - used_asts:
+        if ast_path and os.path.exists(ast_path):
+            LOG.debug("Removing unused AST '%s'.", ast_path)
+            os.remove(ast_path)
+
+
+def prepare_ctu_dir(ctu_dir, temp_fnmap_folder):
+    """ Prepare the CTU directory for a new collection. The results of the
+    previous collection are kept, so they can be reused, only the temporary
+    function maps of an interrupted collection are removed. """
+
+    for fnmap_dir in glob.glob(os.path.join(ctu_dir, '*', temp_fnmap_folder)):
+        shutil.rmtree(fnmap_dir, ignore_errors=True)
@@ -12,6 +12,8 @@ from __future__ import absolute_import
 import re
 import subprocess
 
+from codechecker_analyzer import capability_cache
+
 
 class ClangVersionInfo(object):
     """ClangVersionInfo holds the version information of the used Clang."""
@@ -64,8 +66,19 @@ def get(clang_binary, env=None):
     Should return False for getting the version
     information not from a clang compiler.
     """
-    compiler_version = subprocess.check_output([clang_binary, '--version'],
-                                               env=env)
+    compiler_version = get_output(clang_binary, env)
     version_parser = ClangVersionInfoParser()
     version_info = version_parser.parse(compiler_version)
     return version_info
+
+
+def get_output(clang_binary, env=None):
+    """Returns the output of the version command of the given binary.
+
+    Raises subprocess.CalledProcessError or OSError if the binary can not be
+    executed.
+    """
+    return capability_cache.cached(
+        clang_binary, 'version',
+        lambda: subprocess.check_output([clang_binary, '--version'],
+                                        env=env))
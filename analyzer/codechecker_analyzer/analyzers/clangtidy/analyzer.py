@@ -9,6 +9,7 @@ from __future__ import print_function
 from __future__ import division
 from __future__ import absolute_import
 
+from collections import namedtuple
 import os
 import re
 import shlex
@@ -16,6 +17,7 @@ import subprocess
 
 from codechecker_common.logger import get_logger
 
+from codechecker_analyzer import capability_cache
 from codechecker_analyzer import host_check
 from codechecker_analyzer import env
 
@@ -30,6 +32,14 @@ from . import result_handler
 
 LOG = get_logger('analyzer')
 
+# The parts of the analyzer command which are the same for every translation
+# unit. The source file is placed between the head and the compiler arguments,
+# and the compiler warnings close the command. The flags are the language
+# related flags which are already given by the template.
+CommandTemplate = namedtuple('CommandTemplate', ['head', 'compiler_args',
+                                                 'compiler_warnings',
+                                                 'flags'])
+
 
 def parse_checkers(tidy_output):
     """
@@ -72,93 +82,114 @@ class ClangTidy(analyzer_base.SourceAnalyzer):
 
         try:
             command = shlex.split(' '.join(command))
-            result = subprocess.check_output(command, env=environ,
-                                             universal_newlines=True)
-            return parse_checkers(result)
+            return capability_cache.cached(
+                analyzer_binary, ' '.join(command[1:]),
+                lambda: parse_checkers(subprocess.check_output(
+                    command, env=environ, universal_newlines=True)))
         except (subprocess.CalledProcessError, OSError):
             return []
 
-    def construct_analyzer_cmd(self, result_handler):
+    @classmethod
+    def construct_analyzer_cmd_template(cls, config_handler):
         """
+        Construct the parts of the analyzer command which are the same for
+        every translation unit.
         """
-        try:
-            config = self.config_handler
+        config = config_handler
 
-            analyzer_cmd = [config.analyzer_binary]
+        head = [config.analyzer_binary]
 
-            # Do not disable any clang-tidy checks explicitly, but don't run
-            # ClangSA checkers. ClangSA checkers are driven by an other
-            # analyzer in CodeChecker.
-            # For clang compiler warnings a correspoding
-            # clang-diagnostic error is generated by Clang tidy.
-            # They can be disabled by this glob -clang-diagnostic-*
-            checkers_cmdline = ['-clang-analyzer-*', 'clang-diagnostic-*']
+        # Do not disable any clang-tidy checks explicitly, but don't run
+        # ClangSA checkers. ClangSA checkers are driven by an other
+        # analyzer in CodeChecker.
+        # For clang compiler warnings a correspoding
+        # clang-diagnostic error is generated by Clang tidy.
+        # They can be disabled by this glob -clang-diagnostic-*
+        checkers_cmdline = ['-clang-analyzer-*', 'clang-diagnostic-*']
 
-            compiler_warnings = []
+        compiler_warnings = []
 
-            # Config handler stores which checkers are enabled or disabled.
-            for checker_name, value in config.checks().items():
-                state, _ = value
+        # Config handler stores which checkers are enabled or disabled.
+        for checker_name, value in config.checks().items():
+            state, _ = value
 
-                # Checker name is a compiler warning.
-                if checker_name.startswith('W'):
-                    warning_name = checker_name[4:] if \
-                        checker_name.startswith('Wno-') else checker_name[1:]
-
-                    if state == CheckerState.enabled:
-                        compiler_warnings.append('-W' + warning_name)
-                    elif state == CheckerState.disabled:
-                        compiler_warnings.append('-Wno-' + warning_name)
-
-                    continue
+            # Checker name is a compiler warning.
+            if checker_name.startswith('W'):
+                warning_name = checker_name[4:] if \
+                    checker_name.startswith('Wno-') else checker_name[1:]
 
                 if state == CheckerState.enabled:
-                    checkers_cmdline.append(checker_name)
+                    compiler_warnings.append('-W' + warning_name)
                 elif state == CheckerState.disabled:
-                    checkers_cmdline.append('-' + checker_name)
+                    compiler_warnings.append('-Wno-' + warning_name)
 
-            # The invocation should end in a Popen call with shell=False, so
-            # no globbing should occur even if the checks argument contains
-            # characters that would trigger globbing in the shell.
-            analyzer_cmd.append("-checks=%s" % ','.join(checkers_cmdline))
+                continue
 
-            analyzer_cmd.extend(config.analyzer_extra_arguments)
+            if state == CheckerState.enabled:
+                checkers_cmdline.append(checker_name)
+            elif state == CheckerState.disabled:
+                checkers_cmdline.append('-' + checker_name)
 
-            if config.checker_config:
-                analyzer_cmd.append('-config="' + config.checker_config + '"')
+        # The invocation should end in a Popen call with shell=False, so
+        # no globbing should occur even if the checks argument contains
+        # characters that would trigger globbing in the shell.
+        head.append("-checks=%s" % ','.join(checkers_cmdline))
 
-            analyzer_cmd.append(self.source_file)
+        head.extend(config.analyzer_extra_arguments)
 
-            analyzer_cmd.append("--")
+        if config.checker_config:
+            head.append('-config="' + config.checker_config + '"')
 
-            analyzer_cmd.append('-Qunused-arguments')
+        compiler_args = ['--',
+                         '-Qunused-arguments',
+                         # Enable these compiler warnings by default.
+                         '-Wall', '-Wextra']
 
-            # Enable these compiler warnings by default.
-            analyzer_cmd.extend(['-Wall', '-Wextra'])
+        fixed_args = head + compiler_args
+        return CommandTemplate(
+            tuple(head),
+            tuple(compiler_args),
+            tuple(compiler_warnings),
+            frozenset(flag for flag in ['-x', '--target', '-std', '--std']
+                      if has_flag(flag, fixed_args)))
+
+    def construct_analyzer_cmd(self, result_handler):
+        """
+        """
+        try:
+            config = self.config_handler
+            template = self.get_analyzer_cmd_template(config)
+
+            analyzer_cmd = list(template.head)
+
+            analyzer_cmd.append(self.source_file)
+
+            analyzer_cmd.extend(template.compiler_args)
 
             compile_lang = self.buildaction.lang
 
-            if not has_flag('-x', analyzer_cmd):
+            if '-x' not in template.flags:
                 analyzer_cmd.extend(['-x', compile_lang])
 
-            if not has_flag('--target', analyzer_cmd) and \
+            if '--target' not in template.flags and \
                     self.buildaction.target.get(compile_lang, "") != "":
                 analyzer_cmd.append(
                     "--target=" + self.buildaction.target.get(compile_lang,
                                                               ""))
 
-            analyzer_cmd.extend(self.buildaction.analyzer_options)
-
-            analyzer_cmd.extend(prepend_all(
+            tu_args = list(self.buildaction.analyzer_options)
+            tu_args.extend(prepend_all(
                 '-isystem',
                 self.buildaction.compiler_includes[compile_lang]))
+            analyzer_cmd.extend(tu_args)
 
-            if not has_flag('-std', analyzer_cmd) and not \
-                    has_flag('--std', analyzer_cmd):
+            if not template.flags.intersection(['-std', '--std']) and \
+                    not has_flag('-std', tu_args) and \
+                    not has_flag('--std', tu_args):
                 analyzer_cmd.append(
                     self.buildaction.compiler_standard.get(compile_lang, ""))
 
-            analyzer_cmd.extend(compiler_warnings)
+            analyzer_cmd.extend(template.compiler_warnings)
 
             return analyzer_cmd
 
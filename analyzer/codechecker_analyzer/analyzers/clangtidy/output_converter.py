@@ -123,18 +123,28 @@ class OutputParser(object):
             tidy_out: something iterable (e.g.: a file object)
         """
 
+        self.messages.extend(self.iter_messages(tidy_out))
+        return self.messages
+
+    def iter_messages(self, tidy_out):
+        """
+        Parse the given clang-tidy output lazily. The messages are yielded as
+        soon as they are parsed, and they are not collected by the parser.
+
+        Parameters:
+            tidy_out: something iterable (e.g.: a file object)
+        """
+
         titer = iter(tidy_out)
         try:
             next_line = next(titer)
             while True:
                 message, next_line = self._parse_message(titer, next_line)
                 if message is not None:
-                    self.messages.append(message)
+                    yield message
         except StopIteration:
             pass
 
-        return self.messages
-
     def _parse_message(self, titer, line):
         """
         Parse the given line. Returns a (message, next_line) pair or throws a
@@ -226,6 +236,23 @@ class PListConverter(object):
             'diagnostics': []
         }
 
+        # Index of the files in the plist's "files" list.
+        self._file_ids = {}
+
+    def _get_file_id(self, path):
+        """
+        Returns the index of the given file in the plist's "files" list. New
+        files are added to the list.
+        """
+
+        idx = self._file_ids.get(path)
+        if idx is None:
+            idx = len(self.plist['files'])
+            self._file_ids[path] = idx
+            self.plist['files'].append(path)
+
+        return idx
+
     def _add_files_from_messages(self, messages):
         """
         Adds the new files from the given message array to the plist's "files"
@@ -234,25 +261,11 @@ class PListConverter(object):
 
         fmap = {}
         for message in messages:
-            try:
-                # This file is already in the plist.
-                idx = self.plist['files'].index(message.path)
-                fmap[message.path] = idx
-            except ValueError:
-                # New file.
-                fmap[message.path] = len(self.plist['files'])
-                self.plist['files'].append(message.path)
+            fmap[message.path] = self._get_file_id(message.path)
 
             # Collect file paths from the message notes.
             for nt in message.notes:
-                try:
-                    # This file is already in the plist.
-                    idx = self.plist['files'].index(nt.path)
-                    fmap[nt.path] = idx
-                except ValueError:
-                    # New file.
-                    fmap[nt.path] = len(self.plist['files'])
-                    self.plist['files'].append(nt.path)
+                fmap[nt.path] = self._get_file_id(nt.path)
 
         return fmap
 
@@ -392,5 +405,47 @@ class PListConverter(object):
 
         plistlib.writePlist(self.plist, file)
 
+    def write_messages_to_file(self, path, messages):
+        """
+        Converts the given clang-tidy messages and writes them out as plist
+        XML to the given path.
+        """
+
+        with open(path, 'wb') as file:
+            self.write_messages(file, messages)
+
+    def write_messages(self, file, messages):
+        """
+        Converts the given clang-tidy messages and writes them out as plist
+        XML using the given file object. The diagnostics are written one by
+        one as they are converted, they are not kept in memory. So messages
+        can be a lazy iterable like the one returned by
+        OutputParser.iter_messages().
+
+        The output is the same as the output of write() after add_messages().
+        """
+
+        writer = plistlib.PlistWriter(file)
+        writer.writeln("<plist version=\"1.0\">")
+        writer.beginElement('dict')
+
+        # The keys of the dict are written in sorted order, so the
+        # diagnostics precede the files which are known only after every
+        # message is converted.
+        writer.simpleElement('key', 'diagnostics')
+
+        writer.beginElement('array')
+        for message in messages:
+            fmap = self._add_files_from_messages([message])
+            writer.writeValue(PListConverter._create_diag(
+                message, fmap, self.plist['files']))
+        writer.endElement('array')
+
+        writer.simpleElement('key', 'files')
+        writer.writeValue(self.plist['files'])
+
+        writer.endElement('dict')
+        writer.writeln("</plist>")
+
     def __str__(self):
         return str(json.dumps(self.plist, indent=4, separators=(',', ': ')))
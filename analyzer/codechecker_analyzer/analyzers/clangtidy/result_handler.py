@@ -10,6 +10,9 @@ from __future__ import print_function
 from __future__ import division
 from __future__ import absolute_import
 
+from collections import OrderedDict
+import os
+
 from codechecker_common import report
 from codechecker_common.logger import get_logger
 
@@ -25,13 +28,69 @@ def generate_plist_from_tidy_result(output_file, tidy_stdout):
     Generate a plist file from the clang tidy analyzer results.
     """
     parser = output_converter.OutputParser()
-
-    messages = parser.parse_messages(tidy_stdout)
+    messages = parser.iter_messages(tidy_stdout)
 
     plist_converter = output_converter.PListConverter()
-    plist_converter.add_messages(messages)
+    plist_converter.write_messages_to_file(output_file, messages)
+
+
+def generate_plists_from_batch_result(tidy_stdout, result_handlers,
+                                      get_dependencies=None):
+    """
+    Generate plist files from the results of a clang-tidy run which analyzed
+    the source files of multiple result handlers.
+
+    The messages in an analyzed source file go to the plist file of its
+    result handler. The messages in other files (e.g. headers) are reported
+    only once by clang-tidy, so they go to the plist file of every result
+    handler whose translation unit includes the file, as if the source files
+    were analyzed separately. get_dependencies returns the files of the
+    translation unit of a result handler, or None if they are unknown, in
+    which case the translation unit is considered to include every header.
+    The messages which can't be attributed go to the plist file of the first
+    result handler.
+    """
+    handler_messages = OrderedDict(
+        (os.path.normpath(rh.analyzed_source_file), [])
+        for rh in result_handlers)
+
+    header_messages = []
+    parser = output_converter.OutputParser()
+    for message in parser.iter_messages(tidy_stdout):
+        path = os.path.normpath(message.path)
+        if path in handler_messages:
+            handler_messages[path].append(message)
+        else:
+            header_messages.append((path, message))
+
+    if header_messages:
+        attributed = set()
+        for rh in result_handlers:
+            dependencies = get_dependencies(rh) if get_dependencies else None
+            if dependencies is not None:
+                dependencies = set(os.path.normpath(path)
+                                   for path in dependencies)
+
+            messages = handler_messages[
+                os.path.normpath(rh.analyzed_source_file)]
+            for idx, (path, message) in enumerate(header_messages):
+                if dependencies is None or path in dependencies:
+                    messages.append(message)
+                    attributed.add(idx)
+
+        first_source = next(iter(handler_messages))
+        handler_messages[first_source].extend(
+            message for idx, (_, message) in enumerate(header_messages)
+            if idx not in attributed)
+
+    for rh in result_handlers:
+        plist_converter = output_converter.PListConverter()
+        plist_converter.write_messages_to_file(
+            rh.analyzer_result_file,
+            handler_messages[os.path.normpath(rh.analyzed_source_file)])
 
-    plist_converter.write_to_file(output_file)
+        if rh.report_hash_type == 'context-free':
+            report.use_context_free_hashes(rh.analyzer_result_file)
 
 
 class ClangTidyPlistToFile(ResultHandler):
@@ -46,8 +105,8 @@ class ClangTidyPlistToFile(ResultHandler):
         """
         output_file = self.analyzer_result_file
         LOG.debug_analyzer(self.analyzer_stdout)
-        tidy_stdout = self.analyzer_stdout.splitlines()
-        generate_plist_from_tidy_result(output_file, tidy_stdout)
+        with open(self.analyzer_stdout_file, 'r') as tidy_stdout:
+            generate_plist_from_tidy_result(output_file, tidy_stdout)
 
         if self.report_hash_type == 'context-free':
             report.use_context_free_hashes(output_file)
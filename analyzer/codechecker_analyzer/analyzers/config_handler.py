@@ -56,6 +56,11 @@ class AnalyzerConfigHandler(object):
         self.checker_config = ''
         self.report_hash = None
 
+        # The parts of the analyzer command which are the same for every
+        # translation unit. It is built from this configuration when the
+        # first analyzer command is constructed.
+        self.analyzer_cmd_template = None
+
         # The key is the checker name, the value is a tuple.
         # False if disabled (should be by default).
         # True if checker is enabled.
@@ -88,6 +93,7 @@ class AnalyzerConfigHandler(object):
             state = CheckerState.default
 
         self.__available_checkers[checker_name] = (state, description)
+        self.analyzer_cmd_template = None
 
     def set_checker_enabled(self, checker_name, enabled=True):
         """
@@ -101,6 +107,8 @@ class AnalyzerConfigHandler(object):
                     else CheckerState.disabled
                 self.__available_checkers[ch_name] = (state, description)
 
+        self.analyzer_cmd_template = None
+
     def checks(self):
         """
         Return the checkers.
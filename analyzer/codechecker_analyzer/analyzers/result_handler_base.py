@@ -15,6 +15,7 @@ from abc import ABCMeta
 import hashlib
 import os
 
+from codechecker_common import result_manifest
 from codechecker_common.logger import get_logger
 
 LOG = get_logger('analyzer')
@@ -52,14 +53,23 @@ class ResultHandler(object):
         self.__workspace = workspace
 
         self.analyzer_cmd = []
+        # The end of the analyzer outputs, the complete outputs are in the
+        # output files.
         self.analyzer_stdout = ''
         self.analyzer_stderr = ''
+        self.analyzer_stdout_file = None
+        self.analyzer_stderr_file = None
         self.severity_map = {}
         self.skiplist_handler = None
         self.analyzed_source_file = None
         self.analyzer_returncode = 1
+        self.analyzer_resource_usage = None
         self.__buildaction = action
 
+        # The result file goes to a subdirectory of the workspace in the
+        # sharded layout of the report directory.
+        self.sharded = False
+
         self.__result_file = None
 
         # Report hash type can influence the post processing
@@ -97,7 +107,12 @@ class ResultHandler(object):
                 hashlib.md5(build_info.encode(errors='ignore')).hexdigest() \
                 + '.plist'
 
-            out_file = os.path.join(self.__workspace, out_file_name)
+            out_dir = self.__workspace
+            if self.sharded:
+                out_dir = result_manifest.get_shard_dir(out_dir,
+                                                        out_file_name)
+
+            out_file = os.path.join(out_dir, out_file_name)
             self.__result_file = out_file
 
         return self.__result_file
@@ -109,6 +124,26 @@ class ResultHandler(object):
         """
         self.__result_file = file_path
 
+    def open_output_files(self):
+        """
+        Create the files for the standard output and error of the analyzer
+        next to the result file and return them opened for writing.
+        """
+        self.analyzer_stdout_file = self.analyzer_result_file + '.stdout'
+        self.analyzer_stderr_file = self.analyzer_result_file + '.stderr'
+
+        return open(self.analyzer_stdout_file, 'wb'), \
+            open(self.analyzer_stderr_file, 'wb')
+
+    def clean_output_files(self):
+        """
+        Remove the output files of the analyzer.
+        """
+        for output_file in [self.analyzer_stdout_file,
+                            self.analyzer_stderr_file]:
+            if output_file and os.path.exists(output_file):
+                os.remove(output_file)
+
     def clean_results(self):
         """
         Should be called after the postprocessing and result handling is done.
@@ -70,12 +70,23 @@ class BuildAction(object):
         multiple times it should be checked only once.
         Use this key to compare compilation commands for the analysis.
         """
-        hash_content = []
-        hash_content.extend(self.analyzer_options)
-        hash_content.append(str(self.analyzer_type))
-        hash_content.append(self.target[self.lang])
-        hash_content.append(self.source)
-        return hash(''.join(hash_content))
+        return hash(self.fingerprint)
+
+    @property
+    def fingerprint(self):
+        """
+        Canonical identity of the action for the analysis. The actions with
+        the same fingerprint give the same analysis results even if their
+        original commands differ, for example in the output file.
+        """
+        return (self.source,
+                self.directory,
+                self.lang,
+                str(self.analyzer_type),
+                self.target.get(self.lang) or '',
+                self.compiler_standard.get(self.lang) or '',
+                tuple(self.compiler_includes.get(self.lang) or []),
+                tuple(self.analyzer_options))
 
     def with_attr(self, attr, value):
         details = {key: getattr(self, key) for key in BuildAction.__slots__}
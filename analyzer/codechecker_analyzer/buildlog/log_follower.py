@@ -0,0 +1,193 @@
+# -------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -------------------------------------------------------------------------
+"""
+Follow a JSON compilation database which is still being written by the
+build logger, so the compile commands can be analyzed during the build.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import fcntl
+import json
+import os
+import time
+
+from codechecker_common.logger import get_logger
+
+from . import log_parser
+
+LOG = get_logger('buildlogger')
+
+
+class CompilationDatabaseFollower(object):
+    """
+    Reads the entries of a compilation database as they are appended to it.
+
+    The build logger appends the entries while it holds the lock on the
+    '<logfile>.lock' file, so the log file is read under the same lock.
+    """
+
+    def __init__(self, logfile, is_writing, poll_interval=1.0):
+        """
+        is_writing -- A function which returns whether the compilation
+                      database is still being written, e.g. whether the
+                      build is still running.
+        """
+        self.__logfile = logfile
+        self.__is_writing = is_writing
+        self.__poll_interval = poll_interval
+        self.__offset = 0
+        self.__decoder = json.JSONDecoder()
+
+    def read(self, lock=True):
+        """
+        Returns the entries which were appended to the compilation database
+        since the previous read.
+        """
+        if not os.path.exists(self.__logfile):
+            return []
+
+        lock_fd = None
+        if lock:
+            lock_fd = os.open(self.__logfile + '.lock',
+                              os.O_RDWR | os.O_CREAT, 0o600)
+            fcntl.flock(lock_fd, fcntl.LOCK_SH)
+
+        try:
+            with open(self.__logfile, 'rb') as logfile:
+                logfile.seek(self.__offset)
+                data = logfile.read()
+        finally:
+            if lock_fd is not None:
+                fcntl.flock(lock_fd, fcntl.LOCK_UN)
+                os.close(lock_fd)
+
+        return self.__parse(data)
+
+    def __parse(self, data):
+        """
+        Parse the complete entries of the given part of the compilation
+        database and move the read offset after the last of them. The
+        closing bracket of the database is not consumed, because it is
+        overwritten by the next entry.
+        """
+        text = data if isinstance(data, str) else data.decode('utf-8')
+
+        entries = []
+        pos = 0
+        while True:
+            # Skip the separators between the entries.
+            while pos < len(text) and text[pos] in ' \t\r\n,[':
+                pos += 1
+
+            if pos >= len(text) or text[pos] == ']':
+                break
+
+            try:
+                entry, pos = self.__decoder.raw_decode(text, pos)
+            except ValueError:
+                # The rest of the entry is not written yet.
+                break
+
+            entries.append(entry)
+
+        self.__offset += pos if text is data else \
+            len(text[:pos].encode('utf-8'))
+
+        return entries
+
+    def follow(self):
+        """
+        Yields the lists of the new entries of the compilation database until
+        it is written. The last list contains the entries which were written
+        after the last check.
+        """
+        while self.__is_writing():
+            entries = self.read()
+            if entries:
+                yield entries
+            else:
+                time.sleep(self.__poll_interval)
+
+        # The build logger doesn't write the database anymore, so the lock
+        # file is not needed. Reading the log file under the lock might have
+        # created it again after the build removed it.
+        lock_file = self.__logfile + '.lock'
+        if os.path.exists(lock_file):
+            os.remove(lock_file)
+
+        entries = self.read(lock=False)
+        if entries:
+            yield entries
+
+
+class ActionStream(object):
+    """
+    Iterates over the build actions of a followed compilation database in
+    lists of the newly appended compile commands.
+
+    The compile commands are parsed like by log_parser.parse_unique_log() in
+    the 'none' uniqueing mode and a build action is dropped if the same
+    compilation action was returned earlier.
+
+    The stream counts the compile commands with the attributes of the
+    CompileCmdParseCount of the analyze command, so the counts are
+    up to date during the analysis.
+    """
+
+    def __init__(self, follower, report_dir, compiler_info_file=None,
+                 keep_gcc_fix_headers=False, skip_handler=None, env=None):
+        self.__follower = follower
+        self.__report_dir = report_dir
+        self.__compiler_info_file = compiler_info_file
+        self.__keep_gcc_fix_headers = keep_gcc_fix_headers
+        self.__skip_handler = skip_handler
+        self.__env = env
+        self.__fingerprints = set()
+
+        # The build actions returned so far.
+        self.actions = []
+
+        self.total = 0
+        self.skipped = 0
+
+    @property
+    def analyze(self):
+        return len(self.actions)
+
+    @property
+    def removed_by_uniqueing(self):
+        return self.total - self.skipped - self.analyze
+
+    def __iter__(self):
+        for entries in self.__follower.follow():
+            self.total += len(entries)
+
+            actions, skipped = log_parser.parse_unique_log(
+                entries,
+                self.__report_dir,
+                'none',
+                self.__compiler_info_file,
+                self.__keep_gcc_fix_headers,
+                self.__skip_handler,
+                env=self.__env)
+            self.skipped += skipped
+
+            new_actions = []
+            for action in actions:
+                fingerprint = action.fingerprint
+                if fingerprint not in self.__fingerprints:
+                    self.__fingerprints.add(fingerprint)
+                    new_actions.append(action)
+
+            LOG.debug("%d new compile commands in the compilation database, "
+                      "%d of them are analyzed.", len(entries),
+                      len(new_actions))
+
+            if new_actions:
+                self.actions.extend(new_actions)
+                yield new_actions
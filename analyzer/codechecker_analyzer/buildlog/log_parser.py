@@ -7,7 +7,7 @@
 from __future__ import print_function
 from __future__ import absolute_import
 
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 # pylint: disable=no-name-in-module
 from distutils.spawn import find_executable
 
@@ -20,12 +20,13 @@ import sys
 import tempfile
 import traceback
 
-from codechecker_analyzer.analyzers import clangsa
+from codechecker_analyzer.analyzers.clangsa import version
 
 from codechecker_common.logger import get_logger
 from codechecker_common.util import load_json_or_empty
 
 from .. import gcc_toolchain
+from .. import tracer
 from .build_action import BuildAction
 
 LOG = get_logger('buildlogger')
@@ -523,25 +524,29 @@ class ImplicitCompilerInfo(object):
             # Independently of the actual compilation language in the
             # compile command collect the iformation for C and C++.
             if not ICI.compiler_info.get(compiler):
-                ICI.compiler_info[compiler] = defaultdict(dict)
-
-                # Collect for C
-                ICI.compiler_info[compiler][ICI.c()]['compiler_includes'] = \
-                    ICI.get_compiler_includes(compiler, ICI.c(),
-                                              details['analyzer_options'])
-                ICI.compiler_info[compiler][ICI.c()]['target'] = \
-                    ICI.get_compiler_target(compiler)
-                ICI.compiler_info[compiler][ICI.c()]['compiler_standard'] = \
-                    ICI.get_compiler_standard(compiler, ICI.c())
-
-                # Collect for C++
-                ICI.compiler_info[compiler][ICI.cpp()]['compiler_includes'] = \
-                    ICI.get_compiler_includes(compiler, ICI.cpp(),
-                                              details['analyzer_options'])
-                ICI.compiler_info[compiler][ICI.cpp()]['target'] = \
-                    ICI.get_compiler_target(compiler)
-                ICI.compiler_info[compiler][ICI.cpp()]['compiler_standard'] = \
-                    ICI.get_compiler_standard(compiler, ICI.cpp())
+                with tracer.span('Compiler probing', 'log parsing',
+                                 compiler=compiler):
+                    info = defaultdict(dict)
+
+                    # Collect for C
+                    info[ICI.c()]['compiler_includes'] = \
+                        ICI.get_compiler_includes(compiler, ICI.c(),
+                                                  details['analyzer_options'])
+                    info[ICI.c()]['target'] = \
+                        ICI.get_compiler_target(compiler)
+                    info[ICI.c()]['compiler_standard'] = \
+                        ICI.get_compiler_standard(compiler, ICI.c())
+
+                    # Collect for C++
+                    info[ICI.cpp()]['compiler_includes'] = \
+                        ICI.get_compiler_includes(compiler, ICI.cpp(),
+                                                  details['analyzer_options'])
+                    info[ICI.cpp()]['target'] = \
+                        ICI.get_compiler_target(compiler)
+                    info[ICI.cpp()]['compiler_standard'] = \
+                        ICI.get_compiler_standard(compiler, ICI.cpp())
+
+                    ICI.compiler_info[compiler] = info
 
         def set_details_from_ICI(key, lang):
             """Set compiler related information in the 'details' dictionary.
@@ -884,6 +889,148 @@ def __skip_gcc(flag_iterator, _):
     return False
 
 
+class FlagTranslationCache(object):
+    """
+    Memoization of the translation of the compiler flags. Thousands of
+    translation units of a build usually share the same flags, which differ
+    only in the source and the output files. So the flags are translated only
+    once for every distinct flag vector.
+    """
+    # Placeholders of the translation unit specific arguments in the
+    # normalized flag vectors.
+    SOURCE = '<codechecker-source>'
+    OUTPUT = '<codechecker-output>'
+    DROPPED = '<codechecker-dropped>'
+
+    # The parameters of these flags are never used for the analysis.
+    DROPPED_PARAM_FLAGS = {'-MF', '-MT', '-MQ'}
+
+    # The translations of the normalized flag vectors in least recently used
+    # order. The value is None if the translation depends on the translation
+    # unit specific arguments. The cache lives as long as the process, which
+    # is long in the analysis server, so its size is limited.
+    translations = OrderedDict()
+    max_translations = 4096
+    hits = 0
+    misses = 0
+
+    @staticmethod
+    def normalize(flags, directory, source):
+        """
+        Returns the given flags where the source file, the output file and
+        the dropped parameters are replaced by placeholders, and the output
+        file.
+        """
+        normalized = []
+        output = None
+
+        dropped_param_flags = FlagTranslationCache.DROPPED_PARAM_FLAGS
+
+        flag_iterator = iter(flags)
+        for flag in flag_iterator:
+            if flag == '-o' or flag in dropped_param_flags:
+                normalized.append(flag)
+                param = next(flag_iterator, None)
+                if param is None:
+                    break
+
+                if flag == '-o':
+                    output = param
+                    normalized.append(FlagTranslationCache.OUTPUT)
+                else:
+                    normalized.append(FlagTranslationCache.DROPPED)
+            elif flag[:1] != '-' and source and os.path.normpath(
+                    os.path.join(directory, flag)) == source:
+                normalized.append(FlagTranslationCache.SOURCE)
+            else:
+                normalized.append(flag)
+
+        return normalized, output
+
+    @staticmethod
+    def has_placeholder(value):
+        """ Returns True if the value contains any of the placeholders. """
+        return any(placeholder in value for placeholder in
+                   [FlagTranslationCache.SOURCE,
+                    FlagTranslationCache.OUTPUT,
+                    FlagTranslationCache.DROPPED])
+
+    @staticmethod
+    def is_valid(translation):
+        """
+        Returns True if no placeholder went to the translation, so it does not
+        depend on the translation unit specific arguments.
+        """
+        return not any(FlagTranslationCache.has_placeholder(value)
+                       for value in translation['analyzer_options'] +
+                       [translation['arch'], translation['lang'] or ''] +
+                       ([] if translation['output'] ==
+                        FlagTranslationCache.OUTPUT
+                        else [translation['output']]))
+
+
+def __translate_flags(flags, flag_processors, details):
+    """
+    Run the flag processors on the given flags and collect the results to
+    the details.
+    """
+    for it in OptionIterator(flags):
+        for flag_processor in flag_processors:
+            if flag_processor(it, details):
+                break
+        else:
+            pass
+            # print('Unhandled argument: ' + it.item)
+
+
+def __translate_flags_memoized(flags, flag_processors, details):
+    """
+    Translate the given flags by the flag processors or take the translation
+    from the FlagTranslationCache if the same flags were translated already.
+    """
+    cache = FlagTranslationCache
+    normalized, output = cache.normalize(flags, details['directory'],
+                                         details['source'])
+
+    # The translation depends on the chosen flag processors, the language of
+    # the compiler and the directory of the relative include paths.
+    key = (tuple(f.__name__ for f in flag_processors), details['lang'],
+           details['directory'], tuple(normalized))
+
+    if key not in cache.translations:
+        cache.misses += 1
+
+        translation = {'analyzer_options': [],
+                       'action_type': None,
+                       'arch': '',
+                       'lang': details['lang'],
+                       'output': '',
+                       'directory': details['directory']}
+        __translate_flags(normalized, flag_processors, translation)
+
+        translation = translation if cache.is_valid(translation) else None
+        cache.translations[key] = translation
+
+        while len(cache.translations) > cache.max_translations:
+            cache.translations.popitem(last=False)
+    else:
+        cache.hits += 1
+
+        # Move the translation to the end of the LRU list.
+        translation = cache.translations.pop(key)
+        cache.translations[key] = translation
+    if translation is None:
+        __translate_flags(flags, flag_processors, details)
+        return
+
+    details['analyzer_options'] = list(translation['analyzer_options'])
+    details['action_type'] = translation['action_type']
+    details['arch'] = translation['arch']
+    details['lang'] = translation['lang']
+    details['output'] = output \
+        if translation['output'] == cache.OUTPUT else translation['output']
+
+
 def parse_options(compilation_db_entry,
                   compiler_info_file=None,
                   keep_gcc_fix_headers=False,
@@ -992,17 +1139,6 @@ def parse_options(compilation_db_entry,
         using_clang_to_compile_and_analyze = True
         flag_processors = clang_flag_collectors
 
-    for it in OptionIterator(gcc_command[1:]):
-        for flag_processor in flag_processors:
-            if flag_processor(it, details):
-                break
-        else:
-            pass
-            # print('Unhandled argument: ' + it.item)
-
-    if details['action_type'] is None:
-        details['action_type'] = BuildAction.COMPILE
-
     details['source'] = os.path.normpath(
         os.path.join(compilation_db_entry['directory'],
                      compilation_db_entry['file']))
@@ -1011,6 +1147,11 @@ def parse_options(compilation_db_entry,
     if details['source'] == '.':
         details['source'] = ''
 
+    __translate_flags_memoized(gcc_command[1:], flag_processors, details)
+
+    if details['action_type'] is None:
+        details['action_type'] = BuildAction.COMPILE
+
     lang = get_language(os.path.splitext(details['source'])[1])
     if lang:
         if details['lang'] is None:
@@ -1180,6 +1321,10 @@ def parse_unique_log(compilation_database,
     """
     try:
         uniqued_build_actions = dict()
+        fingerprints = set()
+        duplicate_count = 0
+        FlagTranslationCache.hits = 0
+        FlagTranslationCache.misses = 0
 
         if compile_uniqueing == "alpha":
             build_action_uniqueing = CompileActionUniqueingType.SOURCE_ALPHA
@@ -1210,16 +1355,25 @@ def parse_unique_log(compilation_database,
             action = parse_options(entry,
                                    compiler_info_file,
                                    keep_gcc_fix_headers,
-                                   clangsa.version.get,
+                                   version.get,
                                    env)
 
             if not action.lang:
                 continue
             if action.action_type != BuildAction.COMPILE:
                 continue
+
+            # The same compilation action is analyzed only once in every
+            # uniqueing mode, e.g. if a multi-configuration build compiles
+            # the same file with the same flags multiple times.
+            fingerprint = action.fingerprint
+            if fingerprint in fingerprints:
+                duplicate_count += 1
+                continue
+            fingerprints.add(fingerprint)
+
             if build_action_uniqueing == CompileActionUniqueingType.NONE:
-                if action.__hash__ not in uniqued_build_actions:
-                    uniqued_build_actions[action.__hash__] = action
+                uniqued_build_actions[fingerprint] = action
             elif build_action_uniqueing == CompileActionUniqueingType.STRICT:
                 if action.source not in uniqued_build_actions:
                     uniqued_build_actions[action.source] = action
@@ -1262,6 +1416,15 @@ def parse_unique_log(compilation_database,
             LOG.debug("Writing compiler info into:"+compiler_info_out)
             json.dump(ImplicitCompilerInfo.get(), f)
 
+        if duplicate_count:
+            LOG.info("%d duplicate compile commands were removed.",
+                     duplicate_count)
+
+        LOG.debug("Translated the flags of %d compile commands, %d of them "
+                  "were taken from the cache.",
+                  FlagTranslationCache.hits + FlagTranslationCache.misses,
+                  FlagTranslationCache.hits)
+
         LOG.debug('Parsing log file done.')
         return list(uniqued_build_actions.values()), skipped_cmp_cmd_count
 
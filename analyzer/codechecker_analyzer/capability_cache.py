@@ -0,0 +1,201 @@
+# -------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -------------------------------------------------------------------------
+"""
+Persistent cache of the capabilities of the analyzer binaries.
+
+The supported checkers, the version and the available options of an
+analyzer are detected by running the analyzer binary, which takes a few
+seconds for every CodeChecker command. The results of these probes are
+stored in a cache file in the home directory of the user. The results of a
+binary are valid until the binary is replaced, so they are keyed by the real
+path, the size and the modification time of the binary.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+from codechecker_common.logger import get_logger
+
+LOG = get_logger('analyzer')
+
+# Version of the format of the cache file. Cache files of other versions are
+# ignored.
+CACHE_VERSION = 1
+
+# The cache file and the probe results which are loaded from it. The cache is
+# disabled if the cache file is None.
+_cache_file = os.path.join(os.path.expanduser('~'),
+                           '.codechecker.analyzers.json')
+_binaries = None
+
+
+def add_arguments(parser):
+    """
+    Add the argument which disables the cache to the given parser.
+
+    The analyzers are probed already when the arguments of the commands are
+    being added, so the cache is disabled here if the argument is given.
+    """
+    parser.add_argument('--no-cache',
+                        dest='no_cache',
+                        action='store_true',
+                        default=argparse.SUPPRESS,
+                        required=False,
+                        help="Do not use the cached capabilities (version, "
+                             "checkers, supported options) of the analyzer "
+                             "binaries, detect them by running the "
+                             "analyzers instead. The capabilities are "
+                             "cached in '~/.codechecker.analyzers.json' "
+                             "and they are detected again automatically if "
+                             "an analyzer binary changes.")
+
+    if '--no-cache' in sys.argv:
+        disable()
+
+
+def enable(cache_file):
+    """ Cache the capabilities of the analyzers in the given file. """
+    global _cache_file, _binaries
+
+    _cache_file = cache_file
+    _binaries = None
+
+
+def disable():
+    """ Detect the capabilities of the analyzers on every request. """
+    enable(None)
+
+
+def get_cache_file():
+    """ Returns the cache file or None if the cache is disabled. """
+    return _cache_file
+
+
+def is_enabled():
+    """ Returns True if the capabilities of the analyzers are cached. """
+    return _cache_file is not None
+
+
+def __to_str(value):
+    """
+    Convert the unicode strings of a loaded JSON value to str, so the cached
+    values are the same as the detected ones.
+    """
+    if isinstance(value, dict):
+        return {__to_str(k): __to_str(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [__to_str(v) for v in value]
+    if isinstance(value, unicode):
+        return value.encode('utf-8')
+    return value
+
+
+def __load():
+    """ Load the probe results of the binaries from the cache file. """
+    global _binaries
+
+    if _binaries is not None:
+        return _binaries
+
+    _binaries = {}
+    try:
+        with open(_cache_file, 'r') as cache:
+            content = json.load(cache)
+
+        if content.get('version') == CACHE_VERSION:
+            _binaries = __to_str(content['binaries'])
+    except (IOError, ValueError, KeyError, AttributeError) as ex:
+        LOG.debug("Failed to load the analyzer cache '%s': %s",
+                  _cache_file, ex)
+
+    return _binaries
+
+
+def __save():
+    """
+    Write the probe results to the cache file. The file is replaced
+    atomically, so concurrent CodeChecker commands never read a partially
+    written file.
+    """
+    try:
+        handle, tmp_file = tempfile.mkstemp(
+            prefix='.codechecker.analyzers.',
+            dir=os.path.dirname(_cache_file))
+        with os.fdopen(handle, 'w') as cache:
+            json.dump({'version': CACHE_VERSION, 'binaries': _binaries},
+                      cache, indent=2, sort_keys=True)
+        os.rename(tmp_file, _cache_file)
+    except (IOError, OSError) as ex:
+        LOG.debug("Failed to write the analyzer cache '%s': %s",
+                  _cache_file, ex)
+
+
+def get_binary_identity(binary):
+    """
+    Returns the real path of the given binary and its size and modification
+    time which identify its current version, or None if the binary does not
+    exist.
+    """
+    if not binary:
+        return None
+
+    path = os.path.realpath(binary)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    return path, [stat.st_size, stat.st_mtime]
+
+
+def get_files_identity(files):
+    """
+    Returns the identities of the given files (e.g. the plugins loaded by an
+    analyzer) as a string, so they can be the part of the name of a probe
+    whose result depends on them.
+    """
+    return json.dumps([get_binary_identity(path) for path in files])
+
+
+def cached(binary, probe, detect):
+    """
+    Returns the result of the given probe of the binary. The result is
+    detected by calling the detect function if it is not cached yet or the
+    binary has changed since then. Exceptions of the detect function are
+    propagated and the result is not cached in this case. False and None
+    results are not cached either, because the probes return them if the
+    binary fails to run, which may be a transient failure.
+
+    The result has to be serializable to JSON.
+    """
+    identity = get_binary_identity(binary) if is_enabled() else None
+    if identity is None:
+        return detect()
+
+    path, stamp = identity
+    binaries = __load()
+
+    entry = binaries.get(path)
+    if entry is None or entry['stamp'] != stamp:
+        entry = {'stamp': stamp, 'probes': {}}
+        binaries[path] = entry
+
+    if probe in entry['probes']:
+        LOG.debug("Using the cached '%s' probe of '%s'.", probe, path)
+        return entry['probes'][probe]
+
+    result = detect()
+    if result is not None and result is not False:
+        entry['probes'][probe] = result
+        __save()
+
+    return result
@@ -15,19 +15,27 @@ import collections
 import json
 import os
 import shutil
+import subprocess
 import sys
 
-from codechecker_analyzer import analyzer, analyzer_context, arg, env
+from codechecker_analyzer import analysis_server, analyzer, \
+    analyzer_context, arg, capability_cache, dependency_index, distributed, \
+    env, tracer
 from codechecker_analyzer.analyzers import analyzer_types
-from codechecker_analyzer.buildlog import log_parser
+from codechecker_analyzer.buildlog import log_follower, log_parser
 
 from codechecker_common import logger
+from codechecker_common import result_manifest
 from codechecker_common import skiplist_handler
 from codechecker_common.util import load_json_or_empty
 
 
 LOG = logger.get_logger('system')
 
+CompileCmdParseCount = \
+    collections.namedtuple('CompileCmdParseCount',
+                           'total, analyze, skipped, removed_by_uniqueing')
+
 
 def get_argparser_ctor_args():
     """
@@ -89,12 +97,68 @@ def add_arguments_to_parser(parser):
                              "consult the User guide on how a Skipfile "
                              "should be laid out.")
 
+    changed_files = parser.add_mutually_exclusive_group()
+
+    changed_files.add_argument('--changed-files',
+                               dest="changed_files",
+                               required=False,
+                               default=argparse.SUPPRESS,
+                               help="Path to a file which lists the changed "
+                                    "files, one path per line. Only the "
+                                    "translation units which include any of "
+                                    "these files are analyzed. The "
+                                    "translation units are looked up in the "
+                                    "dependency index of the previous "
+                                    "analysis in the output directory. The "
+                                    "translation units which were not "
+                                    "analyzed before are always analyzed.")
+
+    changed_files.add_argument('--since-git-rev',
+                               dest="since_git_rev",
+                               required=False,
+                               default=argparse.SUPPRESS,
+                               help="Analyze only the translation units "
+                                    "which include a file that was changed "
+                                    "since the given git revision, like "
+                                    "'--changed-files'. The changes are "
+                                    "listed by 'git diff' in the working "
+                                    "directory, so the uncommitted changes "
+                                    "are also taken into account.")
+
+    parser.add_argument('--dependency-index',
+                        dest="dependency_index",
+                        action='store_true',
+                        required=False,
+                        default=argparse.SUPPRESS,
+                        help="Save the dependencies of the analyzed "
+                             "translation units to the dependency index of "
+                             "the output directory, which is used by "
+                             "'--changed-files' and '--since-git-rev'. "
+                             "The dependencies are generated by running "
+                             "the compiler of every build command once, so "
+                             "the index is kept up to date only if this "
+                             "flag or one of these options is given, or "
+                             "the output directory already has an index.")
+
     parser.add_argument('-o', '--output',
                         dest="output_path",
                         required=True,
                         default=argparse.SUPPRESS,
                         help="Store the analysis output in the given folder.")
 
+    parser.add_argument('--sharded-output',
+                        dest="sharded_output",
+                        action='store_true',
+                        required=False,
+                        default=argparse.SUPPRESS,
+                        help="Put the result files in subdirectories of the "
+                             "output folder named after the hash prefix of "
+                             "the file names, so no directory contains too "
+                             "many files in the analysis of huge projects. "
+                             "The layout of an output folder which already "
+                             "contains results can't be changed without "
+                             "'--clean'.")
+
     parser.add_argument('--compiler-info-file',
                         dest="compiler_info_file",
                         required=False,
@@ -196,6 +260,51 @@ def add_arguments_to_parser(parser):
                         help="Annotate the run analysis with a custom name in "
                              "the created metadata file.")
 
+    parser.add_argument('--trace',
+                        dest="trace_file",
+                        required=False,
+                        default=argparse.SUPPRESS,
+                        help="Write the timeline of the analysis to the "
+                             "given file in the Chrome trace event format. "
+                             "It contains the duration of the log "
+                             "processing, the compiler probing, the "
+                             "pre-analysis, the analysis of each file by "
+                             "the worker processes and the post-processing "
+                             "of the results. The file can be opened in the "
+                             "trace viewer of Chrome (chrome://tracing).")
+
+    parser.add_argument('--server',
+                        dest="server",
+                        required=False,
+                        default=argparse.SUPPRESS,
+                        help="Run the analysis in the analysis server which "
+                             "listens on the given UNIX socket, see "
+                             "'CodeChecker analyze-server'. The analyses of "
+                             "the server start faster, because the "
+                             "compilers and the analyzers are not probed "
+                             "again. The analysis is run by this command if "
+                             "the server is not running. The default socket "
+                             "of the server is '" +
+                             analysis_server.DEFAULT_SOCKET + "'.")
+
+    parser.add_argument('--distributed',
+                        type=distributed.parse_address,
+                        dest="distributed",
+                        required=False,
+                        default=argparse.SUPPRESS,
+                        help="Listen on the given 'host:port' address for "
+                             "the analysis workers of other hosts and "
+                             "distribute the analysis to them instead of "
+                             "analyzing the files by this command, see "
+                             "'CodeChecker analyze-worker'. The output "
+                             "directory, the source files and the analyzers "
+                             "must be available on the same paths on every "
+                             "host. The connections are authenticated with "
+                             "the key in the " + distributed.AUTHKEY_ENV +
+                             " environment variable.")
+
+    capability_cache.add_arguments(parser)
+
     analyzer_opts = parser.add_argument_group("analyzer arguments")
 
     analyzer_opts.add_argument('--analyzers',
@@ -275,6 +384,22 @@ def add_arguments_to_parser(parser):
                                     "'CodeChecker analyzers --dump-config "
                                     "clang-tidy' command.")
 
+    analyzer_opts.add_argument('--tidy-batch-size',
+                               type=int,
+                               dest='tidy_batch_size',
+                               required=False,
+                               default=argparse.SUPPRESS,
+                               help="Analyze at most this many files with "
+                                    "the same compiler options by a single "
+                                    "clang-tidy invocation, so the start up "
+                                    "of clang-tidy is paid only once for "
+                                    "them. This makes the analysis of many "
+                                    "small files faster. The reports of the "
+                                    "files are still written to separate "
+                                    "result files. If the analysis of a "
+                                    "batch fails, its files are analyzed one "
+                                    "by one. (default: 1)")
+
     analyzer_opts.add_argument('--timeout',
                                type=int,
                                dest='timeout',
@@ -288,6 +413,63 @@ def add_arguments_to_parser(parser):
                                     "the analysis is considered as a failed "
                                     "one.")
 
+    analyzer_opts.add_argument('--cpu-timeout',
+                               type=int,
+                               dest='cpu_timeout',
+                               required=False,
+                               default=argparse.SUPPRESS,
+                               help="The amount of CPU time (in seconds) "
+                                    "that each analyzer can spend, "
+                                    "individually, to analyze the project. "
+                                    "Unlike '--timeout', the time the "
+                                    "analyzer waits for a CPU on an "
+                                    "overloaded machine is not counted. If "
+                                    "the limit is exceeded, the analyzer is "
+                                    "stopped by the operating system and "
+                                    "the analysis is considered as a failed "
+                                    "one.")
+
+    analyzer_opts.add_argument('--memory-budget',
+                               type=int,
+                               dest='memory_budget',
+                               required=False,
+                               default=argparse.SUPPRESS,
+                               help="The amount of memory (in MB) that the "
+                                    "analyzers running in parallel can use "
+                                    "together. A new analyzer is started "
+                                    "only if its expected memory usage fits "
+                                    "in this budget, even if this means "
+                                    "running fewer analyzers than the number "
+                                    "of jobs. The expected memory usage of a "
+                                    "file is learned from the previous "
+                                    "analysis in the same output "
+                                    "directory.")
+
+    analyzer_opts.add_argument('--memory-limit',
+                               type=int,
+                               dest='memory_limit',
+                               required=False,
+                               default=argparse.SUPPRESS,
+                               help="The amount of memory (in MB) that each "
+                                    "analyzer can allocate, individually. "
+                                    "If the analysis of a particular file "
+                                    "needs more memory, the analyzer fails "
+                                    "and the analysis is considered as a "
+                                    "failed one.")
+
+    analyzer_opts.add_argument('--failed-dir-size-limit',
+                               type=int,
+                               dest='failed_dir_size_limit',
+                               required=False,
+                               default=argparse.SUPPRESS,
+                               help="The maximum size (in MB) of the "
+                                    "'failed' directory of the output "
+                                    "directory. The source files of the "
+                                    "failed analyses are not stored above "
+                                    "this size, only the list of them is "
+                                    "written to the failure zips. "
+                                    "(default: 1024)")
+
     context = analyzer_context.get_context()
     clang_has_z3 = analyzer_types.is_z3_capable(context)
 
@@ -349,6 +531,9 @@ Cross-TU analysis. By default, no CTU analysis is run when
                                     "Cross-TU analysis. This phase generates "
                                     "extra files needed by CTU analysis, and "
                                     "puts them into '<OUTPUT_DIR>/ctu-dir'. "
+                                    "The extra files of the translation "
+                                    "units which did not change since the "
+                                    "previous collection are reused. "
                                     "NOTE: If this argument is present, "
                                     "CodeChecker will NOT execute the "
                                     "analyzers!")
@@ -578,6 +763,108 @@ def __update_skip_file(args):
         shutil.copyfile(args.skipfile, skip_file_to_send)
 
 
+def __get_changed_files(args):
+    """
+    Returns the changed files given by the '--changed-files' or the
+    '--since-git-rev' option. The program exits if they can't be listed.
+    """
+    try:
+        if 'changed_files' in args:
+            return dependency_index.read_changed_files(args.changed_files)
+
+        return dependency_index.get_git_changed_files(args.since_git_rev)
+    except IOError as ioerr:
+        LOG.error("Failed to read the changed files from '%s': %s",
+                  args.changed_files, ioerr)
+    except (subprocess.CalledProcessError, OSError) as err:
+        LOG.error("Failed to list the files changed since git revision "
+                  "'%s': %s", args.since_git_rev, err)
+
+    sys.exit(1)
+
+
+def __write_unique_compile_commands(output_path, actions):
+    uniqued_compilation_db_file = os.path.join(
+        output_path, "unique_compile_commands.json")
+    with open(uniqued_compilation_db_file, 'w') as f:
+        json.dump(actions, f,
+                  cls=log_parser.CompileCommandEncoder)
+
+
+def __parse_compile_commands(args, report_dir, compiler_info_file,
+                             skip_handler, pre_analysis_skip_handler,
+                             ctu_or_stats_enabled, analyzer_env):
+    """
+    Parse the compilation databases and return the build actions to analyze
+    together with the counts of the compile commands.
+    """
+    # Parse the JSON CCDBs and retrieve the compile commands.
+    actions = []
+
+    # Number of all the compilation commands in the parsed log files,
+    # logged by the logger.
+    all_cmp_cmd_count = 0
+    # Number of the skipped compile commands during the
+    # compile command processing.
+    skipped_cmp_cmd_count = 0
+
+    for log_file in args.logfile:
+        if not os.path.exists(log_file):
+            LOG.error("The specified logfile '%s' does not exist!",
+                      log_file)
+            continue
+        with tracer.span('Log processing', 'log parsing', log_file=log_file):
+            compile_commands = load_json_or_empty(log_file, default={})
+            all_cmp_cmd_count += len(compile_commands)
+            filtered_parsed_actions, skipped = log_parser.parse_unique_log(
+                compile_commands,
+                report_dir,
+                args.compile_uniqueing,
+                compiler_info_file,
+                args.keep_gcc_include_fixed,
+                skip_handler,
+                pre_analysis_skip_handler,
+                ctu_or_stats_enabled,
+                analyzer_env)
+        actions += filtered_parsed_actions
+        skipped_cmp_cmd_count += skipped
+
+    if 'changed_files' in args or 'since_git_rev' in args:
+        changed_files = __get_changed_files(args)
+        affected_actions = dependency_index.select_actions(
+            actions, args.output_path, changed_files)
+
+        LOG.info("%d of %d compilation commands are affected by the %d "
+                 "changed files.", len(affected_actions), len(actions),
+                 len(changed_files))
+        skipped_cmp_cmd_count += len(actions) - len(affected_actions)
+        actions = affected_actions
+
+    if not actions:
+        LOG.info("No analysis is required.\nThere were no compilation "
+                 "commands in the provided compilation database or "
+                 "all of them were skipped.")
+        tracer.finish()
+        sys.exit(0)
+
+    __write_unique_compile_commands(args.output_path, actions)
+
+    cmp_cmd_to_be_uniqued = all_cmp_cmd_count - skipped_cmp_cmd_count
+
+    # Number of compile commands removed during uniqueing.
+    removed_during_uniqueing = cmp_cmd_to_be_uniqued - len(actions)
+
+    all_to_be_analyzed = cmp_cmd_to_be_uniqued - removed_during_uniqueing
+
+    compile_cmd_count = CompileCmdParseCount(
+        total=all_cmp_cmd_count,
+        analyze=all_to_be_analyzed,
+        skipped=skipped_cmp_cmd_count,
+        removed_by_uniqueing=removed_during_uniqueing)
+
+    return actions, compile_cmd_count
+
+
 def main(args):
     """
     Perform analysis on the given logfiles and store the results in a machine-
@@ -585,8 +872,21 @@ def main(args):
     """
     logger.setup_logger(args.verbose if 'verbose' in args else None)
 
+    if 'server' in args:
+        exit_code = analysis_server.request_analysis(args.server, args)
+        if exit_code is not None:
+            sys.exit(exit_code)
+
+        LOG.warning("The analysis server is not running at '%s', the "
+                    "analysis is run by this command.", args.server)
+
     check_config_file(args)
 
+    if 'distributed' in args and not distributed.get_authkey():
+        LOG.error("The %s environment variable has to be set for the "
+                  "distributed analysis.", distributed.AUTHKEY_ENV)
+        sys.exit(1)
+
     if len(args.logfile) != 1:
         LOG.warning("Only one log file can be processed right now!")
         sys.exit(1)
@@ -602,13 +902,6 @@ def main(args):
         LOG.info("'--enable-all' was supplied for this analysis.")
 
     # We clear the output directory in the following cases.
-    ctu_dir = os.path.join(args.output_path, 'ctu-dir')
-    if 'ctu_phases' in args and args.ctu_phases[0] and \
-            os.path.isdir(ctu_dir):
-        # Clear the CTU-dir if the user turned on the collection phase.
-        LOG.debug("Previous CTU contents have been deleted.")
-        shutil.rmtree(ctu_dir)
-
     if 'clean' in args and os.path.isdir(args.output_path):
         LOG.info("Previous analysis results in '%s' have been removed, "
                  "overwriting with current result", args.output_path)
@@ -620,6 +913,12 @@ def main(args):
     LOG.debug("args: " + str(args))
     LOG.debug("Output will be stored to: '" + args.output_path + "'")
 
+    if 'trace_file' in args:
+        tracer.enable(args.trace_file)
+
+    if 'no_cache' in args:
+        capability_cache.disable()
+
     # Process the skip list if present.
     skip_handler = __get_skip_handler(args)
 
@@ -664,49 +963,24 @@ def main(args):
     analyzer_env = env.extend(context.path_env_extra,
                               context.ld_lib_path_extra)
 
-    # Parse the JSON CCDBs and retrieve the compile commands.
-    actions = []
-
-    # Number of all the compilation commands in the parsed log files,
-    # logged by the logger.
-    all_cmp_cmd_count = 0
-    # Number of the skipped compile commands during the
-    # compile command processing.
-    skipped_cmp_cmd_count = 0
-
-    for log_file in args.logfile:
-        if not os.path.exists(log_file):
-            LOG.error("The specified logfile '%s' does not exist!",
-                      log_file)
-            continue
-        compile_commands = load_json_or_empty(log_file, default={})
-        all_cmp_cmd_count += len(compile_commands)
-        filtered_parsed_actions, skipped = log_parser.parse_unique_log(
-            compile_commands,
-            report_dir,
-            args.compile_uniqueing,
-            compiler_info_file,
-            args.keep_gcc_include_fixed,
-            skip_handler,
-            pre_analysis_skip_handler,
-            ctu_or_stats_enabled,
-            analyzer_env)
-        actions += filtered_parsed_actions
-        skipped_cmp_cmd_count += skipped
-
-    if not actions:
-        LOG.info("No analysis is required.\nThere were no compilation "
-                 "commands in the provided compilation database or "
-                 "all of them were skipped.")
-        sys.exit(0)
-
-    uniqued_compilation_db_file = os.path.join(
-        args.output_path, "unique_compile_commands.json")
-    with open(uniqued_compilation_db_file, 'w') as f:
-        json.dump(actions, f,
-                  cls=log_parser.CompileCommandEncoder)
-
-    metadata = {'action_num': len(actions),
+    if 'build_process' in args:
+        # The compilation database is analyzed while the build of the check
+        # command writes it.
+        follower = log_follower.CompilationDatabaseFollower(
+            args.logfile[0], args.build_process.is_alive)
+        actions = log_follower.ActionStream(follower,
+                                            report_dir,
+                                            compiler_info_file,
+                                            args.keep_gcc_include_fixed,
+                                            skip_handler,
+                                            analyzer_env)
+        compile_cmd_count = actions
+    else:
+        actions, compile_cmd_count = __parse_compile_commands(
+            args, report_dir, compiler_info_file, skip_handler,
+            pre_analysis_skip_handler, ctu_or_stats_enabled, analyzer_env)
+
+    metadata = {'action_num': compile_cmd_count.analyze,
                 'command': sys.argv,
                 'versions': {
                     'codechecker': "{0} ({1})".format(
@@ -726,21 +1000,20 @@ def main(args):
         metadata['result_source_files'] = \
             metadata_prev['result_source_files']
 
-    CompileCmdParseCount = \
-        collections.namedtuple('CompileCmdParseCount',
-                               'total, analyze, skipped, removed_by_uniqueing')
-    cmp_cmd_to_be_uniqued = all_cmp_cmd_count - skipped_cmp_cmd_count
-
-    # Number of compile commands removed during uniqueing.
-    removed_during_uniqueing = cmp_cmd_to_be_uniqued - len(actions)
-
-    all_to_be_analyzed = cmp_cmd_to_be_uniqued - removed_during_uniqueing
-
-    compile_cmd_count = CompileCmdParseCount(
-        total=all_cmp_cmd_count,
-        analyze=all_to_be_analyzed,
-        skipped=skipped_cmp_cmd_count,
-        removed_by_uniqueing=removed_during_uniqueing)
+    # The layout of the previous results is kept, otherwise the reanalyzed
+    # files would have result files in both layouts.
+    if metadata['result_source_files']:
+        sharded = result_manifest.is_sharded(args.output_path)
+        if sharded != ('sharded_output' in args):
+            LOG.warning("The output directory '%s' already contains "
+                        "results in the %s layout, it is kept. Use "
+                        "'--clean' to change the layout.", args.output_path,
+                        'sharded' if sharded else 'flat')
+
+        if sharded:
+            args.sharded_output = True
+        elif 'sharded_output' in args:
+            del args.sharded_output
 
     LOG.debug_analyzer("Total number of compile commands without "
                        "skipping or uniqueing: %d", compile_cmd_count.total)
@@ -755,12 +1028,18 @@ def main(args):
                               metadata,
                               compile_cmd_count)
 
+    if 'build_process' in args:
+        metadata['action_num'] = actions.analyze
+        __write_unique_compile_commands(args.output_path, actions.actions)
+
     __update_skip_file(args)
 
     LOG.debug("Analysis metadata write to '%s'", metadata_file)
-    with open(metadata_file, 'w') as metafile:
+    with tracer.span('Write metadata'), open(metadata_file, 'w') as metafile:
         json.dump(metadata, metafile)
 
+    tracer.finish()
+
     # WARN: store command will search for this file!!!!
     compile_cmd_json = os.path.join(args.output_path, 'compile_cmd.json')
     try:
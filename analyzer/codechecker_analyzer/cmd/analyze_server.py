@@ -0,0 +1,112 @@
+# -------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -------------------------------------------------------------------------
+"""
+Subcommand module for the 'CodeChecker analyze-server' command which runs the
+analyses of the analyze command in a long-running process.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import argparse
+import sys
+
+from codechecker_analyzer import analysis_server, arg
+
+from codechecker_common import logger
+
+LOG = logger.get_logger('system')
+
+
+def get_argparser_ctor_args():
+    """
+    This method returns a dict containing the kwargs for constructing an
+    argparse.ArgumentParser (either directly or as a subparser).
+    """
+
+    return {
+        'prog': 'CodeChecker analyze-server',
+        'formatter_class': arg.RawDescriptionDefaultHelpFormatter,
+
+        # Description is shown when the command's help is queried directly
+        'description': """
+Start a server which runs the analyses of the 'CodeChecker analyze --server'
+commands. The server keeps the detected compiler and analyzer information
+and the analyzer configurations between the analyses, so the repeated
+analyses of a project start faster.
+
+If the analyzed files are watched, the translation units which include a
+modified file are analyzed again by the server in the output directory of
+their analysis, so 'CodeChecker parse' shows the latest results.""",
+
+        'epilog': """
+Example usage:
+  CodeChecker analyze-server --watch &
+  CodeChecker analyze compile_commands.json -o ./reports \\
+      --server ~/.codechecker.analyze-server.sock
+  CodeChecker parse ./reports""",
+
+        # Help is shown when the "parent" CodeChecker command lists the
+        # individual subcommands.
+        'help': "Start a server which runs the analyses of the analyze "
+                "command and re-analyzes the modified files."
+    }
+
+
+def add_arguments_to_parser(parser):
+    """
+    Add the subcommand's arguments to the given argparse.ArgumentParser.
+    """
+
+    parser.add_argument('--socket',
+                        dest="socket",
+                        required=False,
+                        default=analysis_server.DEFAULT_SOCKET,
+                        help="The UNIX socket on which the server listens "
+                             "for the analysis requests.")
+
+    parser.add_argument('--watch',
+                        dest="watch",
+                        action='store_true',
+                        default=argparse.SUPPRESS,
+                        required=False,
+                        help="Watch the files of the analyzed translation "
+                             "units and analyze the translation units "
+                             "again in the background if their files are "
+                             "modified. The files are watched with the "
+                             "inotify API of Linux.")
+
+    parser.add_argument('--debounce',
+                        type=float,
+                        dest="debounce",
+                        required=False,
+                        default=1.0,
+                        help="The number of seconds to wait after the last "
+                             "modification of the watched files before the "
+                             "modified files are analyzed again.")
+
+    logger.add_verbose_arguments(parser)
+    parser.set_defaults(func=main)
+
+
+def main(args):
+    """
+    Serve the analysis requests until the server is stopped.
+    """
+    verbose = args.verbose if 'verbose' in args else None
+    logger.setup_logger(verbose)
+
+    watcher = None
+    if 'watch' in args:
+        try:
+            watcher = analysis_server.InotifyWatcher()
+        except OSError as err:
+            LOG.error("Failed to watch the analyzed files: %s", err)
+            sys.exit(1)
+
+    server = analysis_server.AnalysisServer(args.socket, watcher, verbose,
+                                            args.debounce)
+    server.serve_forever()
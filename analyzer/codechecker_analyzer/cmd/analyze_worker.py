@@ -0,0 +1,117 @@
+# -------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -------------------------------------------------------------------------
+"""
+Subcommand module for the 'CodeChecker analyze-worker' command which analyzes
+the files of a distributed analysis.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import socket
+import sys
+
+from codechecker_analyzer import analysis_manager, arg, distributed
+
+from codechecker_common import logger
+
+LOG = logger.get_logger('system')
+
+
+def get_argparser_ctor_args():
+    """
+    This method returns a dict containing the kwargs for constructing an
+    argparse.ArgumentParser (either directly or as a subparser).
+    """
+
+    return {
+        'prog': 'CodeChecker analyze-worker',
+        'formatter_class': arg.RawDescriptionDefaultHelpFormatter,
+
+        # Description is shown when the command's help is queried directly
+        'description': """
+Analyze the files of a distributed analysis which is started by
+'CodeChecker analyze --distributed'. The worker connects to the address of the
+analyze command and analyzes the files given by it until the analysis is
+finished.
+
+The output directory, the source files and the analyzers of the analysis
+must be available on the same paths on every host, e.g. on a shared
+filesystem. The connections are authenticated with the key in the
+""" + distributed.AUTHKEY_ENV + """ environment variable, which must be the
+same for the analyze command and its workers.""",
+
+        'epilog': """
+Example usage:
+  # On the coordinating host.
+  export """ + distributed.AUTHKEY_ENV + """=secret
+  CodeChecker analyze compile_commands.json -o /shared/reports \\
+      --distributed :9000
+
+  # On every analyzing host.
+  export """ + distributed.AUTHKEY_ENV + """=secret
+  CodeChecker analyze-worker coordinator-host:9000 -j 16""",
+
+        # Help is shown when the "parent" CodeChecker command lists the
+        # individual subcommands.
+        'help': "Analyze the files of a distributed analysis."
+    }
+
+
+def add_arguments_to_parser(parser):
+    """
+    Add the subcommand's arguments to the given argparse.ArgumentParser.
+    """
+
+    parser.add_argument('coordinator',
+                        type=distributed.parse_address,
+                        help="The 'host:port' address of the analyze command "
+                             "which distributes the analysis.")
+
+    parser.add_argument('-j', '--jobs',
+                        type=int,
+                        dest="jobs",
+                        required=False,
+                        default=1,
+                        help="Number of threads to use in analysis. More "
+                             "threads mean faster analysis at the cost of "
+                             "using more memory.")
+
+    parser.add_argument('--wait',
+                        type=int,
+                        dest="wait",
+                        required=False,
+                        default=60,
+                        help="The number of seconds to wait for the analyze "
+                             "command to accept the connection, so the "
+                             "workers can be started before the analysis.")
+
+    logger.add_verbose_arguments(parser)
+    parser.set_defaults(func=main)
+
+
+def main(args):
+    """
+    Analyze the files of the distributed analysis.
+    """
+    logger.setup_logger(args.verbose if 'verbose' in args else None)
+
+    authkey = distributed.get_authkey()
+    if not authkey:
+        LOG.error("The %s environment variable has to be set for the "
+                  "distributed analysis.", distributed.AUTHKEY_ENV)
+        sys.exit(1)
+
+    try:
+        analysis_manager.start_remote_worker(args.coordinator, authkey,
+                                             args.jobs, args.wait)
+    except (socket.error, EOFError, IOError,
+            distributed.AuthenticationError) as err:
+        LOG.error("Distributed analysis at %s:%d failed: %s",
+                  args.coordinator[0], args.coordinator[1], err)
+        sys.exit(1)
+
+    LOG.info("Distributed analysis finished.")
@@ -14,8 +14,9 @@ from __future__ import absolute_import
 import argparse
 import subprocess
 
-from codechecker_analyzer import analyzer_context
+from codechecker_analyzer import analyzer_context, capability_cache
 from codechecker_analyzer.analyzers import analyzer_types
+from codechecker_analyzer.analyzers.clangsa import version
 
 from codechecker_common import logger
 from codechecker_common import output_formatters
@@ -48,6 +49,8 @@ def add_arguments_to_parser(parser):
     Add the subcommand's arguments to the given argparse.ArgumentParser.
     """
 
+    capability_cache.add_arguments(parser)
+
     context = analyzer_context.get_context()
     working, _ = analyzer_types.check_supported_analyzers(
         analyzer_types.supported_analyzers,
@@ -107,6 +110,9 @@ def main(args):
 
     logger.setup_logger(args.verbose if 'verbose' in args else None, stream)
 
+    if 'no_cache' in args:
+        capability_cache.disable()
+
     context = analyzer_context.get_context()
     working, errored = \
         analyzer_types.check_supported_analyzers(
@@ -150,14 +156,13 @@ def main(args):
         else:
             binary = context.analyzer_binaries.get(analyzer)
             try:
-                version = subprocess.check_output([binary,
-                                                   '--version'])
+                version_output = version.get_output(binary)
             except (subprocess.CalledProcessError, OSError):
-                version = 'ERROR'
+                version_output = 'ERROR'
 
             rows.append([analyzer,
                          binary,
-                         version])
+                         version_output])
 
     if 'all' in args:
         for analyzer, err_reason in errored:
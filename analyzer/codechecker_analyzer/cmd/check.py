@@ -13,12 +13,15 @@ from __future__ import division
 from __future__ import absolute_import
 
 import argparse
+import multiprocessing
 import os
 import shutil
+import sys
 import tempfile
 
 from codechecker_analyzer import arg
 from codechecker_analyzer import analyzer_context
+from codechecker_analyzer import capability_cache
 from codechecker_analyzer.analyzers import analyzer_types
 
 from codechecker_common import logger
@@ -77,6 +80,16 @@ def add_arguments_to_parser(parser):
                              "temporary directory which will be removed after "
                              "the analysis.")
 
+    parser.add_argument('--sharded-output',
+                        dest="sharded_output",
+                        action='store_true',
+                        required=False,
+                        default=argparse.SUPPRESS,
+                        help="Put the result files in subdirectories of the "
+                             "output folder named after the hash prefix of "
+                             "the file names, so no directory contains too "
+                             "many files in the analysis of huge projects.")
+
     parser.add_argument('-t', '--type', '--output-format',
                         dest="output_format",
                         required=False,
@@ -94,6 +107,21 @@ def add_arguments_to_parser(parser):
                              "analyzers' output will not be printed to the "
                              "standard output.")
 
+    parser.add_argument('--trace',
+                        dest="trace_file",
+                        required=False,
+                        default=argparse.SUPPRESS,
+                        help="Write the timeline of the analysis to the "
+                             "given file in the Chrome trace event format. "
+                             "It contains the duration of the log "
+                             "processing, the compiler probing, the "
+                             "pre-analysis, the analysis of each file by "
+                             "the worker processes and the post-processing "
+                             "of the results. The file can be opened in the "
+                             "trace viewer of Chrome (chrome://tracing).")
+
+    capability_cache.add_arguments(parser)
+
     parser.add_argument('-f', '--force',
                         dest="force",
                         default=argparse.SUPPRESS,
@@ -144,6 +172,21 @@ used to generate a log file on the fly.""")
                           help="Use an already existing JSON compilation "
                                "command database file specified at this path.")
 
+    parser.add_argument('--pipelined',
+                        dest="pipelined",
+                        action='store_true',
+                        required=False,
+                        default=argparse.SUPPRESS,
+                        help="Analyze the compilation commands while the "
+                             "build command is still running. Each logged "
+                             "compilation command is analyzed as soon as it "
+                             "is written to the compilation database, so "
+                             "the analysis overlaps the build. It can be "
+                             "used only with a build command, without CTU "
+                             "and statistics based analysis and with the "
+                             "'none' compile uniqueing, otherwise the "
+                             "analysis starts after the build.")
+
     analyzer_opts = parser.add_argument_group("analyzer arguments")
     analyzer_opts.add_argument('-j', '--jobs',
                                type=int,
@@ -304,6 +347,22 @@ used to generate a log file on the fly.""")
                                     "'CodeChecker analyzers --dump-config "
                                     "clang-tidy' command.")
 
+    analyzer_opts.add_argument('--tidy-batch-size',
+                               type=int,
+                               dest='tidy_batch_size',
+                               required=False,
+                               default=argparse.SUPPRESS,
+                               help="Analyze at most this many files with "
+                                    "the same compiler options by a single "
+                                    "clang-tidy invocation, so the start up "
+                                    "of clang-tidy is paid only once for "
+                                    "them. This makes the analysis of many "
+                                    "small files faster. The reports of the "
+                                    "files are still written to separate "
+                                    "result files. If the analysis of a "
+                                    "batch fails, its files are analyzed one "
+                                    "by one. (default: 1)")
+
     analyzer_opts.add_argument('--timeout',
                                type=int,
                                dest='timeout',
@@ -317,6 +376,63 @@ used to generate a log file on the fly.""")
                                     "the analysis is considered as a failed "
                                     "one.")
 
+    analyzer_opts.add_argument('--cpu-timeout',
+                               type=int,
+                               dest='cpu_timeout',
+                               required=False,
+                               default=argparse.SUPPRESS,
+                               help="The amount of CPU time (in seconds) "
+                                    "that each analyzer can spend, "
+                                    "individually, to analyze the project. "
+                                    "Unlike '--timeout', the time the "
+                                    "analyzer waits for a CPU on an "
+                                    "overloaded machine is not counted. If "
+                                    "the limit is exceeded, the analyzer is "
+                                    "stopped by the operating system and "
+                                    "the analysis is considered as a failed "
+                                    "one.")
+
+    analyzer_opts.add_argument('--memory-budget',
+                               type=int,
+                               dest='memory_budget',
+                               required=False,
+                               default=argparse.SUPPRESS,
+                               help="The amount of memory (in MB) that the "
+                                    "analyzers running in parallel can use "
+                                    "together. A new analyzer is started "
+                                    "only if its expected memory usage fits "
+                                    "in this budget, even if this means "
+                                    "running fewer analyzers than the number "
+                                    "of jobs. The expected memory usage of a "
+                                    "file is learned from the previous "
+                                    "analysis in the same output "
+                                    "directory.")
+
+    analyzer_opts.add_argument('--memory-limit',
+                               type=int,
+                               dest='memory_limit',
+                               required=False,
+                               default=argparse.SUPPRESS,
+                               help="The amount of memory (in MB) that each "
+                                    "analyzer can allocate, individually. "
+                                    "If the analysis of a particular file "
+                                    "needs more memory, the analyzer fails "
+                                    "and the analysis is considered as a "
+                                    "failed one.")
+
+    analyzer_opts.add_argument('--failed-dir-size-limit',
+                               type=int,
+                               dest='failed_dir_size_limit',
+                               required=False,
+                               default=argparse.SUPPRESS,
+                               help="The maximum size (in MB) of the "
+                                    "'failed' directory of the output "
+                                    "directory. The source files of the "
+                                    "failed analyses are not stored above "
+                                    "this size, only the list of them is "
+                                    "written to the failure zips. "
+                                    "(default: 1024)")
+
     context = analyzer_context.get_context()
     clang_has_z3 = analyzer_types.is_z3_capable(context)
 
@@ -379,6 +495,9 @@ is called.""")
                                     "Cross-TU analysis. This phase generates "
                                     "extra files needed by CTU analysis, and "
                                     "puts them into '<OUTPUT_DIR>/ctu-dir'. "
+                                    "The extra files of the translation "
+                                    "units which did not change since the "
+                                    "previous collection are reused. "
                                     "NOTE: If this argument is present, "
                                     "CodeChecker will NOT execute the "
                                     "analyzers!")
@@ -540,6 +659,29 @@ https://clang.llvm.org/docs/DiagnosticsReference.html.""")
     parser.set_defaults(func=main)
 
 
+def __can_pipeline(args):
+    """
+    Returns whether the analysis can follow the compilation database of the
+    build. The pre-analysis and the compile uniqueing need the complete
+    compilation database.
+    """
+    if 'pipelined' not in args:
+        return False
+
+    for key in ['ctu_phases', 'stats_output', 'stats_enabled']:
+        if key in args:
+            LOG.warning("CTU and statistics based analysis can't be "
+                        "pipelined, the analysis starts after the build.")
+            return False
+
+    if args.compile_uniqueing != 'none':
+        LOG.warning("Only the 'none' compile uniqueing can be pipelined, "
+                    "the analysis starts after the build.")
+        return False
+
+    return True
+
+
 def main(args):
     """
     Execute a wrapper over log-analyze-parse, aka 'check'.
@@ -577,6 +719,7 @@ def main(args):
 
     logfile = None
     is_command = False
+    build_process = None
     try:
         # --- Step 1.: Perform logging if build command was specified.
         if 'command' in args:
@@ -595,12 +738,19 @@ def main(args):
             LOG.debug("Calling LOG with args:")
             LOG.debug(log_args)
 
-            log_module.main(log_args)
+            if __can_pipeline(args):
+                # The build runs in a separate process and the analysis
+                # follows its compilation database.
+                build_process = multiprocessing.Process(
+                    target=log_module.main, args=(log_args,))
+                build_process.start()
+            else:
+                log_module.main(log_args)
         elif 'logfile' in args:
             logfile = args.logfile
 
         # --- Step 2.: Perform the analysis.
-        if not os.path.exists(logfile):
+        if not build_process and not os.path.exists(logfile):
             raise OSError("The specified logfile '" + logfile + "' does not "
                           "exist.")
 
@@ -615,12 +765,14 @@ def main(args):
         # We can't set these keys to None because it would result in an error
         # after the call.
         args_to_update = ['quiet',
+                          'sharded_output',
                           'skipfile',
                           'analyzers',
                           'add_compiler_defaults',
                           'clangsa_args_cfg_file',
                           'tidy_args_cfg_file',
                           'tidy_config',
+                          'tidy_batch_size',
                           'capture_analysis_output',
                           'config_file',
                           'ctu_phases',
@@ -632,6 +784,12 @@ def main(args):
                           'enable_all',
                           'ordered_checkers',  # --enable and --disable.
                           'timeout',
+                          'cpu_timeout',
+                          'memory_budget',
+                          'memory_limit',
+                          'failed_dir_size_limit',
+                          'trace_file',
+                          'no_cache',
                           'compile_uniqueing',
                           'report_hash',
                           'enable_z3',
@@ -642,12 +800,20 @@ def main(args):
             setattr(analyze_args, 'clean', True)
         __update_if_key_exists(args, analyze_args, 'verbose')
 
+        if build_process:
+            setattr(analyze_args, 'build_process', build_process)
+
         import codechecker_analyzer.cmd.analyze as analyze_module
         LOG.debug("Calling ANALYZE with args:")
         LOG.debug(analyze_args)
 
         analyze_module.main(analyze_args)
 
+        if build_process:
+            build_process.join()
+            if build_process.exitcode:
+                sys.exit(build_process.exitcode)
+
         # --- Step 3.: Print to stdout.
         parse_args = argparse.Namespace(
             input=[output_dir],
@@ -669,6 +835,8 @@ def main(args):
         import traceback
         traceback.print_exc()
     finally:
+        if build_process and build_process.is_alive():
+            build_process.terminate()
         if is_temp_output:
             shutil.rmtree(output_dir)
         if is_command:
@@ -15,7 +15,7 @@ import os
 import subprocess
 import sys
 
-from codechecker_analyzer import analyzer_context
+from codechecker_analyzer import analyzer_context, capability_cache
 from codechecker_analyzer.analyzers import analyzer_types
 from codechecker_analyzer.analyzers.clangsa.analyzer import ClangSA
 
@@ -65,9 +65,10 @@ def get_warnings(env=None):
 
     command = [diagtool_bin, 'tree']
     try:
-        result = subprocess.check_output(command, env=env,
-                                         universal_newlines=True)
-        return parse_warnings(result)
+        return capability_cache.cached(
+            diagtool_bin, 'tree',
+            lambda: parse_warnings(subprocess.check_output(
+                command, env=env, universal_newlines=True)))
     except (subprocess.CalledProcessError, OSError):
         return []
 
@@ -176,6 +177,7 @@ def add_arguments_to_parser(parser):
                         choices=output_formatters.USER_FORMATS,
                         help="The format to list the applicable checkers as.")
 
+    capability_cache.add_arguments(parser)
     logger.add_verbose_arguments(parser)
     parser.set_defaults(func=main)
 
@@ -194,6 +196,9 @@ def main(args):
 
     logger.setup_logger(args.verbose if 'verbose' in args else None, stream)
 
+    if 'no_cache' in args:
+        capability_cache.disable()
+
     # If nothing is set, list checkers for all supported analyzers.
     analyzers = args.analyzers \
         if 'analyzers' in args \
@@ -28,6 +28,7 @@ from codechecker_analyzer import analyzer_context, suppress_handler
 
 from codechecker_common import logger
 from codechecker_common import plist_parser
+from codechecker_common import result_manifest
 from codechecker_common import util
 from codechecker_common.skiplist_handler import SkipListHandler
 from codechecker_common.source_code_comment_handler import \
@@ -453,11 +454,15 @@ def add_arguments_to_parser(parser):
     parser.set_defaults(func=main)
 
 
-def parse(plist_file, metadata_dict, rh, file_report_map):
+def parse(plist_file, metadata_dict, rh, file_report_map,
+          manifest_entry=None):
     """
     Prints the results in the given file to the standard output in a human-
     readable format.
 
+    The modification time of the file is taken from its manifest entry if it
+    is given.
+
     Returns the report statistics collected by the result handler.
     """
 
@@ -477,7 +482,8 @@ def parse(plist_file, metadata_dict, rh, file_report_map):
 
     files, reports = rh.parse(plist_file)
 
-    plist_mtime = util.get_last_mod_time(plist_file)
+    plist_mtime = manifest_entry['mtime'] if manifest_entry \
+        else util.get_last_mod_time(plist_file)
 
     changed_files = set()
     for source_file in files:
@@ -514,10 +520,9 @@ def convert_reports_to_json(input_dirs):
         if os.path.isfile(input_path):
             input_files.add(input_path)
         elif os.path.isdir(input_path):
-            _, _, file_names = next(os.walk(input_path), ([], [], []))
-            input_paths = [os.path.join(input_path, file_name) for file_name
-                           in file_names]
-            input_files.update(input_paths)
+            input_files.update(
+                path for path, _ in
+                result_manifest.get_result_files(input_path))
 
     for input_file in input_files:
         if not input_file.endswith('.plist'):
@@ -668,7 +673,7 @@ def main(args):
         files = []
         metadata_dict = {}
         if os.path.isfile(input_path):
-            files.append(input_path)
+            files.append((input_path, None))
 
         elif os.path.isdir(input_path):
             metadata_file = os.path.join(input_path, "metadata.json")
@@ -686,9 +691,7 @@ def main(args):
                                   "Can not parse reports safely.", working_dir)
                         sys.exit(1)
 
-            _, _, file_names = next(os.walk(input_path), ([], [], []))
-            files = [os.path.join(input_path, file_name) for file_name
-                     in file_names]
+            files = result_manifest.get_result_files(input_path)
 
         file_report_map = defaultdict(list)
 
@@ -699,8 +702,9 @@ def main(args):
                                        trim_path_prefixes)
         rh.print_steps = 'print_steps' in args
 
-        for file_path in files:
-            f_change = parse(file_path, metadata_dict, rh, file_report_map)
+        for file_path, manifest_entry in files:
+            f_change = parse(file_path, metadata_dict, rh, file_report_map,
+                             manifest_entry)
             file_change = file_change.union(f_change)
 
         report_stats = rh.write(file_report_map)
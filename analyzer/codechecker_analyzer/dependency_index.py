@@ -0,0 +1,336 @@
+# -------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -------------------------------------------------------------------------
+"""
+Reverse dependency index of the analyzed translation units.
+
+The index maps every source file and header to the translation units which
+include it. It is persisted in the report directory after each analysis, so
+a later analysis can select only the translation units which are affected by
+a set of changed files.
+
+The dependencies are generated by the compiler of the build actions in
+'make' format (-M). The dependencies of a translation unit are generated
+again only if its build command or one of its files changed since the
+previous generation. Generating the dependencies of every translation unit
+is expensive, so the index is maintained only if it is requested.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+from collections import defaultdict
+import json
+import multiprocessing
+import os
+import subprocess
+import time
+
+from codechecker_common.logger import get_logger
+
+LOG = get_logger('analyzer')
+
+# The file of the dependency index in the report directory.
+INDEX_FILE = 'dependency_index.json'
+
+INDEX_VERSION = 2
+
+
+class DependencyIndex(object):
+    """
+    Dependencies of the translation units. The translation units are
+    identified by their source file, build command and directory, because
+    the same source file may be compiled by multiple build commands which
+    include different files.
+    """
+
+    def __init__(self):
+        # Generation time and the files of the translation units. The files
+        # of a translation unit are empty if they are unknown.
+        self.__timestamps = {}
+        self.__dependencies = {}
+
+        # The translation units whose dependencies failed to be generated.
+        self.__failed = set()
+
+    @staticmethod
+    def get_index_file(report_dir):
+        return os.path.join(report_dir, INDEX_FILE)
+
+    @classmethod
+    def load(cls, report_dir):
+        """
+        Load the dependency index of the given report directory. Returns None
+        if the report directory doesn't have a valid index.
+        """
+        index_file = cls.get_index_file(report_dir)
+        if not os.path.exists(index_file):
+            return None
+
+        try:
+            with open(index_file, 'r') as f:
+                data = json.load(f)
+
+            if data.get('version') != INDEX_VERSION:
+                LOG.debug("Dependency index '%s' has a different version.",
+                          index_file)
+                return None
+
+            index = cls()
+            units = []
+            for info in data['units']:
+                unit = (info['source'], info['command'], info['directory'])
+                units.append(unit)
+                index.__timestamps[unit] = info['timestamp']
+                index.__dependencies[unit] = set()
+                if info.get('failed'):
+                    index.__failed.add(unit)
+
+            for path, unit_ids in data['dependents'].items():
+                for unit_id in unit_ids:
+                    index.__dependencies[units[unit_id]].add(path)
+
+            return index
+        except (IOError, ValueError, KeyError, IndexError) as ex:
+            LOG.warning("Failed to load the dependency index '%s': %s",
+                        index_file, ex)
+            return None
+
+    def save(self, report_dir):
+        """
+        Write the index to the report directory in reverse form: the files
+        are mapped to the translation units which depend on them.
+        """
+        units = []
+        dependents = defaultdict(list)
+        for unit_id, unit in enumerate(sorted(self.__dependencies)):
+            source, command, directory = unit
+            units.append({'source': source,
+                          'command': command,
+                          'directory': directory,
+                          'timestamp': self.__timestamps[unit],
+                          'failed': unit in self.__failed})
+
+            for path in self.__dependencies[unit]:
+                dependents[path].append(unit_id)
+
+        index_file = self.get_index_file(report_dir)
+        with open(index_file, 'w') as f:
+            json.dump({'version': INDEX_VERSION,
+                       'units': units,
+                       'dependents': dependents}, f)
+
+    def __contains__(self, unit):
+        return unit in self.__dependencies
+
+    def get_units(self):
+        """ Returns the translation units of the index. """
+        return set(self.__dependencies)
+
+    def get_dependencies(self, unit):
+        """ Returns the files of the translation unit. """
+        return self.__dependencies.get(unit, set())
+
+    def get_files(self):
+        """ Returns the files of every translation unit. """
+        return set().union(*self.__dependencies.values())
+
+    def set_dependencies(self, unit, dependencies, timestamp):
+        """
+        Set the files of the translation unit which were generated at the
+        given time.
+        """
+        self.__timestamps[unit] = timestamp
+        self.__dependencies[unit] = set(dependencies)
+        self.__dependencies[unit].add(unit[0])
+        self.__failed.discard(unit)
+
+    def set_failed(self, unit, timestamp):
+        """
+        Record that the dependencies of the translation unit failed to be
+        generated at the given time. The previous dependencies of the
+        translation unit are kept.
+        """
+        self.__timestamps[unit] = timestamp
+        self.__dependencies.setdefault(unit, set())
+        self.__failed.add(unit)
+
+    def remove(self, unit):
+        """ Remove the translation unit from the index. """
+        del self.__timestamps[unit]
+        del self.__dependencies[unit]
+        self.__failed.discard(unit)
+
+    def is_up_to_date(self, unit, get_mtime):
+        """
+        The dependencies of the translation unit are up to date if none of
+        its files changed since they were generated. If the generation
+        failed, it is attempted again only if the source file changed, so
+        the failing compiler call is not repeated by every analysis.
+        """
+        if unit not in self.__dependencies:
+            return False
+
+        timestamp = self.__timestamps[unit]
+        if unit in self.__failed:
+            mtime = get_mtime(unit[0])
+            return mtime is not None and mtime <= timestamp
+
+        for path in self.__dependencies[unit]:
+            mtime = get_mtime(path)
+            if mtime is None or mtime > timestamp:
+                return False
+
+        return True
+
+    def get_dependents(self, changed_files):
+        """
+        Returns the translation units which include any of the changed
+        files. The translation units with unknown dependencies may include
+        any file.
+        """
+        changed_files = set(changed_files)
+        return set(unit for unit, deps in self.__dependencies.items()
+                   if not deps or not deps.isdisjoint(changed_files))
+
+
+def normalize_path(path, directory=''):
+    return os.path.normpath(os.path.join(directory, path))
+
+
+def get_translation_unit(action):
+    """
+    Returns the source file, the build command and the directory which
+    identify the translation unit of the build action in the index.
+    """
+    return (normalize_path(action.source, action.directory),
+            action.original_command, action.directory)
+
+
+def gather_dependencies(job):
+    """
+    Returns the files building up the translation unit of the given source
+    file or None if the dependencies can't be generated.
+    """
+    from tu_collector import tu_collector
+
+    source, command, directory = job
+    files, error = tu_collector.get_dependent_headers(command, directory,
+                                                      False)
+    # The dependencies contain at least the source file if they could be
+    # generated.
+    if error or not files:
+        LOG.debug("Failed to generate the dependencies of '%s': %s",
+                  source, error)
+        return None
+
+    return [normalize_path(path) for path in files]
+
+
+def update(report_dir, actions, jobs=1):
+    """
+    Update the dependency index of the report directory with the
+    dependencies of the translation units of the build actions.
+    """
+    index = DependencyIndex.load(report_dir) or DependencyIndex()
+
+    mtimes = {}
+
+    def get_mtime(path):
+        if path not in mtimes:
+            try:
+                mtimes[path] = os.path.getmtime(path)
+            except OSError:
+                mtimes[path] = None
+        return mtimes[path]
+
+    # The translation units are analyzed by every analyzer, but their
+    # dependencies are generated only once.
+    units = set(get_translation_unit(action) for action in actions)
+    outdated = [unit for unit in sorted(units)
+                if not index.is_up_to_date(unit, get_mtime)]
+
+    # The translation units of the source files which are built by other
+    # commands now are removed.
+    sources = set(unit[0] for unit in units)
+    removed = [unit for unit in index.get_units()
+               if unit[0] in sources and unit not in units]
+    for unit in removed:
+        index.remove(unit)
+
+    if not outdated:
+        if removed:
+            index.save(report_dir)
+        return
+
+    LOG.info("Generating the dependencies of %d translation units...",
+             len(outdated))
+
+    timestamp = time.time()
+    pool = multiprocessing.Pool(max(1, min(jobs, len(outdated))))
+    try:
+        dependencies = pool.map(gather_dependencies, outdated)
+    finally:
+        pool.close()
+        pool.join()
+
+    for unit, deps in zip(outdated, dependencies):
+        if deps is not None:
+            index.set_dependencies(unit, deps, timestamp)
+        else:
+            index.set_failed(unit, timestamp)
+
+    index.save(report_dir)
+
+
+def select_actions(actions, report_dir, changed_files):
+    """
+    Returns the build actions which are affected by the changed files.
+
+    The translation units which are not in the dependency index of the
+    report directory are always selected, because they were not analyzed
+    before. If the report directory doesn't have a dependency index, every
+    build action is selected.
+    """
+    index = DependencyIndex.load(report_dir)
+    if index is None:
+        LOG.warning("There is no dependency index in '%s', every "
+                    "translation unit is analyzed.", report_dir)
+        return actions
+
+    changed_files = set(normalize_path(path) for path in changed_files)
+    dependents = index.get_dependents(changed_files)
+
+    selected = []
+    for action in actions:
+        unit = get_translation_unit(action)
+        if unit not in index or unit in dependents:
+            selected.append(action)
+
+    return selected
+
+
+def read_changed_files(changed_files_file):
+    """
+    Returns the absolute paths of the files listed in the given file, one
+    path per line. Relative paths are relative to the working directory.
+    """
+    with open(changed_files_file, 'r') as f:
+        return [os.path.abspath(line.strip()) for line in f if line.strip()]
+
+
+def get_git_changed_files(revision):
+    """
+    Returns the absolute paths of the files which were changed since the
+    given git revision, including the uncommitted changes of the working
+    tree.
+    """
+    root = subprocess.check_output(['git', 'rev-parse', '--show-toplevel'],
+                                   universal_newlines=True).strip()
+    output = subprocess.check_output(['git', 'diff', '--name-only',
+                                      revision, '--'],
+                                     cwd=root, universal_newlines=True)
+
+    return [os.path.join(root, path) for path in output.splitlines() if path]
@@ -0,0 +1,382 @@
+# -------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -------------------------------------------------------------------------
+"""
+Distribution of the analysis to worker processes on other hosts.
+
+The coordinator listens on a TCP address and the workers connect to it. The
+messages are pickled and the connections are authenticated by the
+multiprocessing.connection module, so the coordinator and the workers have
+to use the same authentication key.
+
+The workers pull the tasks from the coordinator whenever they have a free
+process, so the faster hosts take more of the tasks. The tasks of a worker
+which is lost are given to the other workers again.
+
+The workers don't send the results of the analysis back: the report files
+are written to the output directory, so it has to be on a filesystem which
+is shared by the hosts, like the source files and the analyzers.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import argparse
+import collections
+from multiprocessing.connection import AuthenticationError, Client, \
+    Listener
+import multiprocessing
+import os
+import socket
+import threading
+import time
+import traceback
+
+from codechecker_common.logger import get_logger
+
+LOG = get_logger('analyzer')
+
+# The environment variable of the authentication key of the connections.
+AUTHKEY_ENV = 'CC_DISTRIBUTED_AUTHKEY'
+
+# How many times a task is given to a worker again if it fails.
+MAX_RETRIES = 2
+
+# Seconds between the checks of the processes of a worker.
+POLL_INTERVAL = 0.1
+
+# The data which is shared by the tasks of the worker process.
+_shared = None
+
+
+def parse_address(address):
+    """
+    Returns the (host, port) tuple of a 'host:port' address. The host can be
+    omitted to listen on every interface.
+    """
+    host, _, port = address.rpartition(':')
+    try:
+        return host or '0.0.0.0', int(port)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            "'{0}' is not a valid address, use 'host:port'.".format(address))
+
+
+def get_authkey():
+    """
+    Returns the authentication key of the connections from the environment
+    or None if it is not set.
+    """
+    authkey = os.environ.get(AUTHKEY_ENV)
+    return authkey.encode('utf-8') if authkey else None
+
+
+def enable_keepalive(conn):
+    """
+    Turn on the TCP keepalive of the connection, so the loss of the host at
+    the other end is detected even if no messages are sent.
+    """
+    sock = socket.fromfd(conn.fileno(), socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        for option, value in (('TCP_KEEPIDLE', 60),
+                              ('TCP_KEEPINTVL', 10),
+                              ('TCP_KEEPCNT', 6)):
+            if hasattr(socket, option):
+                sock.setsockopt(socket.IPPROTO_TCP,
+                                getattr(socket, option), value)
+    finally:
+        sock.close()
+
+
+class Coordinator(object):
+    """
+    Distributes the tasks to the connected workers and collects their
+    results.
+    """
+
+    def __init__(self, address, authkey, func, failed_result, shared=None,
+                 max_retries=MAX_RETRIES):
+        """
+        func -- The module level function which is called by the workers
+                with a task and the shared data.
+        failed_result -- A function which returns the result of a task which
+                         failed on every try.
+        shared -- The data which is needed by every task. It is sent to each
+                  worker only once.
+        """
+        self.__listener = Listener(tuple(address), authkey=authkey)
+        self.__func = func
+        self.__failed_result = failed_result
+        self.__shared = shared
+        self.__max_retries = max_retries
+
+        self.__cond = threading.Condition()
+        # The tasks which are not given to any worker: (id, task, tries).
+        self.__pending = collections.deque()
+        self.__results = {}
+        self.__task_count = 0
+        self.__all_queued = False
+        self.__stopped = False
+
+        # The threads which serve the workers.
+        self.__workers = []
+
+    @property
+    def address(self):
+        """ The address where the coordinator listens for the workers. """
+        return self.__listener.address
+
+    def run(self, tasks):
+        """
+        Distribute the tasks to the workers and return their results in the
+        order of the tasks. The tasks can be produced while the workers
+        already process the previous ones.
+        """
+        LOG.info("Waiting for the analysis workers at %s:%d...",
+                 *self.address)
+
+        acceptor = threading.Thread(target=self.__accept)
+        acceptor.daemon = True
+        acceptor.start()
+
+        try:
+            for task in tasks:
+                with self.__cond:
+                    self.__pending.append((self.__task_count, task, 0))
+                    self.__task_count += 1
+                    self.__cond.notify_all()
+
+            with self.__cond:
+                self.__all_queued = True
+                self.__cond.notify_all()
+
+                while not self.__is_finished():
+                    # Waiting with a timeout keeps the main thread
+                    # interruptible.
+                    self.__cond.wait(1)
+
+            return [self.__results[task_id]
+                    for task_id in range(self.__task_count)]
+        finally:
+            self.__stop(acceptor)
+
+    def __is_finished(self):
+        return self.__all_queued and \
+            len(self.__results) == self.__task_count
+
+    def __stop(self, acceptor):
+        """ Stop accepting the workers and close the listener. """
+        with self.__cond:
+            self.__stopped = True
+            self.__cond.notify_all()
+
+        # Wake up the acceptor thread with a connection of our own.
+        host, port = self.address
+        try:
+            socket.create_connection(
+                ('127.0.0.1' if host == '0.0.0.0' else host, port)).close()
+        except socket.error:
+            pass
+
+        acceptor.join(5)
+        self.__listener.close()
+
+        # The workers are told that the analysis is finished.
+        for worker in self.__workers:
+            worker.join(5)
+
+    def __accept(self):
+        while True:
+            try:
+                conn = self.__listener.accept()
+            except (AuthenticationError, EOFError, IOError) as err:
+                if self.__stopped:
+                    return
+                LOG.warning("Rejected an analysis worker: %s", err)
+                continue
+
+            if self.__stopped:
+                conn.close()
+                return
+
+            worker = threading.Thread(target=self.__serve, args=(conn,))
+            worker.daemon = True
+            worker.start()
+            self.__workers.append(worker)
+
+    def __serve(self, conn):
+        """
+        Serve the requests of a worker. The tasks which were given to the
+        worker are put back if the worker is lost.
+        """
+        name = None
+        assigned = {}
+        try:
+            enable_keepalive(conn)
+            name = conn.recv()
+            LOG.info("Analysis worker '%s' connected.", name)
+
+            conn.send(('setup', self.__func, self.__shared))
+
+            while True:
+                message = conn.recv()
+
+                if message[0] == 'get':
+                    _, count, block = message
+                    tasks = self.__take(count, block)
+                    if tasks is None:
+                        conn.send(('done',))
+                        break
+
+                    for task_id, task, tries in tasks:
+                        assigned[task_id] = task, tries
+                    conn.send(('tasks', [(task_id, task)
+                                         for task_id, task, _ in tasks]))
+
+                elif message[0] == 'result':
+                    _, task_id, result = message
+                    assigned.pop(task_id, None)
+                    with self.__cond:
+                        self.__results[task_id] = result
+                        self.__cond.notify_all()
+
+                elif message[0] == 'error':
+                    _, task_id, error = message
+                    LOG.warning("A task failed on analysis worker '%s':\n%s",
+                                name, error)
+                    task, tries = assigned.pop(task_id)
+                    self.__retry(task_id, task, tries)
+
+            LOG.info("Analysis worker '%s' finished.", name)
+        except (EOFError, IOError) as err:
+            LOG.warning("Lost the connection to analysis worker '%s': %s",
+                        name, err)
+        finally:
+            conn.close()
+            for task_id, (task, tries) in assigned.items():
+                self.__retry(task_id, task, tries)
+
+    def __take(self, count, block):
+        """
+        Returns at most count pending tasks. If block is True, waits until
+        there is a pending task. Returns None if every task is finished.
+        """
+        with self.__cond:
+            while not self.__pending:
+                if self.__is_finished() or self.__stopped:
+                    return None
+                if not block:
+                    return []
+                self.__cond.wait(1)
+
+            return [self.__pending.popleft()
+                    for _ in range(min(count, len(self.__pending)))]
+
+    def __retry(self, task_id, task, tries):
+        """
+        Give the task to a worker again or set its result to a failure if it
+        was tried too many times.
+        """
+        with self.__cond:
+            if tries < self.__max_retries:
+                LOG.info("Retrying task %d on another worker.", task_id)
+                # The task is taken before the ones which were not tried.
+                self.__pending.appendleft((task_id, task, tries + 1))
+            else:
+                LOG.error("Task %d failed %d times, giving up.", task_id,
+                          tries + 1)
+                self.__results[task_id] = self.__failed_result(task)
+
+            self.__cond.notify_all()
+
+
+def connect(address, authkey, wait):
+    """
+    Connect to the coordinator at the given address. The connection is
+    retried for wait seconds, so the workers can be started before the
+    coordinator.
+    """
+    deadline = time.time() + wait
+    while True:
+        try:
+            return Client(address, authkey=authkey)
+        except socket.error as err:
+            if time.time() >= deadline:
+                raise
+            LOG.debug("Failed to connect to %s:%d: %s", address[0],
+                      address[1], err)
+            time.sleep(1)
+
+
+def run_task(func, task):
+    """ Run the task with the shared data in a process of the worker. """
+    return func(task, _shared)
+
+
+def run_worker(address, authkey, jobs, wait=60, initializer=None,
+               initargs=(), item_count=None):
+    """
+    Process the tasks of the coordinator at the given address in a pool of
+    jobs processes until every task of the coordinator is finished.
+
+    item_count -- A multiprocessing.Value which is increased by the number
+                  of items of the received tasks.
+    """
+    conn = connect(address, authkey, wait)
+    enable_keepalive(conn)
+    conn.send('{0}:{1}'.format(socket.gethostname(), os.getpid()))
+
+    global _shared
+    _, func, _shared = conn.recv()
+
+    # The processes of the pool inherit the shared data.
+    pool = multiprocessing.Pool(jobs, initializer=initializer,
+                                initargs=initargs)
+    try:
+        # The results of the tasks in progress by their ids.
+        in_progress = {}
+        finished = False
+        while True:
+            if not finished and len(in_progress) < jobs:
+                # An idle worker waits for the next task.
+                conn.send(('get', jobs - len(in_progress), not in_progress))
+                reply = conn.recv()
+                if reply[0] == 'done':
+                    finished = True
+                else:
+                    for task_id, task in reply[1]:
+                        if item_count is not None:
+                            with item_count.get_lock():
+                                item_count.value += len(task)
+                        in_progress[task_id] = pool.apply_async(
+                            run_task, (func, task))
+
+            if not in_progress:
+                if finished:
+                    break
+                continue
+
+            ready = [task_id for task_id, result in in_progress.items()
+                     if result.ready()]
+            if not ready:
+                time.sleep(POLL_INTERVAL)
+                continue
+
+            for task_id in ready:
+                result = in_progress.pop(task_id)
+                try:
+                    message = ('result', task_id, result.get())
+                except Exception:
+                    message = ('error', task_id, traceback.format_exc())
+                conn.send(message)
+
+        pool.close()
+    except Exception:
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
+        conn.close()
@@ -0,0 +1,269 @@
+# -------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -------------------------------------------------------------------------
+"""
+Deferred collection of the source files of the failed analyses.
+
+The analysis workers only write the outputs and the commands of a failed
+analysis to its failure archive and leave a collection job behind. The
+source files which are needed to reproduce the failures are collected by a
+few processes after the analysis, so the dependency generation by the
+compiler does not block the analysis workers.
+
+Every source file is stored only once in a content-addressed store in the
+failed directory, even if a broken header makes thousands of translation
+units fail. The failure archives refer to the stored files by a manifest
+which maps the paths of the files to their hashes.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+from collections import OrderedDict
+import glob
+import hashlib
+import json
+import multiprocessing
+import os
+import shutil
+import zipfile
+
+from codechecker_common.logger import get_logger
+
+LOG = get_logger('analyzer')
+
+# Directory of the collection jobs in the failed directory.
+PENDING_DIR = '.pending'
+
+# Directory of the content-addressed source store in the failed directory.
+SOURCE_STORE_DIR = 'sources'
+
+# The file in the failure archives which maps the paths of the source files
+# to their hashes in the source store.
+SOURCES_MANIFEST = 'sources.json'
+
+# The maximum size of the failed directory in bytes. Source files are not
+# stored above this size.
+FAILED_DIR_SIZE_LIMIT = 1024 * 1024 * 1024
+
+
+def defer_source_collection(zip_file, buildactions, other_files):
+    """
+    Leave a job for collect_sources() to collect the source files of the
+    given build actions and the other files to the given failure archive.
+    """
+    pending_dir = os.path.join(os.path.dirname(zip_file), PENDING_DIR)
+    try:
+        os.makedirs(pending_dir)
+    except OSError:
+        # The directory is created by an other worker.
+        pass
+
+    job_file = os.path.join(pending_dir, os.path.basename(zip_file) + '.json')
+    with open(job_file, 'w') as job:
+        json.dump({'zip_file': zip_file,
+                   'buildactions': buildactions,
+                   'other_files': sorted(other_files)}, job)
+
+
+def gather_dependencies(buildaction):
+    """
+    Returns the files building up the translation unit of the build action
+    and the error message of the dependency generation.
+    """
+    from tu_collector import tu_collector
+
+    files, error = tu_collector.get_dependent_headers(
+        buildaction['command'], buildaction['directory'])
+
+    return sorted(files), error
+
+
+def get_file_hash(path):
+    """
+    Returns the SHA-256 hash of the content of the given file.
+    """
+    sha = hashlib.sha256()
+    with open(path, 'rb') as source:
+        for chunk in iter(lambda: source.read(1024 * 1024), b''):
+            sha.update(chunk)
+
+    return sha.hexdigest()
+
+
+def get_store_path(store_dir, file_hash):
+    """
+    Returns the path of the file with the given hash in the source store.
+    """
+    return os.path.join(store_dir, file_hash[:2], file_hash)
+
+
+def get_dir_size(path):
+    """
+    Returns the total size of the files in the given directory in bytes.
+    """
+    size = 0
+    for root, _, files in os.walk(path):
+        for f in files:
+            size += os.path.getsize(os.path.join(root, f))
+
+    return size
+
+
+def __load_jobs(pending_dir):
+    """
+    Load and remove the collection jobs of the failure archives which still
+    exist.
+    """
+    jobs = []
+    for job_file in sorted(glob.glob(os.path.join(pending_dir, '*.json'))):
+        try:
+            with open(job_file, 'r') as job:
+                job = json.load(job)
+
+            if os.path.exists(job['zip_file']):
+                jobs.append(job)
+        except (IOError, ValueError) as ex:
+            LOG.debug("Failed to load failure collection job '%s': %s",
+                      job_file, ex)
+
+    shutil.rmtree(pending_dir, ignore_errors=True)
+
+    return jobs
+
+
+def collect_sources(failed_dir, jobs=1, size_limit=FAILED_DIR_SIZE_LIMIT):
+    """
+    Collect the source files of the failure archives in the failed directory
+    by the given number of processes.
+    """
+    pending_dir = os.path.join(failed_dir, PENDING_DIR)
+    failures = __load_jobs(pending_dir) if os.path.isdir(pending_dir) else []
+
+    if failures:
+        LOG.info("Collecting the source files of %d failed analyses...",
+                 len(failures))
+
+        # The dependencies of a build action are gathered only once, even if
+        # it failed with multiple analyzers.
+        buildactions = OrderedDict()
+        for failure in failures:
+            for buildaction in failure['buildactions']:
+                key = buildaction['command'], buildaction['directory']
+                buildactions[key] = buildaction
+
+        pool = multiprocessing.Pool(max(1, min(jobs, len(buildactions))))
+        try:
+            dependencies = dict(zip(
+                buildactions.keys(),
+                pool.map(gather_dependencies, buildactions.values())))
+        finally:
+            pool.close()
+            pool.join()
+
+        store_dir = os.path.join(failed_dir, SOURCE_STORE_DIR)
+        failed_size = get_dir_size(failed_dir)
+        file_hashes = {}
+
+        for failure in failures:
+            failed_size += __store_sources(failure, dependencies, store_dir,
+                                           file_hashes,
+                                           size_limit - failed_size)
+
+    prune_source_store(failed_dir)
+
+
+def __store_sources(failure, dependencies, store_dir, file_hashes,
+                    size_limit):
+    """
+    Store the source files of a failure in the source store and write the
+    manifest of them to its failure archive. Returns the size of the newly
+    stored files.
+    """
+    files = set(failure['other_files'])
+    errors = ''
+    for buildaction in failure['buildactions']:
+        deps, error = dependencies[buildaction['command'],
+                                   buildaction['directory']]
+        files.update(deps)
+
+        if error:
+            errors += buildaction['file'] + '\n' \
+                + '-' * len(buildaction['file']) + '\n' + error + '\n'
+
+    stored_size = 0
+    manifest = {}
+    skipped = []
+    for path in sorted(files):
+        if not os.path.isfile(path):
+            continue
+
+        file_hash = file_hashes.get(path)
+        if file_hash is None:
+            file_hash = get_file_hash(path)
+            file_hashes[path] = file_hash
+
+        store_path = get_store_path(store_dir, file_hash)
+        if not os.path.exists(store_path):
+            size = os.path.getsize(path)
+            if stored_size + size > size_limit:
+                skipped.append(path)
+                continue
+
+            if not os.path.isdir(os.path.dirname(store_path)):
+                os.makedirs(os.path.dirname(store_path))
+            shutil.copyfile(path, store_path)
+            stored_size += size
+
+        manifest[path] = file_hash
+
+    if skipped:
+        errors += "The size limit of the failed directory was reached, the " \
+                  "following files were not stored:\n" + \
+                  '\n'.join(skipped) + '\n'
+
+    with zipfile.ZipFile(failure['zip_file'], 'a') as archive:
+        if errors:
+            archive.writestr('no-sources', errors)
+
+        archive.writestr(SOURCES_MANIFEST,
+                         json.dumps(manifest, indent=2, sort_keys=True))
+        archive.writestr('compilation_database.json',
+                         json.dumps(failure['buildactions'], indent=2))
+
+    return stored_size
+
+
+def get_manifest(zip_file):
+    """
+    Returns the source manifest of the given failure archive.
+    """
+    try:
+        with zipfile.ZipFile(zip_file, 'r') as archive:
+            return json.loads(archive.read(SOURCES_MANIFEST))
+    except (KeyError, ValueError, IOError, zipfile.BadZipfile):
+        return {}
+
+
+def prune_source_store(failed_dir):
+    """
+    Remove the files from the source store which are not referred by any
+    failure archive of the failed directory.
+    """
+    store_dir = os.path.join(failed_dir, SOURCE_STORE_DIR)
+    if not os.path.isdir(store_dir):
+        return
+
+    referred = set()
+    for zip_file in glob.glob(os.path.join(failed_dir, '*.zip')):
+        referred.update(get_manifest(zip_file).values())
+
+    for root, _, files in os.walk(store_dir, topdown=False):
+        for f in files:
+            if f not in referred:
+                os.remove(os.path.join(root, f))
+
+        if not os.listdir(root):
+            os.rmdir(root)
@@ -17,6 +17,8 @@ import tempfile
 
 from codechecker_common.logger import get_logger
 
+from . import capability_cache
+
 LOG = get_logger('analyzer')
 
 
@@ -24,6 +26,11 @@ def check_clang(compiler_bin, env):
     """
     Simple check if clang is available.
     """
+    return capability_cache.cached(compiler_bin, 'runnable',
+                                   lambda: __check_clang(compiler_bin, env))
+
+
+def __check_clang(compiler_bin, env):
     clang_version_cmd = [compiler_bin, '--version']
     LOG.debug_analyzer(' '.join(clang_version_cmd))
     try:
@@ -46,6 +53,18 @@ def check_clang(compiler_bin, env):
 
 def has_analyzer_config_option(clang_bin, config_option_name, env=None):
     """Check if an analyzer config option is available."""
+    out = capability_cache.cached(
+        clang_bin, 'analyzer-config-help',
+        lambda: __get_analyzer_config_help(clang_bin, env))
+
+    match = re.search(config_option_name, out)
+    if match:
+        LOG.debug("Config option '%s' is available.", config_option_name)
+    return (True if match else False)
+
+
+def __get_analyzer_config_help(clang_bin, env):
+    """Returns the help of the analyzer config options."""
     cmd = [clang_bin, "-cc1", "-analyzer-config-help"]
 
     LOG.debug('run: "%s"', ' '.join(cmd))
@@ -59,10 +78,7 @@ def has_analyzer_config_option(clang_bin, config_option_name, env=None):
         LOG.debug("stdout:\n%s", out)
         LOG.debug("stderr:\n%s", err)
 
-        match = re.search(config_option_name, out)
-        if match:
-            LOG.debug("Config option '%s' is available.", config_option_name)
-        return (True if match else False)
+        return out
 
     except OSError:
         LOG.error('Failed to run: "%s"', ' '.join(cmd))
@@ -73,6 +89,13 @@ def has_analyzer_option(clang_bin, feature, env=None):
     """Test if the analyzer has a specific option.
 
     Testing a feature is done by compiling a dummy file."""
+    return capability_cache.cached(
+        clang_bin, 'option ' + ' '.join(feature),
+        lambda: __has_analyzer_option(clang_bin, feature, env))
+
+
+def __has_analyzer_option(clang_bin, feature, env):
+    """Compile a dummy file with the given analyzer option."""
     with tempfile.NamedTemporaryFile() as inputFile:
         inputFile.write("void foo(){}")
         inputFile.flush()
@@ -104,6 +127,13 @@ def get_resource_dir(clang_bin, context, env=None):
     if context.compiler_resource_dir:
         return context.compiler_resource_dir
     # If not set then ask the binary for the resource dir.
+    return capability_cache.cached(
+        clang_bin, 'resource-dir',
+        lambda: __get_resource_dir(clang_bin, env))
+
+
+def __get_resource_dir(clang_bin, env):
+    """Ask the binary for its resource dir."""
     cmd = [clang_bin, "-print-resource-dir"]
     LOG.debug('run: "%s"', ' '.join(cmd))
     try:
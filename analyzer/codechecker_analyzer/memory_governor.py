@@ -0,0 +1,279 @@
+# -------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -------------------------------------------------------------------------
+"""
+Memory-aware admission control of the parallel analysis.
+
+The analysis workers ask the governor before starting an analyzer process.
+A new analyzer is only started if the memory it is expected to use fits in
+the memory budget along with the memory of the already running analyzers.
+The expected memory usage of a translation unit is its peak memory usage
+measured by the previous analysis in the same output directory.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import atexit
+import json
+import multiprocessing
+import os
+import threading
+
+import psutil
+
+from codechecker_common.logger import get_logger
+
+LOG = get_logger('analyzer')
+
+# The file in the output directory which contains the peak memory usage of
+# the previously analyzed translation units.
+MEMORY_USAGE_FILE = 'memory_usage.json'
+
+# Interval of measuring the memory usage of the running analyzers in
+# seconds.
+SAMPLE_INTERVAL = 0.5
+
+
+def get_memory_usage_key(analyzer_type, source):
+    """
+    Returns the key of the memory usage of a source file analyzed by the
+    given analyzer.
+    """
+    return analyzer_type + ':' + source
+
+
+def load_memory_usage(output_path):
+    """
+    Returns the peak memory usage of the translation units measured by the
+    previous analysis in the given output directory.
+    """
+    usage_file = os.path.join(output_path, MEMORY_USAGE_FILE)
+    if not os.path.exists(usage_file):
+        return {}
+
+    try:
+        with open(usage_file, 'r') as usage:
+            return json.load(usage)
+    except (IOError, ValueError) as ex:
+        LOG.debug("Failed to load memory usage file '%s': %s",
+                  usage_file, ex)
+        return {}
+
+
+def save_memory_usage(output_path, memory_usage):
+    """
+    Extend the memory usage file of the output directory with the given
+    peak memory usages.
+    """
+    if not memory_usage:
+        return
+
+    usage = load_memory_usage(output_path)
+    usage.update(memory_usage)
+
+    with open(os.path.join(output_path, MEMORY_USAGE_FILE), 'w') as out:
+        json.dump(usage, out)
+
+
+def get_process_tree_rss(pid):
+    """
+    Returns the resident set size of the given process and its children in
+    bytes.
+    """
+    try:
+        proc = psutil.Process(pid)
+        procs = [proc] + proc.children(True)
+    except psutil.NoSuchProcess:
+        return 0
+
+    rss = 0
+    for proc in procs:
+        try:
+            rss += proc.memory_info().rss
+        except psutil.NoSuchProcess:
+            pass
+    return rss
+
+
+class MemoryJob(object):
+    """
+    The memory reservation of an admitted analyzer process.
+    """
+
+    def __init__(self, governor, reserved):
+        self.__governor = governor
+        self.reserved = reserved
+        self.peak = 0
+        self.pid = None
+
+    def track(self, proc):
+        """
+        Start measuring the memory usage of the given analyzer process.
+        """
+        self.pid = proc.pid
+        get_memory_sampler().add(self)
+
+    def sample(self):
+        """
+        Measure the memory usage of the analyzer process. If it uses more
+        memory than reserved, the reservation is increased, so the governor
+        does not admit new jobs based on an underestimation.
+        """
+        rss = get_process_tree_rss(self.pid)
+        self.peak = max(self.peak, rss)
+
+        if rss > self.reserved:
+            self.__governor.adjust(rss - self.reserved)
+            self.reserved = rss
+
+    def finish(self):
+        """
+        Stop measuring the memory usage and release the reservation. Returns
+        the peak memory usage of the analyzer in bytes.
+        """
+        if self.pid is not None:
+            get_memory_sampler().remove(self)
+
+        self.__governor.release(self.reserved)
+        return self.peak
+
+
+class MemoryGovernor(object):
+    """
+    Admits new analyzer processes if their expected memory usage fits in the
+    memory budget. The state is shared between the worker processes, so the
+    governor has to be created before the worker pool.
+    """
+
+    def __init__(self, budget, default_estimate, memory_usage=None):
+        """
+        budget and default_estimate are in bytes. default_estimate is used
+        for the translation units without a measured memory usage.
+        """
+        self.budget = budget
+        self.default_estimate = default_estimate
+        self.memory_usage = memory_usage or {}
+
+        self.__cond = multiprocessing.Condition()
+        self.__reserved = multiprocessing.RawValue('d', 0)
+        self.__running = multiprocessing.RawValue('i', 0)
+
+    def estimate(self, key):
+        """
+        Returns the expected memory usage of the given translation unit.
+        """
+        return self.memory_usage.get(key, self.default_estimate)
+
+    def admit(self, *keys):
+        """
+        Wait until the expected memory usage of the translation unit fits in
+        the budget and reserve it. If no analyzer is running the translation
+        unit is admitted even if it does not fit in the budget.
+
+        If multiple keys are given, the translation units are analyzed one
+        after another by the same analyzer process, so the largest expected
+        memory usage is reserved.
+        """
+        key = ', '.join(keys)
+        amount = max(self.estimate(tu_key) for tu_key in keys)
+
+        with self.__cond:
+            while self.__running.value and \
+                    self.__reserved.value + amount > self.budget:
+                LOG.debug_analyzer("Waiting for %d MB memory to analyze %s.",
+                                   amount // (1024 * 1024), key)
+                self.__cond.wait()
+
+            self.__reserved.value += amount
+            self.__running.value += 1
+
+        return MemoryJob(self, amount)
+
+    def adjust(self, amount):
+        """
+        Increase the reserved memory of a running analyzer.
+        """
+        with self.__cond:
+            self.__reserved.value += amount
+
+    def release(self, amount):
+        """
+        Release the reserved memory of a finished analyzer.
+        """
+        with self.__cond:
+            self.__reserved.value -= amount
+            self.__running.value -= 1
+            self.__cond.notify_all()
+
+
+class MemorySampler(object):
+    """
+    Measures the memory usage of the tracked analyzer processes of the
+    current worker process periodically on a single thread.
+    """
+
+    def __init__(self):
+        self.__cond = threading.Condition()
+        self.__jobs = []
+        self.__stopped = False
+
+        self.__thread = threading.Thread(target=self.__run,
+                                         name='MemorySampler')
+        self.__thread.daemon = True
+        self.__thread.start()
+
+    def add(self, job):
+        """ Start measuring the memory usage of the given job. """
+        with self.__cond:
+            self.__jobs.append(job)
+            self.__cond.notify()
+
+    def remove(self, job):
+        """ Stop measuring the memory usage of the given job. """
+        with self.__cond:
+            if job in self.__jobs:
+                self.__jobs.remove(job)
+
+    def stop(self):
+        """ Stop the sampler thread. """
+        with self.__cond:
+            self.__stopped = True
+            self.__cond.notify()
+
+        self.__thread.join()
+
+    def __run(self):
+        with self.__cond:
+            while not self.__stopped:
+                if not self.__jobs:
+                    self.__cond.wait()
+                    continue
+
+                for job in self.__jobs:
+                    job.sample()
+
+                self.__cond.wait(SAMPLE_INTERVAL)
+
+
+# The memory sampler of the current process and the process identifier it
+# was started in. Threads are not inherited by forked worker processes, so
+# every worker process starts its own sampler.
+_sampler = (None, None)
+
+
+def get_memory_sampler():
+    """
+    Returns the memory sampler of the current process.
+    """
+    global _sampler
+
+    pid, sampler = _sampler
+    if pid != os.getpid():
+        sampler = MemorySampler()
+        _sampler = (os.getpid(), sampler)
+        atexit.register(sampler.stop)
+
+    return sampler
@@ -19,10 +19,11 @@ import traceback
 import uuid
 
 from codechecker_analyzer import env
+from codechecker_analyzer import tracer
 from codechecker_common.logger import get_logger
 
 from .analyzers import analyzer_base
-from .analyzers.clangsa import ctu_manager, ctu_triple_arch
+from .analyzers.clangsa import ctu_manager
 from .analyzers.clangsa import statistics_collector
 from .analyzers.clangsa.analyzer import ClangSA
 
@@ -80,9 +81,14 @@ def init_worker(checked_num, action_num):
     global progress_checked_num, progress_actions
     progress_checked_num = checked_num
     progress_actions = action_num
+    tracer.set_process_name('Pre-analysis worker')
 
 
 def pre_analyze(params):
+    """
+    Run the pre-analysis of the build action. Returns the CTU cache key of
+    the collected translation unit or None.
+    """
 
     action, context, analyzer_config_map, skip_handler, \
         ctu_data, statistics_data = params
@@ -105,22 +111,15 @@ def pre_analyze(params):
 
     config = analyzer_config_map.get(ClangSA.ANALYZER_NAME)
 
+    ctu_key = None
     try:
         if ctu_data:
             LOG.debug("running CTU pre analysis")
-            ctu_temp_fnmap_folder = ctu_data.get('ctu_temp_fnmap_folder')
-            ctu_func_map_cmd = ctu_data.get('ctu_func_map_cmd')
-
-            triple_arch = \
-                ctu_triple_arch.get_triple_arch(action, action.source,
-                                                config,
-                                                analyzer_environment)
-            ctu_manager.generate_ast(triple_arch, action, action.source,
-                                     config, analyzer_environment)
-            ctu_manager.map_functions(triple_arch, action, action.source,
-                                      config, analyzer_environment,
-                                      ctu_func_map_cmd,
-                                      ctu_temp_fnmap_folder)
+            with tracer.span('CTU collect', 'pre-analysis',
+                             source=action.source):
+                ctu_key = ctu_manager.collect_tu(action, config,
+                                                 analyzer_environment,
+                                                 ctu_data)
 
     except Exception as ex:
         LOG.debug_analyzer(str(ex))
@@ -130,17 +129,21 @@ def pre_analyze(params):
     try:
         if statistics_data:
             LOG.debug("running statistics pre analysis")
-            collect_statistics(action,
-                               action.source,
-                               config,
-                               analyzer_environment,
-                               statistics_data)
+            with tracer.span('Statistics collect', 'pre-analysis',
+                             source=action.source):
+                collect_statistics(action,
+                                   action.source,
+                                   config,
+                                   analyzer_environment,
+                                   statistics_data)
 
     except Exception as ex:
         LOG.debug_analyzer(str(ex))
         traceback.print_exc(file=sys.stdout)
         raise
 
+    return ctu_key
+
 
 def run_pre_analysis(actions, context, analyzer_config_map,
                      jobs, skip_handler, ctu_data, statistics_data, manager):
@@ -184,6 +187,10 @@ def run_pre_analysis(actions, context, analyzer_config_map,
 
         statistics_data['stat_tmp_dir'] = stat_tmp_dir
 
+    if ctu_data:
+        ctu_manager.prepare_ctu_dir(ctu_data.get('ctu_dir'),
+                                    ctu_data.get('ctu_temp_fnmap_folder'))
+
     try:
         collect_actions = [(build_action,
                             context,
@@ -193,7 +200,9 @@ def run_pre_analysis(actions, context, analyzer_config_map,
                             statistics_data)
                            for build_action in actions]
 
-        pool.map_async(pre_analyze, collect_actions).get(float('inf'))
+        with tracer.span('Pre-analysis', 'pre-analysis'):
+            ctu_keys = pool.map_async(pre_analyze,
+                                      collect_actions).get(float('inf'))
         pool.close()
     except Exception:
         pool.terminate()
@@ -203,22 +212,27 @@ def run_pre_analysis(actions, context, analyzer_config_map,
 
     # Postprocessing the pre analysis results.
     if ctu_data:
-        ctu_manager.merge_ctu_func_maps(
-                ctu_data.get('ctu_dir'),
-                ctu_data.get('ctu_func_map_file'),
-                ctu_data.get('ctu_temp_fnmap_folder'))
+        with tracer.span('Merge CTU function maps', 'pre-analysis'):
+            ctu_manager.merge_ctu_func_maps(
+                    ctu_data.get('ctu_dir'),
+                    ctu_data.get('ctu_func_map_file'),
+                    ctu_data.get('ctu_temp_fnmap_folder'))
+
+        # Remove the ASTs of the translation units which were not collected
+        # now, so they are not used by the analysis.
+        ctu_manager.prune_ctu_cache(ctu_data.get('ctu_dir'),
+                                    set(key for key in ctu_keys if key))
 
     if statistics_data:
 
         stats_in = statistics_data.get('stat_tmp_dir')
         stats_out = statistics_data.get('stats_out_dir')
 
-        statistics_collector.postprocess_stats(stats_in, stats_out,
-                                               statistics_data.get(
-                                                   'stats_min_sample_count'),
-                                               statistics_data.get(
-                                                   'stats_relevance_threshold')
-                                               )
+        with tracer.span('Postprocess statistics', 'pre-analysis'):
+            statistics_collector.postprocess_stats(
+                stats_in, stats_out,
+                statistics_data.get('stats_min_sample_count'),
+                statistics_data.get('stats_relevance_threshold'))
 
         if os.path.exists(stats_in):
             LOG.debug('Cleaning up temporary statistics directory')
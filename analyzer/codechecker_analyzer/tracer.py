@@ -0,0 +1,157 @@
+# -------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -------------------------------------------------------------------------
+"""
+Timeline of an analysis run in the Chrome trace event format.
+
+The trace can be opened in the trace viewer of Chrome (chrome://tracing) or
+in any other viewer which supports the format. Every process of the analysis
+appends its events to its own part file, which are merged into the trace
+file at the end of the analysis. So the worker processes do not have to
+communicate with each other.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+from contextlib import contextmanager
+import functools
+import glob
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from codechecker_common.logger import get_logger
+
+LOG = get_logger('analyzer')
+
+# The trace file and the directory of the part files. Tracing is disabled if
+# these are None. These are inherited by the forked worker processes.
+_trace_file = None
+_parts_dir = None
+
+# The part file of the current process and the process identifier it was
+# opened in.
+_part_file = (None, None)
+
+
+def enable(trace_file):
+    """
+    Start collecting the trace events of the analysis into the given file.
+    """
+    global _trace_file, _parts_dir
+
+    _trace_file = os.path.abspath(trace_file)
+    _parts_dir = tempfile.mkdtemp(prefix='.trace-',
+                                  dir=os.path.dirname(_trace_file))
+
+    set_process_name('CodeChecker')
+
+
+def is_enabled():
+    """ Returns True if the trace events are collected. """
+    return _trace_file is not None
+
+
+def __write_event(event):
+    """
+    Append a trace event to the part file of the current process.
+    """
+    global _part_file
+
+    pid, part_file = _part_file
+    if pid != os.getpid():
+        part_file = open(os.path.join(_parts_dir, str(os.getpid())), 'a')
+        _part_file = (os.getpid(), part_file)
+
+    # The events are flushed immediately, because the worker processes are
+    # terminated without any cleanup.
+    part_file.write(json.dumps(event) + '\n')
+    part_file.flush()
+
+
+def set_process_name(name):
+    """
+    Set the name of the current process in the trace viewer.
+    """
+    if not is_enabled():
+        return
+
+    __write_event({'name': 'process_name', 'ph': 'M', 'pid': os.getpid(),
+                   'args': {'name': name}})
+
+
+@contextmanager
+def span(name, category='analysis', **args):
+    """
+    Context manager which records the execution of its body as a complete
+    event of the trace.
+    """
+    if not is_enabled():
+        yield
+        return
+
+    start = time.time()
+    try:
+        yield
+    finally:
+        __write_event({'name': name,
+                       'cat': category,
+                       'ph': 'X',
+                       'ts': int(start * 1000000),
+                       'dur': int((time.time() - start) * 1000000),
+                       'pid': os.getpid(),
+                       'tid': threading.current_thread().ident,
+                       'args': args})
+
+
+def traced(name, category='analysis'):
+    """
+    Decorator which records the calls of the decorated function as complete
+    events of the trace.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name, category):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def finish():
+    """
+    Merge the trace events of the processes into the trace file.
+    """
+    global _trace_file, _parts_dir, _part_file
+
+    if not is_enabled():
+        return
+
+    pid, part_file = _part_file
+    if pid == os.getpid():
+        part_file.close()
+
+    with open(_trace_file, 'w') as trace:
+        trace.write('{"traceEvents": [\n')
+
+        first = True
+        for part in glob.glob(os.path.join(_parts_dir, '*')):
+            with open(part, 'r') as events:
+                for event in events:
+                    if not first:
+                        trace.write(',\n')
+                    trace.write(event.rstrip('\n'))
+                    first = False
+
+        trace.write('\n]}\n')
+
+    shutil.rmtree(_parts_dir, ignore_errors=True)
+    LOG.info("Analysis trace was written to '%s'.", _trace_file)
+
+    _trace_file, _parts_dir, _part_file = None, None, (None, None)
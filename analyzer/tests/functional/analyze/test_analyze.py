@@ -282,7 +282,8 @@ class TestAnalyze(unittest.TestCase):
         self.assertEquals(errcode, 0)
 
         # We expect a failure archive to be in the failed directory.
-        failed_files = os.listdir(failed_dir)
+        failed_files = [f for f in os.listdir(failed_dir)
+                        if f.endswith('.zip')]
         self.assertEquals(len(failed_files), 1)
 
         fail_zip = os.path.join(failed_dir, failed_files[0])
@@ -297,13 +298,18 @@ class TestAnalyze(unittest.TestCase):
                 self.assertEqual(archived_buildcmd.read(),
                                  "gcc -c " + source_file)
 
-            source_in_archive = os.path.join("sources-root",
-                                             source_file.lstrip('/'))
-            self.assertIn(source_in_archive, files)
+            # The source files are in the source store of the failed
+            # directory.
+            self.assertIn("sources.json", files)
+            with archive.open("sources.json", 'r') as manifest:
+                file_hash = json.load(manifest)[source_file]
 
-            with archive.open(source_in_archive, 'r') as archived_code:
+            stored_source = os.path.join(failed_dir, "sources",
+                                         file_hash[:2], file_hash)
+
+            with open(stored_source, 'r') as stored_code:
                 with open(source_file, 'r') as source_code:
-                    self.assertEqual(archived_code.read(), source_code.read())
+                    self.assertEqual(stored_code.read(), source_code.read())
 
         os.remove(os.path.join(failed_dir, failed_files[0]))
 
@@ -341,7 +347,8 @@ class TestAnalyze(unittest.TestCase):
         self.assertEquals(errcode, 0)
 
         # We expect a failure archive to be in the failed directory.
-        failed_files = os.listdir(failed_dir)
+        failed_files = [f for f in os.listdir(failed_dir)
+                        if f.endswith('.zip')]
         print(failed_files)
         self.assertEquals(len(failed_files), 1)
         self.assertIn("failure.c", failed_files[0])
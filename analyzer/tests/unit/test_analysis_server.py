@@ -0,0 +1,110 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+
+"""
+Test the analysis server and its clients.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import argparse
+import io
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+
+from codechecker_analyzer import analysis_server
+
+
+class AnalysisServerTest(unittest.TestCase):
+    """
+    Test the analysis requests of the analyze command.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.socket_file = os.path.join(self.tmp_dir, 'server.sock')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def __request(self, args):
+        """ Returns the exit code and the output of the analysis. """
+        stdout = sys.stdout
+        sys.stdout = io.BytesIO()
+        try:
+            exit_code = analysis_server.request_analysis(self.socket_file,
+                                                         args)
+            return exit_code, sys.stdout.getvalue().decode('utf-8')
+        finally:
+            sys.stdout = stdout
+
+    def test_no_server(self):
+        """ The analysis is not run if the server is not running. """
+        args = argparse.Namespace(logfile=['compile_commands.json'])
+        self.assertEqual(self.__request(args), (None, ''))
+
+    def test_request(self):
+        """ The output and the exit code of the analysis are returned. """
+        server = analysis_server.AnalysisServer(self.socket_file)
+        process = multiprocessing.Process(target=server.serve_forever)
+        process.start()
+        try:
+            for _ in range(100):
+                if analysis_server.is_server_running(self.socket_file):
+                    break
+                time.sleep(0.1)
+
+            # The analysis stops before the analyzers are detected. The
+            # handler function of the command is not sent to the server.
+            args = argparse.Namespace(logfile=['a.json', 'b.json'],
+                                      output_path='reports',
+                                      config_file=None,
+                                      func=self.__request)
+            exit_code, output = self.__request(args)
+
+            self.assertEqual(exit_code, 1)
+            self.assertIn("Only one log file can be processed", output)
+        finally:
+            process.terminate()
+            process.join()
+
+
+class InotifyWatcherTest(unittest.TestCase):
+    """
+    Test the watching of the modified files.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.watcher = analysis_server.InotifyWatcher()
+
+    def tearDown(self):
+        self.watcher.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_modified_files(self):
+        """ The written and the replaced files are reported. """
+        self.watcher.watch(self.tmp_dir)
+        self.assertEqual(self.watcher.read(), set())
+
+        main_c = os.path.join(self.tmp_dir, 'main.c')
+        with open(main_c, 'w') as f:
+            f.write('int main() { return 0; }\n')
+
+        new_h = os.path.join(self.tmp_dir, 'main.h.new')
+        with open(new_h, 'w') as f:
+            f.write('int x;\n')
+        os.rename(new_h, os.path.join(self.tmp_dir, 'main.h'))
+
+        self.assertEqual(self.watcher.read(),
+                         set([main_c, new_h,
+                              os.path.join(self.tmp_dir, 'main.h')]))
@@ -0,0 +1,124 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+
+"""
+Test the construction of the analyzer commands from the command templates.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import unittest
+
+from codechecker_analyzer.analyzers.clangsa.analyzer import ClangSA
+from codechecker_analyzer.analyzers.clangsa.config_handler import \
+    ClangSAConfigHandler
+from codechecker_analyzer.analyzers.clangsa.version import ClangVersionInfo
+from codechecker_analyzer.analyzers.clangtidy.analyzer import ClangTidy
+from codechecker_analyzer.analyzers.clangtidy.config_handler import \
+    ClangTidyConfigHandler
+from codechecker_analyzer.analyzers.config_handler import CheckerState
+from codechecker_analyzer.buildlog.build_action import BuildAction
+
+
+class ResultHandler(object):
+    analyzer_result_file = '/build/main.cpp.plist'
+
+
+def create_analyzer(analyzer_class, config_handler, source):
+    action = BuildAction(analyzer_options=['-DNDEBUG'],
+                         compiler_includes={'c++': ['/usr/include']},
+                         compiler_standard={'c++': '-std=c++14'},
+                         analyzer_type=analyzer_class.ANALYZER_NAME,
+                         original_command='g++ -DNDEBUG ' + source,
+                         directory='/build',
+                         output='',
+                         lang='c++',
+                         target={'c++': 'x86_64-linux-gnu'},
+                         source=source,
+                         action_type=BuildAction.COMPILE)
+
+    analyzer = analyzer_class(config_handler, action)
+    analyzer.source_file = source
+
+    return analyzer
+
+
+class AnalyzerCmdTemplateTest(unittest.TestCase):
+    """
+    Test that the commands of the translation units share the template of
+    the configuration.
+    """
+
+    def setUp(self):
+        self.clangsa_config = ClangSAConfigHandler(None)
+        self.clangsa_config.analyzer_binary = 'clang'
+        self.clangsa_config.version_info = ClangVersionInfo(9, 0, 0, '/usr')
+        self.clangsa_config.add_checker('core.DivideZero',
+                                        state=CheckerState.enabled)
+        self.clangsa_config.add_checker('unix.Malloc',
+                                        state=CheckerState.disabled)
+
+        self.tidy_config = ClangTidyConfigHandler()
+        self.tidy_config.analyzer_binary = 'clang-tidy'
+        self.tidy_config.add_checker('misc-unused', state=CheckerState.enabled)
+        self.tidy_config.add_checker('Wshadow', state=CheckerState.enabled)
+
+    def test_clangsa_cmd(self):
+        """ The TU specific arguments are added to the template. """
+        analyzer = create_analyzer(ClangSA, self.clangsa_config,
+                                   '/build/main.cpp')
+        stats_cfg = ['-Xclang', '-analyzer-config', '-Xclang', 'a=b']
+        analyzer.add_checker_config(stats_cfg)
+
+        cmd = analyzer.construct_analyzer_cmd(ResultHandler())
+        template = self.clangsa_config.analyzer_cmd_template
+
+        self.assertEqual(cmd[:len(template.head)], list(template.head))
+        self.assertEqual(cmd[-1], '/build/main.cpp')
+        self.assertIn('-analyzer-checker=core.DivideZero', cmd)
+        self.assertIn('-analyzer-disable-checker=unix.Malloc', cmd)
+        self.assertIn('-std=c++14', cmd)
+        self.assertEqual(cmd[cmd.index('-o') + 1], '/build/main.cpp.plist')
+
+        # Checker configuration needs to be set before the checkers.
+        self.assertLess(cmd.index('a=b'),
+                        cmd.index('-analyzer-checker=core.DivideZero'))
+
+        # The other translation units share the template.
+        other = create_analyzer(ClangSA, self.clangsa_config,
+                                '/build/other.cpp')
+        other_cmd = other.construct_analyzer_cmd(ResultHandler())
+        self.assertIs(self.clangsa_config.analyzer_cmd_template, template)
+        self.assertEqual(other_cmd[-1], '/build/other.cpp')
+        self.assertNotIn('a=b', other_cmd)
+
+    def test_changed_config(self):
+        """ The template is rebuilt if the checkers change. """
+        analyzer = create_analyzer(ClangSA, self.clangsa_config,
+                                   '/build/main.cpp')
+        analyzer.construct_analyzer_cmd(ResultHandler())
+
+        self.clangsa_config.set_checker_enabled('unix.Malloc')
+        self.assertIsNone(self.clangsa_config.analyzer_cmd_template)
+
+        cmd = analyzer.construct_analyzer_cmd(ResultHandler())
+        self.assertIn('-analyzer-checker=unix.Malloc', cmd)
+
+    def test_tidy_cmd(self):
+        """ The compiler warnings close the clang-tidy command. """
+        analyzer = create_analyzer(ClangTidy, self.tidy_config,
+                                   '/build/main.cpp')
+        cmd = analyzer.construct_analyzer_cmd(ResultHandler())
+
+        self.assertEqual(cmd[:3], ['clang-tidy',
+                                   '-checks=-clang-analyzer-*,'
+                                   'clang-diagnostic-*,misc-unused',
+                                   '/build/main.cpp'])
+        self.assertEqual(cmd[3:8], ['--', '-Qunused-arguments', '-Wall',
+                                    '-Wextra', '-x'])
+        self.assertIn('--target=x86_64-linux-gnu', cmd)
+        self.assertEqual(cmd[-2:], ['-std=c++14', '-Wshadow'])
@@ -0,0 +1,99 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+
+"""
+Test the capture of the analyzer outputs.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+from codechecker_analyzer.analyzers import analyzer_base
+from codechecker_analyzer.analyzers.result_handler_base import ResultHandler
+from codechecker_analyzer.buildlog.build_action import BuildAction
+
+
+class OutputAnalyzer(analyzer_base.SourceAnalyzer):
+    """ Analyzer which is only used to run commands. """
+
+    def construct_analyzer_cmd(self, result_handler):
+        return []
+
+    def get_analyzer_mentioned_files(self, output):
+        return set()
+
+    def construct_result_handler(self, buildaction, report_output,
+                                 severity_map, skiplist_handler):
+        return ResultHandler(buildaction, report_output)
+
+
+class AnalyzerOutputTest(unittest.TestCase):
+    """
+    Test that the analyzer outputs are written to files and only their ends
+    are kept in memory.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+        action = BuildAction(analyzer_options=[],
+                             compiler_includes={},
+                             compiler_standard={},
+                             analyzer_type='clang-tidy',
+                             original_command='g++ main.cpp',
+                             directory=self.tmp_dir,
+                             output='',
+                             lang='c++',
+                             target={},
+                             source=os.path.join(self.tmp_dir, 'main.cpp'),
+                             action_type=BuildAction.COMPILE)
+
+        self.analyzer = OutputAnalyzer(None, action)
+        self.rh = self.analyzer.construct_result_handler(action, self.tmp_dir,
+                                                         None, None)
+        self.rh.analyzed_source_file = action.source
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def __analyze(self, script):
+        self.analyzer.analyze([sys.executable, '-c', script], self.rh)
+
+    def test_short_output(self):
+        """ Short outputs are kept in memory completely. """
+        self.__analyze("import sys; "
+                       "sys.stdout.write('out\\n'); "
+                       "sys.stderr.write('err\\n')")
+
+        self.assertEqual(self.rh.analyzer_returncode, 0)
+        self.assertEqual(self.rh.analyzer_stdout, 'out\n')
+        self.assertEqual(self.rh.analyzer_stderr, 'err\n')
+
+        with open(self.rh.analyzer_stdout_file, 'r') as stdout:
+            self.assertEqual(stdout.read(), 'out\n')
+
+        self.rh.clean_output_files()
+        self.assertFalse(os.path.exists(self.rh.analyzer_stdout_file))
+        self.assertFalse(os.path.exists(self.rh.analyzer_stderr_file))
+
+    def test_long_output(self):
+        """ Only the end of long outputs is kept in memory. """
+        size = analyzer_base.OUTPUT_TAIL_SIZE
+        self.__analyze("import sys; "
+                       "sys.stdout.write('a' * {0} + 'b' * {0})".format(size))
+
+        self.assertEqual(os.path.getsize(self.rh.analyzer_stdout_file),
+                         2 * size)
+        self.assertTrue(self.rh.analyzer_stdout.startswith(
+            ">>> CodeChecker: the first {0} bytes".format(size)))
+        self.assertTrue(self.rh.analyzer_stdout.endswith('\n' + 'b' * size))
+        self.assertEqual(self.rh.analyzer_stderr, '')
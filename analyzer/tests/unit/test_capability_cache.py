@@ -0,0 +1,122 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+
+"""
+Test the persistent cache of the analyzer capabilities.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import os
+import shutil
+import stat
+import tempfile
+import unittest
+
+from codechecker_analyzer import capability_cache, host_check
+
+
+class CapabilityCacheTest(unittest.TestCase):
+    """
+    Test that the analyzer binaries are probed only once.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache_file = os.path.join(self.tmp_dir, 'cache.json')
+        self.runs_file = os.path.join(self.tmp_dir, 'runs')
+
+        # Fake analyzer which counts its invocations.
+        self.binary = os.path.join(self.tmp_dir, 'clang')
+        self.__write_binary('crosscheck-with-z3')
+
+        capability_cache.enable(self.cache_file)
+
+    def tearDown(self):
+        capability_cache.disable()
+        shutil.rmtree(self.tmp_dir)
+
+    def __write_binary(self, config_options):
+        with open(self.binary, 'w') as binary:
+            binary.write('#!/bin/sh\n'
+                         'echo run >> {0}\n'
+                         'echo "{1}"\n'.format(self.runs_file,
+                                               config_options))
+        os.chmod(self.binary, stat.S_IRWXU)
+
+    def __runs(self):
+        if not os.path.exists(self.runs_file):
+            return 0
+        with open(self.runs_file, 'r') as runs:
+            return len(runs.readlines())
+
+    def __has_z3(self):
+        return host_check.has_analyzer_config_option(self.binary,
+                                                     'crosscheck-with-z3')
+
+    def test_cached_probe(self):
+        """ The cached results are used by the later commands. """
+        self.assertTrue(self.__has_z3())
+        self.assertTrue(self.__has_z3())
+        self.assertEqual(self.__runs(), 1)
+
+        # A new command loads the results from the cache file.
+        capability_cache.enable(self.cache_file)
+        self.assertTrue(self.__has_z3())
+        self.assertFalse(host_check.has_analyzer_config_option(
+            self.binary, 'display-ctu-progress'))
+        self.assertEqual(self.__runs(), 1)
+
+    def test_changed_binary(self):
+        """ The binary is probed again if it changes. """
+        self.assertTrue(self.__has_z3())
+
+        self.__write_binary('display-ctu-progress')
+        self.assertFalse(self.__has_z3())
+        self.assertEqual(self.__runs(), 2)
+
+    def test_disabled(self):
+        """ The binary is probed on every request if the cache is off. """
+        capability_cache.disable()
+
+        self.assertTrue(self.__has_z3())
+        self.assertTrue(self.__has_z3())
+        self.assertEqual(self.__runs(), 2)
+        self.assertFalse(os.path.exists(self.cache_file))
+
+    def test_failed_probe(self):
+        """ The results of the failed probes are not cached. """
+        def detect():
+            raise OSError("Failed to run.")
+
+        with self.assertRaises(OSError):
+            capability_cache.cached(self.binary, 'failing', detect)
+
+        self.assertEqual(
+            capability_cache.cached(self.binary, 'failing', lambda: 'ok'),
+            'ok')
+
+    def test_false_probe(self):
+        """ The binary is probed again if it failed to run. """
+        self.assertFalse(
+            capability_cache.cached(self.binary, 'runnable', lambda: False))
+        self.assertIsNone(
+            capability_cache.cached(self.binary, 'runnable', lambda: None))
+        self.assertTrue(
+            capability_cache.cached(self.binary, 'runnable', lambda: True))
+
+    def test_plugin_identity(self):
+        """ The identity of the plugins changes if a plugin changes. """
+        plugin = os.path.join(self.tmp_dir, 'plugin.so')
+        with open(plugin, 'w') as f:
+            f.write('checkers')
+        identity = capability_cache.get_files_identity([plugin])
+
+        with open(plugin, 'w') as f:
+            f.write('more checkers')
+        self.assertNotEqual(capability_cache.get_files_identity([plugin]),
+                            identity)
@@ -0,0 +1,133 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+
+"""Tests for the reuse of the collected CTU data."""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from codechecker_analyzer.analyzers.clangsa import ctu_manager
+
+
+class FakeAction(object):
+    """ Mimics a build action of the compilation database. """
+
+    def __init__(self, directory, source):
+        self.directory = directory
+        self.source = source
+        self.lang = 'c++'
+        self.target = {'c++': ''}
+        self.compiler_includes = {'c++': []}
+        self.compiler_standard = {'c++': ''}
+        self.analyzer_options = []
+
+
+class FakeConfig(object):
+    """ Mimics the configuration of the Clang Static Analyzer. """
+
+    def __init__(self, analyzer_binary):
+        self.analyzer_binary = analyzer_binary
+        self.analyzer_extra_arguments = []
+
+
+class CTUCacheTest(unittest.TestCase):
+    """ Test the validation of the collected translation units. """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.ctu_dir = os.path.join(self.tmp_dir, 'ctu-dir')
+
+        self.source = os.path.join(self.tmp_dir, 'main.cpp')
+        self.header = os.path.join(self.tmp_dir, 'lib.h')
+        with open(self.source, 'w') as source:
+            source.write('#include "lib.h"\nint main() { return f(); }\n')
+        with open(self.header, 'w') as header:
+            header.write('int f() { return 0; }\n')
+
+        self.action = FakeAction(self.tmp_dir, self.source)
+
+        ast_path = ctu_manager.get_ast_path(self.ctu_dir, 'x86_64',
+                                            self.source)
+        os.makedirs(os.path.dirname(ast_path))
+        with open(ast_path, 'w') as ast:
+            ast.write('AST')
+
+        self.dep_file = os.path.join(self.tmp_dir, 'main.d')
+        with open(self.dep_file, 'w') as dep:
+            dep.write('main.o: main.cpp \\\n lib.h\n')
+
+        ctu_manager.store_cached_tu(self.ctu_dir, 'key', 'x86_64',
+                                    self.action, self.dep_file,
+                                    ['c:@F@f# ' + ast_path])
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_parse_dependency_file(self):
+        """ Dependencies are parsed from the Makefile rule. """
+        self.assertEqual(
+            ctu_manager.parse_dependency_file(
+                'a.o: a.cpp /usr/include/stdio.h \\\n'
+                '  my\\ dir/b.h\n'),
+            ['a.cpp', '/usr/include/stdio.h', 'my dir/b.h'])
+
+    def test_unchanged(self):
+        """ Translation unit with unchanged dependencies is reused. """
+        manifest = ctu_manager.load_cached_tu(self.ctu_dir, 'key')
+
+        self.assertEqual(manifest['triple_arch'], 'x86_64')
+        self.assertEqual(sorted(manifest['dependencies']),
+                         [self.header, self.source])
+        self.assertEqual(len(ctu_manager.load_cached_func_map(self.ctu_dir,
+                                                              'key')), 1)
+
+    def test_changed_header(self):
+        """ Changing an included header invalidates the translation unit. """
+        with open(self.header, 'w') as header:
+            header.write('int f() { return 1; }\n')
+
+        self.assertIsNone(ctu_manager.load_cached_tu(self.ctu_dir, 'key'))
+
+    def test_missing_entry(self):
+        """ Unknown translation unit is not reused. """
+        self.assertIsNone(ctu_manager.load_cached_tu(self.ctu_dir, 'other'))
+
+    def test_prune(self):
+        """ Entries not used by the last collection are removed. """
+        ctu_manager.prune_ctu_cache(self.ctu_dir, set(['other']))
+
+        self.assertIsNone(ctu_manager.load_cached_tu(self.ctu_dir, 'key'))
+        self.assertFalse(os.path.exists(
+            ctu_manager.get_ast_path(self.ctu_dir, 'x86_64', self.source)))
+
+    def test_prune_used(self):
+        """ Entries used by the last collection are kept. """
+        ctu_manager.prune_ctu_cache(self.ctu_dir, set(['key']))
+
+        self.assertIsNotNone(ctu_manager.load_cached_tu(self.ctu_dir, 'key'))
+        self.assertTrue(os.path.exists(
+            ctu_manager.get_ast_path(self.ctu_dir, 'x86_64', self.source)))
+
+    def test_cache_key(self):
+        """ The key depends on the identity of the clang binary. """
+        clang = os.path.join(self.tmp_dir, 'clang')
+        with open(clang, 'w') as binary:
+            binary.write('clang 9')
+
+        config = FakeConfig(clang)
+        key = ctu_manager.get_tu_cache_key(self.action, config)
+        self.assertEqual(key, ctu_manager.get_tu_cache_key(self.action,
+                                                           config))
+
+        with open(clang, 'w') as binary:
+            binary.write('clang 10')
+        self.assertNotEqual(key, ctu_manager.get_tu_cache_key(self.action,
+                                                              config))
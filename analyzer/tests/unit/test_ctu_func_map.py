@@ -0,0 +1,65 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+
+"""Tests for merging the global CTU function map."""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from codechecker_analyzer.analyzers.clangsa import ctu_manager
+
+
+class CTUFunctionMapTest(unittest.TestCase):
+    """ Test the creation of the global function map. """
+
+    def setUp(self):
+        self.ctu_dir = tempfile.mkdtemp()
+        self.fan_in = ctu_manager.FNMAP_MERGE_FAN_IN
+
+        func_maps = [['c:@F@main# ast/main.cpp.ast',
+                      'c:@F@f# ast/main.cpp.ast'],
+                     ['c:@F@g# ast/lib.cpp.ast',
+                      'c:@F@f# ast/lib.cpp.ast'],
+                     ['c:@F@g# ast/lib.cpp.ast',
+                      'c:@F@h# ast/util.cpp.ast'],
+                     []]
+        for func_map in func_maps:
+            ctu_manager.write_temp_func_map(self.ctu_dir, 'x86_64', 'tmp',
+                                            func_map)
+
+    def tearDown(self):
+        ctu_manager.FNMAP_MERGE_FAN_IN = self.fan_in
+        shutil.rmtree(self.ctu_dir)
+
+    def __merge(self):
+        ctu_manager.merge_ctu_func_maps(self.ctu_dir, 'externalDefMap.txt',
+                                        'tmp')
+
+        with open(os.path.join(self.ctu_dir, 'x86_64',
+                               'externalDefMap.txt')) as global_map:
+            return global_map.read().splitlines()
+
+    def test_conflicting_names(self):
+        """ Names defined in multiple ASTs are left out. """
+        self.assertEqual(self.__merge(),
+                         ['c:@F@g# ast/lib.cpp.ast',
+                          'c:@F@h# ast/util.cpp.ast',
+                          'c:@F@main# ast/main.cpp.ast'])
+        self.assertFalse(os.path.exists(
+            os.path.join(self.ctu_dir, 'x86_64', 'tmp')))
+
+    def test_multi_pass_merge(self):
+        """ Intermediate merges give the same result. """
+        ctu_manager.FNMAP_MERGE_FAN_IN = 2
+        self.assertEqual(self.__merge(),
+                         ['c:@F@g# ast/lib.cpp.ast',
+                          'c:@F@h# ast/util.cpp.ast',
+                          'c:@F@main# ast/main.cpp.ast'])
@@ -0,0 +1,160 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+
+"""
+Test the selection of the translation units affected by changed files.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from codechecker_analyzer import dependency_index
+from codechecker_analyzer.buildlog.build_action import BuildAction
+
+
+class DependencyIndexTest(unittest.TestCase):
+    """
+    Test the dependency index of the report directory.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.report_dir = os.path.join(self.tmp_dir, 'reports')
+        os.makedirs(self.report_dir)
+
+        self.__write('common.h', '#define COMMON 1\n')
+        self.__write('a.h', '#include "common.h"\n')
+        self.__write('a.c', '#include "a.h"\nint a = COMMON;\n')
+        self.__write('b.c', 'int b = 1;\n')
+
+        self.actions = [self.__action('a.c'), self.__action('b.c')]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def __write(self, name, content):
+        with open(os.path.join(self.tmp_dir, name), 'w') as f:
+            f.write(content)
+
+    def __action(self, name, flags=''):
+        return BuildAction(analyzer_options=[],
+                           compiler_includes={},
+                           compiler_standard={},
+                           analyzer_type='clangsa',
+                           original_command='cc -c ' + flags + name,
+                           directory=self.tmp_dir,
+                           output='',
+                           lang='c',
+                           target={'c': ''},
+                           source=name,
+                           action_type=BuildAction.COMPILE)
+
+    def __path(self, name):
+        return os.path.join(self.tmp_dir, name)
+
+    def __unit(self, name):
+        return self.__path(name), 'cc -c ' + name, self.tmp_dir
+
+    def __select(self, *changed_files):
+        return [action.source for action in dependency_index.select_actions(
+            self.actions, self.report_dir,
+            [self.__path(name) for name in changed_files])]
+
+    def test_no_index(self):
+        """ Every translation unit is selected without an index. """
+        self.assertEqual(self.__select('common.h'), ['a.c', 'b.c'])
+
+    def test_changed_files(self):
+        """ Only the translation units including the changes are selected. """
+        dependency_index.update(self.report_dir, self.actions)
+
+        index = dependency_index.DependencyIndex.load(self.report_dir)
+        self.assertTrue(index.get_dependencies(self.__unit('a.c')).issuperset(
+            [self.__path('a.c'), self.__path('a.h'), self.__path('common.h')]))
+
+        self.assertEqual(self.__select('common.h'), ['a.c'])
+        self.assertEqual(self.__select('b.c'), ['b.c'])
+        self.assertEqual(self.__select('a.h', 'b.c'), ['a.c', 'b.c'])
+        self.assertEqual(self.__select('other.h'), [])
+
+        # New translation units are always selected.
+        self.__write('c.c', 'int c = 1;\n')
+        self.actions.append(self.__action('c.c'))
+        self.assertEqual(self.__select('common.h'), ['a.c', 'c.c'])
+
+    def test_incremental_update(self):
+        """ The dependencies are generated again only if they changed. """
+        dependency_index.update(self.report_dir, self.actions)
+
+        # The timestamps of the dependencies are set to the past, so the
+        # modification of the file is surely detected.
+        index = dependency_index.DependencyIndex.load(self.report_dir)
+        timestamp = time.time() - 10
+        for source in ('a.c', 'b.c'):
+            unit = self.__unit(source)
+            index.set_dependencies(unit, index.get_dependencies(unit),
+                                   timestamp)
+        index.save(self.report_dir)
+
+        # The previous dependencies are kept if they can't be generated.
+        os.remove(self.__path('common.h'))
+        self.__write('b.h', 'int b2 = 2;\n')
+        self.__write('b.c', '#include "b.h"\nint b = 1;\n')
+        dependency_index.update(self.report_dir, self.actions)
+
+        self.assertEqual(self.__select('common.h'), ['a.c'])
+        self.assertEqual(self.__select('b.h'), ['b.c'])
+
+    def test_multiple_commands(self):
+        """
+        The translation units of a source file built by multiple commands
+        are kept separately.
+        """
+        self.__write('b.h', 'int b2 = 2;\n')
+        self.__write('b.c', '#ifdef B\n#include "b.h"\n#endif\n')
+        self.actions.append(self.__action('b.c', '-DB '))
+        dependency_index.update(self.report_dir, self.actions)
+
+        index = dependency_index.DependencyIndex.load(self.report_dir)
+        self.assertEqual(len(index.get_units()), 3)
+        self.assertEqual(self.__select('b.h'), ['b.c'])
+        self.assertEqual([action.original_command for action in
+                          dependency_index.select_actions(
+                              self.actions, self.report_dir,
+                              [self.__path('b.h')])],
+                         ['cc -c -DB b.c'])
+
+        # The translation units of the previous build commands are removed.
+        self.actions.pop()
+        dependency_index.update(self.report_dir, self.actions)
+
+        index = dependency_index.DependencyIndex.load(self.report_dir)
+        self.assertEqual(len(index.get_units()), 2)
+        self.assertEqual(self.__select('b.h'), [])
+
+    def test_failed_generation(self):
+        """
+        The failed generation is recorded and attempted again only if the
+        source file changes. The translation unit is selected by every
+        change until then.
+        """
+        self.__write('c.c', '#include "missing.h"\n')
+        self.actions.append(self.__action('c.c'))
+        dependency_index.update(self.report_dir, self.actions)
+
+        index = dependency_index.DependencyIndex.load(self.report_dir)
+        unit = self.__unit('c.c')
+        self.assertIn(unit, index)
+        self.assertTrue(index.is_up_to_date(unit, os.path.getmtime))
+        self.assertEqual(self.__select('b.c'), ['b.c', 'c.c'])
+
+        self.assertFalse(index.is_up_to_date(unit, lambda path: time.time()))
@@ -0,0 +1,122 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+
+"""
+Test the distribution of the tasks to the workers of other hosts.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+from multiprocessing.connection import Client
+import multiprocessing
+import threading
+import unittest
+
+from codechecker_analyzer import distributed
+
+AUTHKEY = b'test'
+
+
+def square(task, offset):
+    return [item * item + offset for item in task]
+
+
+def fail(task, _):
+    raise ValueError(task)
+
+
+def failed_result(task):
+    return 'failed'
+
+
+class DistributedTest(unittest.TestCase):
+    """
+    Test the coordinator with several local worker processes standing in
+    for the hosts.
+    """
+
+    def setUp(self):
+        self.workers = []
+
+    def tearDown(self):
+        for worker in self.workers:
+            worker.terminate()
+            worker.join()
+
+    def __start_coordinator(self, func, shared=0):
+        return distributed.Coordinator(('127.0.0.1', 0), AUTHKEY, func,
+                                       failed_result, shared)
+
+    def __start_worker(self, coordinator, jobs=2):
+        worker = multiprocessing.Process(
+            target=distributed.run_worker,
+            args=(coordinator.address, AUTHKEY, jobs, 10))
+        worker.start()
+        self.workers.append(worker)
+
+    def test_distribute(self):
+        """ The results of the tasks keep their order. """
+        coordinator = self.__start_coordinator(square, 100)
+        for _ in range(3):
+            self.__start_worker(coordinator)
+
+        tasks = [[i, i + 1] for i in range(50)]
+        results = coordinator.run(iter(tasks))
+
+        self.assertEqual(results, [[i * i + 100, (i + 1) * (i + 1) + 100]
+                                   for i in range(50)])
+
+        for worker in self.workers:
+            worker.join(10)
+            self.assertEqual(worker.exitcode, 0)
+
+    def test_lost_worker(self):
+        """ The tasks of a lost worker are given to the other workers. """
+        coordinator = self.__start_coordinator(square)
+
+        def lost_worker():
+            # The host is lost after it takes the tasks, then it connects
+            # again as a new worker.
+            conn = distributed.connect(coordinator.address, AUTHKEY, 10)
+            conn.send('lost')
+            conn.recv()
+            conn.send(('get', 5, True))
+            conn.recv()
+            conn.close()
+
+            distributed.run_worker(coordinator.address, AUTHKEY, 1)
+
+        lost = multiprocessing.Process(target=lost_worker)
+        lost.start()
+        self.workers.append(lost)
+
+        results = coordinator.run(iter([[i] for i in range(10)]))
+        self.assertEqual(results, [[i * i] for i in range(10)])
+
+    def test_failed_task(self):
+        """ A failing task is retried and then given up. """
+        coordinator = self.__start_coordinator(fail)
+        self.__start_worker(coordinator)
+
+        self.assertEqual(coordinator.run(iter([[1], [2]])),
+                         ['failed', 'failed'])
+
+    def test_authentication(self):
+        """ The workers with another key are rejected. """
+        coordinator = self.__start_coordinator(square)
+
+        results = []
+        thread = threading.Thread(
+            target=lambda: results.extend(coordinator.run(iter([[3]]))))
+        thread.start()
+
+        with self.assertRaises(distributed.AuthenticationError):
+            Client(coordinator.address, authkey=b'other')
+
+        self.__start_worker(coordinator)
+        thread.join(30)
+        self.assertEqual(results, [[9]])
@@ -0,0 +1,111 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+
+"""
+Test the deferred collection of the source files of the failed analyses.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+
+from codechecker_analyzer import failure_collector
+
+
+class FailureCollectorTest(unittest.TestCase):
+    """
+    Test the source store of the failure archives.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.failed_dir = os.path.join(self.tmp_dir, 'failed')
+        os.makedirs(self.failed_dir)
+
+        self.header = os.path.join(self.tmp_dir, 'broken.h')
+        with open(self.header, 'w') as header:
+            header.write('#error broken\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def __fail(self, name):
+        """ Create a failure archive of the given source file. """
+        source = os.path.join(self.tmp_dir, name)
+        with open(source, 'w') as src:
+            src.write('#include "broken.h"\n// {0}\n'.format(name))
+
+        zip_file = os.path.join(self.failed_dir, name + '.zip')
+        with zipfile.ZipFile(zip_file, 'w') as archive:
+            archive.writestr('return-code', '1')
+
+        # The dependencies are not generated by a missing compiler, the files
+        # are collected from the mentioned files.
+        failure_collector.defer_source_collection(
+            zip_file,
+            [{'file': source,
+              'command': 'no-such-compiler -c ' + source,
+              'directory': self.tmp_dir}],
+            [source, self.header])
+
+        return zip_file
+
+    def __store_files(self):
+        store_dir = os.path.join(self.failed_dir,
+                                 failure_collector.SOURCE_STORE_DIR)
+        return sorted(f for _, _, files in os.walk(store_dir) for f in files)
+
+    def test_shared_sources(self):
+        """ The common header of the failures is stored once. """
+        zip_files = [self.__fail('a.cpp'), self.__fail('b.cpp')]
+
+        failure_collector.collect_sources(self.failed_dir, 2)
+
+        self.assertFalse(os.path.exists(os.path.join(
+            self.failed_dir, failure_collector.PENDING_DIR)))
+
+        manifests = [failure_collector.get_manifest(zip_file)
+                     for zip_file in zip_files]
+        self.assertEqual(manifests[0][self.header], manifests[1][self.header])
+        self.assertEqual(len(self.__store_files()), 3)
+
+        with zipfile.ZipFile(zip_files[0], 'r') as archive:
+            self.assertIn('no-sources', archive.namelist())
+            self.assertEqual(
+                json.loads(archive.read('compilation_database.json'))[0]
+                ['file'], os.path.join(self.tmp_dir, 'a.cpp'))
+
+        # The files which are not referred anymore are removed.
+        os.remove(zip_files[0])
+        failure_collector.prune_source_store(self.failed_dir)
+        self.assertEqual(self.__store_files(),
+                         sorted(set(manifests[1].values())))
+
+        os.remove(zip_files[1])
+        failure_collector.prune_source_store(self.failed_dir)
+        self.assertEqual(os.listdir(self.failed_dir), [])
+
+    def test_size_limit(self):
+        """ Source files are not stored above the size limit. """
+        zip_file = self.__fail('a.cpp')
+        source = os.path.join(self.tmp_dir, 'a.cpp')
+
+        # Only the source file fits next to the failure archive.
+        failure_collector.collect_sources(
+            self.failed_dir, 1,
+            os.path.getsize(zip_file) + os.path.getsize(source))
+
+        self.assertEqual(list(failure_collector.get_manifest(zip_file)),
+                         [source])
+
+        with zipfile.ZipFile(zip_file, 'r') as archive:
+            self.assertIn(self.header, archive.read('no-sources'))
@@ -0,0 +1,119 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+
+"""
+Test the following of a compilation database which is written by the build.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from codechecker_analyzer.buildlog import log_follower
+
+
+class LogFollowerTest(unittest.TestCase):
+    """
+    Test that the entries of the compilation database are read as the build
+    logger appends them.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.logfile = os.path.join(self.tmp_dir, 'compile_commands.json')
+
+        with open(os.path.join(self.tmp_dir, 'main.c'), 'w') as src:
+            src.write('int main() { return 0; }\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def __append(self, command):
+        """
+        Append an entry to the compilation database like the build logger
+        does: the closing bracket of the database is overwritten.
+        """
+        entry = json.dumps({'directory': self.tmp_dir,
+                            'command': command,
+                            'file': 'main.c'}, indent=2)
+
+        with open(self.logfile, 'ab+') as logfile:
+            logfile.seek(0, os.SEEK_END)
+            if logfile.tell() == 0:
+                logfile.write(b'[\n')
+            else:
+                logfile.seek(-1, os.SEEK_END)
+                logfile.truncate()
+                logfile.write(b'\t,\n')
+
+            logfile.write(('\t' + entry + '\n]').encode('utf-8'))
+
+    def test_read_appended_entries(self):
+        """ Only the new complete entries are returned. """
+        follower = log_follower.CompilationDatabaseFollower(self.logfile,
+                                                            lambda: True)
+        self.assertEqual(follower.read(), [])
+
+        self.__append('gcc -c main.c -o a.o')
+        self.__append('gcc -c main.c -o b.o')
+        self.assertEqual([e['command'] for e in follower.read()],
+                         ['gcc -c main.c -o a.o', 'gcc -c main.c -o b.o'])
+        self.assertEqual(follower.read(), [])
+
+        self.__append('gcc -c main.c -o c.o')
+        self.assertEqual([e['command'] for e in follower.read()],
+                         ['gcc -c main.c -o c.o'])
+
+        # The complete database is still valid JSON.
+        with open(self.logfile, 'r') as logfile:
+            self.assertEqual(len(json.load(logfile)), 3)
+
+    def test_partial_entry(self):
+        """ An entry is not returned until it is completely written. """
+        with open(self.logfile, 'w') as logfile:
+            logfile.write('[\n\t{"directory": "/", "command": "gcc -c a.c"')
+
+        follower = log_follower.CompilationDatabaseFollower(self.logfile,
+                                                            lambda: True)
+        self.assertEqual(follower.read(), [])
+
+        with open(self.logfile, 'a') as logfile:
+            logfile.write(', "file": "a.c"}\n]')
+        self.assertEqual(len(follower.read()), 1)
+
+    def test_action_stream(self):
+        """ The same compilation action is returned only once. """
+        writes = [['gcc -c main.c -o a.o', 'gcc -c main.c -DA -o a.o'],
+                  [],
+                  ['gcc -c main.c -o b.o', 'gcc -c main.c -DB -o b.o']]
+
+        def is_writing():
+            if not writes:
+                return False
+
+            for command in writes.pop(0):
+                self.__append(command)
+            return True
+
+        follower = log_follower.CompilationDatabaseFollower(
+            self.logfile, is_writing, poll_interval=0)
+        stream = log_follower.ActionStream(follower, self.tmp_dir)
+
+        chunks = [sorted(action.original_command for action in chunk)
+                  for chunk in stream]
+        self.assertEqual(chunks, [['gcc -c main.c -DA -o a.o',
+                                   'gcc -c main.c -o a.o'],
+                                  ['gcc -c main.c -DB -o b.o']])
+
+        self.assertEqual(stream.total, 4)
+        self.assertEqual(stream.analyze, 3)
+        self.assertEqual(stream.removed_by_uniqueing, 1)
+        self.assertFalse(os.path.exists(self.logfile + '.lock'))
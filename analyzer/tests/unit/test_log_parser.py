@@ -481,3 +481,32 @@ class LogParserTest(unittest.TestCase):
                           if b.source == b_file_path][0]
         self.assertEqual(len(b_build_action.analyzer_options), 1)
         self.assertEqual(b_build_action.analyzer_options[0], '-DVARIABLE=some')
+
+    def test_duplicate_compile_commands(self):
+        """
+        The same compilation action is analyzed only once, even if the
+        output files of the compile commands differ.
+        """
+        cmp_cmd_json = [
+            {"directory": "/tmp/lib1",
+             "command": "g++ -DDEBUG -o debug/a.o -c /tmp/lib1/a.cpp",
+             "file": "a.cpp"},
+            {"directory": "/tmp/lib1",
+             "command": "g++ -DDEBUG -o release/a.o -c /tmp/lib1/a.cpp",
+             "file": "a.cpp"},
+            {"directory": "/tmp/lib1",
+             "command": "g++ -DRELEASE -o release/a.o -c /tmp/lib1/a.cpp",
+             "file": "a.cpp"}]
+
+        build_actions, _ = log_parser.\
+            parse_unique_log(cmp_cmd_json, self.__this_dir)
+
+        self.assertEqual(sorted(action.analyzer_options
+                                for action in build_actions),
+                         [['-DDEBUG'], ['-DRELEASE']])
+
+        # Duplicate actions are not uniqueing errors in strict mode.
+        build_actions, _ = log_parser.\
+            parse_unique_log(cmp_cmd_json[:2], self.__this_dir, 'strict')
+
+        self.assertEqual(len(build_actions), 1)
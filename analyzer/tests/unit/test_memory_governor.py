@@ -0,0 +1,100 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+
+"""
+Test the memory-aware admission control of the analyzers.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import shutil
+import subprocess
+import tempfile
+import threading
+import unittest
+
+from codechecker_analyzer import memory_governor
+
+
+class MemoryGovernorTest(unittest.TestCase):
+    """
+    Test the admission of the analyzers by their expected memory usage.
+    """
+
+    def test_admission(self):
+        """
+        An analyzer is admitted only if its memory fits in the budget.
+        """
+        governor = memory_governor.MemoryGovernor(
+            100, 10, {'clangsa:big.cpp': 60})
+
+        first = governor.admit('clangsa:big.cpp')
+        admitted = threading.Event()
+
+        def __admit_second():
+            governor.admit('clangsa:big.cpp').finish()
+            admitted.set()
+
+        thread = threading.Thread(target=__admit_second)
+        thread.start()
+
+        self.assertFalse(admitted.wait(0.5))
+
+        # Unknown translation units use the default estimate.
+        governor.admit('clangsa:small.cpp').finish()
+
+        first.finish()
+        thread.join()
+        self.assertTrue(admitted.is_set())
+
+    def test_over_budget(self):
+        """
+        Analyzer which does not fit in the budget is admitted alone.
+        """
+        governor = memory_governor.MemoryGovernor(
+            100, 10, {'clangsa:huge.cpp': 200})
+
+        governor.admit('clangsa:huge.cpp').finish()
+
+    def test_batch_admission(self):
+        """
+        A batch of translation units reserves the largest expected memory
+        usage among them.
+        """
+        governor = memory_governor.MemoryGovernor(
+            100, 10, {'clang-tidy:big.cpp': 60})
+
+        job = governor.admit('clang-tidy:small.cpp', 'clang-tidy:big.cpp')
+        self.assertEqual(job.reserved, 60)
+        job.finish()
+
+    def test_peak_memory(self):
+        """
+        The peak memory of the tracked analyzer process is measured.
+        """
+        governor = memory_governor.MemoryGovernor(100, 10)
+        job = governor.admit('clangsa:main.cpp')
+
+        proc = subprocess.Popen(['sleep', '1'])
+        job.track(proc)
+        proc.wait()
+
+        self.assertGreater(job.finish(), 0)
+
+    def test_memory_usage_file(self):
+        """
+        The measured memory usages are kept in the output directory.
+        """
+        output_dir = tempfile.mkdtemp()
+        try:
+            memory_governor.save_memory_usage(output_dir, {'a': 1, 'b': 2})
+            memory_governor.save_memory_usage(output_dir, {'b': 3})
+
+            self.assertEqual(memory_governor.load_memory_usage(output_dir),
+                             {'a': 1, 'b': 3})
+        finally:
+            shutil.rmtree(output_dir)
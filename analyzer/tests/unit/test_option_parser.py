@@ -492,3 +492,59 @@ class OptionParserTest(unittest.TestCase):
             res = log_parser.parse_options(action, info_file_tmp.name)
             self.assertEqual(res.compiler_includes['c++'],
                              ['/FAKE_INCLUDE_DIR'])
+
+    def test_memoized_flag_translation(self):
+        """
+        The flags of the compile commands differing only in the source and
+        output files are translated once.
+        """
+        command = "g++ -DNAME={0} -I inc -MD -MT {0}.o -MF {0}.o.d " \
+                  "-o {0}.o -c {0}.cpp"
+
+        cache = log_parser.FlagTranslationCache
+        hits = cache.hits
+
+        actions = [log_parser.parse_options({
+            'file': name + '.cpp',
+            'command': command.format(name).replace('-DNAME=' + name,
+                                                    '-DNAME'),
+            'directory': '/build'}) for name in ['a', 'b']]
+
+        self.assertEqual(cache.hits, hits + 1)
+        for name, action in zip(['a', 'b'], actions):
+            self.assertEqual(action.analyzer_options,
+                             ['-DNAME', '-I', '/build/inc'])
+            self.assertEqual(action.output, name + '.o')
+            self.assertEqual(action.source, '/build/' + name + '.cpp')
+
+    def test_flag_translation_limit(self):
+        """
+        The least recently used translations are dropped from the cache.
+        """
+        cache = log_parser.FlagTranslationCache
+        max_translations = cache.max_translations
+        cache.max_translations = 2
+        try:
+            for name in ['a', 'b', 'a', 'c']:
+                log_parser.parse_options({
+                    'file': 'main.cpp',
+                    'command': "g++ -DNAME=" + name + " -c main.cpp",
+                    'directory': '/build'})
+
+            self.assertEqual(
+                [key[-1][0] for key in cache.translations],
+                ['-DNAME=a', '-DNAME=c'])
+        finally:
+            cache.max_translations = max_translations
+
+    def test_source_file_parameter(self):
+        """
+        The translation is not memoized if the source file is the parameter
+        of a flag.
+        """
+        res = log_parser.parse_options({
+            'file': 'main.cpp',
+            'command': "g++ -include main.cpp -c main.cpp",
+            'directory': '/build'})
+
+        self.assertEqual(res.analyzer_options, ['-include', 'main.cpp'])
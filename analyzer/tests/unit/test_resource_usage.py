@@ -0,0 +1,41 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+
+"""
+Test the measurement of the resource usage of the analyzer processes.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import sys
+import unittest
+
+from codechecker_analyzer.analyzers.analyzer_base import SourceAnalyzer
+
+
+class ResourceUsageTest(unittest.TestCase):
+    """
+    Test the resource usage of the finished processes.
+    """
+
+    def test_resource_usage(self):
+        """
+        CPU time and memory of the process and its children are measured.
+        """
+        procs = []
+        ret_code, stdout, _ = SourceAnalyzer.run_proc(
+            ['sh', '-c', sys.executable + ' -c "'
+             'x = bytearray(64 * 1024 * 1024); '
+             'print(sum(range(10 ** 6)))"'],
+            proc_callback=procs.append)
+
+        self.assertEqual(ret_code, 0)
+        self.assertEqual(stdout.strip(), str(sum(range(10 ** 6))))
+
+        rusage = procs[0].rusage
+        self.assertGreater(rusage.ru_utime + rusage.ru_stime, 0)
+        self.assertGreater(rusage.ru_maxrss * 1024, 64 * 1024 * 1024)
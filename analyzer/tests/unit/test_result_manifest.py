@@ -0,0 +1,115 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+
+"""
+Test the manifest and the sharded layout of the report directory.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import argparse
+import os
+import shutil
+import tempfile
+import unittest
+
+from codechecker_analyzer.analyzers.result_handler_base import ResultHandler
+
+from codechecker_common import result_manifest
+
+
+class ResultManifestTest(unittest.TestCase):
+    """
+    Test the listing of the result files with the manifest.
+    """
+
+    def setUp(self):
+        self.report_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.report_dir)
+
+    def __write_file(self, name, content):
+        path = os.path.join(self.report_dir, name)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def test_sharded_result_file(self):
+        """ The result files are put in the shard directories. """
+        action = argparse.Namespace(analyzer_type='clangsa',
+                                    original_command='clang -c main.c')
+        rh = ResultHandler(action, self.report_dir)
+        rh.analyzed_source_file = '/src/main.c'
+        rh.sharded = True
+
+        result_file = rh.analyzer_result_file
+        shard_dir = os.path.dirname(result_file)
+
+        self.assertEqual(os.path.dirname(shard_dir), self.report_dir)
+        self.assertEqual(len(os.path.basename(shard_dir)),
+                         result_manifest.SHARD_NAME_LENGTH)
+        self.assertTrue(os.path.isdir(shard_dir))
+        self.assertEqual(
+            shard_dir, result_manifest.get_shard_dir(
+                self.report_dir, os.path.basename(result_file)))
+
+    def test_no_manifest(self):
+        """ The report directory is listed if there is no manifest. """
+        plist = self.__write_file('a.plist', 'a')
+        metadata = self.__write_file('metadata.json', '{}')
+
+        self.assertFalse(result_manifest.is_sharded(self.report_dir))
+        self.assertEqual(
+            sorted(result_manifest.get_result_files(self.report_dir)),
+            [(plist, None), (metadata, None)])
+
+    def test_manifest(self):
+        """ Only the result files are listed with their sizes. """
+        shard_dir = result_manifest.get_shard_dir(self.report_dir, 'a.plist')
+        plist_a = os.path.join(shard_dir, 'a.plist')
+        with open(plist_a, 'w') as f:
+            f.write('aaa')
+        plist_b = self.__write_file('b.plist', 'b')
+        self.__write_file('metadata.json', '{}')
+
+        missing = os.path.join(self.report_dir, 'missing.plist')
+        result_manifest.write(self.report_dir, [plist_a, plist_b, missing],
+                              True)
+
+        self.assertTrue(result_manifest.is_sharded(self.report_dir))
+        result_files = result_manifest.get_result_files(self.report_dir)
+        self.assertEqual([(path, entry['size'])
+                          for path, entry in result_files],
+                         [(plist_a, 3), (plist_b, 1)])
+
+        # Only the changed result files are checked again.
+        with open(plist_a, 'w') as f:
+            f.write('aaaaa')
+        with open(plist_b, 'w') as f:
+            f.write('bbbbb')
+        result_manifest.write(self.report_dir, [plist_a, plist_b], True,
+                              [plist_b])
+
+        result_files = result_manifest.get_result_files(self.report_dir)
+        self.assertEqual([(path, entry['size'])
+                          for path, entry in result_files],
+                         [(plist_a, 3), (plist_b, 5)])
+
+    def test_flat_manifest(self):
+        """
+        The result files which are not in the manifest of the flat layout
+        are listed too.
+        """
+        plist_a = self.__write_file('a.plist', 'aaa')
+        result_manifest.write(self.report_dir, [plist_a], False)
+        plist_b = self.__write_file('b.plist', 'b')
+
+        self.assertFalse(result_manifest.is_sharded(self.report_dir))
+        result_files = dict(result_manifest.get_result_files(self.report_dir))
+        self.assertEqual(result_files[plist_a]['size'], 3)
+        self.assertIsNone(result_files[plist_b])
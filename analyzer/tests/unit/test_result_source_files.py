@@ -0,0 +1,66 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+
+"""
+Test the collection of the analyzed source files of the result files.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from codechecker_analyzer import analysis_manager
+
+
+class ResultSourceFilesTest(unittest.TestCase):
+    """
+    Test that the source files of the results are merged into the metadata.
+    """
+
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.output_dir)
+
+    def __result_file(self, name):
+        return os.path.join(self.output_dir, name)
+
+    def test_result_source_files(self):
+        """ Only the successful analyses have result files. """
+        metadata = {'versions': {},
+                    'result_source_files': {
+                        self.__result_file('old.plist'): '/src/old.c'}}
+
+        results = [
+            (0, False, False, 'clangsa', self.__result_file('a.plist'),
+             '/src/a.c', None),
+            (0, False, True, 'clang-tidy', self.__result_file('b.plist'),
+             r'/src/my\ b.c', None),
+            (1, False, False, 'clangsa', self.__result_file('c.plist'),
+             '/src/c.c', None),
+            (1, False, False, 'clangsa', None, '/src/d.c', None)]
+
+        analysis_manager.worker_result_handler(
+            results, metadata, self.output_dir,
+            {'clangsa': 'clang', 'clang-tidy': 'clang-tidy'})
+
+        self.assertEqual(metadata['result_source_files'], {
+            self.__result_file('old.plist'): '/src/old.c',
+            self.__result_file('a.plist'): '/src/a.c',
+            self.__result_file('b.plist'): '/src/my b.c'})
+
+        self.assertEqual(
+            metadata['analyzer_statistics']['clangsa']['failed_sources'],
+            ['/src/c.c', '/src/d.c'])
+
+        # No sidecar files are read or written in the output directory.
+        self.assertEqual([f for f in os.listdir(self.output_dir)
+                          if f.endswith('.source')], [])
@@ -12,6 +12,7 @@ from __future__ import division
 from __future__ import absolute_import
 
 import os
+import resource
 import signal
 import subprocess
 import unittest
@@ -19,6 +20,7 @@ import unittest
 import psutil
 
 from codechecker_analyzer.analysis_manager import setup_process_timeout
+from codechecker_analyzer.analyzers.analyzer_base import SourceAnalyzer
 
 
 class subprocess_timeoutTest(unittest.TestCase):
@@ -91,3 +93,13 @@ class subprocess_timeoutTest(unittest.TestCase):
         self.assertEquals(proc.returncode, -signal.SIGTERM,
                           "`yes` died in a way that it wasn't the process "
                           "timeout watcher killing it.")
+
+    def testCpuTimeLimit(self):
+        """
+        Test if the CPU time limit stops the process which runs too long.
+        """
+        ret_code, _, _ = SourceAnalyzer.run_proc(
+            ['sh', '-c', 'while true; do :; done'],
+            resource_limits={resource.RLIMIT_CPU: 1})
+
+        self.assertEqual(ret_code, -signal.SIGXCPU)
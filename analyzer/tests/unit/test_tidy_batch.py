@@ -0,0 +1,136 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+
+"""
+Test the batched clang-tidy analysis.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import os
+import plistlib
+import shutil
+import tempfile
+import unittest
+
+from codechecker_analyzer import analysis_manager
+from codechecker_analyzer.analyzers.clangtidy import result_handler
+from codechecker_analyzer.buildlog.build_action import BuildAction
+
+
+def create_action(source, analyzer_type='clang-tidy', options=None):
+    return BuildAction(analyzer_options=options or ['-DA'],
+                       compiler_includes={'c++': ['/usr/include']},
+                       compiler_standard={'c++': '-std=c++11'},
+                       analyzer_type=analyzer_type,
+                       original_command='g++ -DA ' + source,
+                       directory='/build',
+                       output='',
+                       lang='c++',
+                       target={'c++': 'x86_64-linux-gnu'},
+                       source=source,
+                       action_type=BuildAction.COMPILE)
+
+
+class TidyBatchTest(unittest.TestCase):
+    """
+    Test the batching of the clang-tidy actions and the splitting of the
+    results.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_batch_actions(self):
+        """ Only clang-tidy actions with the same options are batched. """
+        actions = [create_action('a.cpp'),
+                   create_action('b.cpp', 'clangsa'),
+                   create_action('c.cpp', options=['-DC']),
+                   create_action('d.cpp'),
+                   create_action('e.cpp'),
+                   create_action('f.cpp', options=['-DC'])]
+        check_data = [(None, action) for action in actions]
+
+        batches = analysis_manager.batch_actions(check_data, 2)
+        self.assertEqual([[data[1].source for data in batch]
+                          for batch in batches],
+                         [['a.cpp', 'd.cpp'], ['b.cpp'],
+                          ['c.cpp', 'f.cpp'], ['e.cpp']])
+
+        batches = analysis_manager.batch_actions(check_data, None)
+        self.assertEqual(len(batches), len(actions))
+
+    def __split_results(self, dependencies):
+        """
+        Split the results of a batch with a report in each source file and
+        in a header. Returns the files of the reports in the plist file of
+        each source file.
+        """
+        sources = [os.path.join(self.tmp_dir, name)
+                   for name in ['a.cpp', 'b.cpp']]
+        header = os.path.join(self.tmp_dir, 'a.h')
+
+        handlers = []
+        for source in sources:
+            rh = result_handler.ClangTidyPlistToFile(create_action(source),
+                                                     self.tmp_dir)
+            rh.analyzed_source_file = source
+            handlers.append(rh)
+
+        tidy_stdout = []
+        for path in [sources[1], header, sources[0]]:
+            tidy_stdout.extend([
+                path + ':1:1: warning: message [misc-checker]\n',
+                'int x;\n',
+                '^\n'])
+
+        result_handler.generate_plists_from_batch_result(
+            tidy_stdout, handlers,
+            lambda rh: dependencies(rh.analyzed_source_file, header))
+
+        plists = [plistlib.readPlist(rh.analyzer_result_file)
+                  for rh in handlers]
+
+        return sources, header, \
+            [sorted(plist['files'][diag['location']['file']]
+                    for diag in plist['diagnostics']) for plist in plists]
+
+    def test_split_results(self):
+        """
+        The reports are written to the plist of the source files which
+        include their file.
+        """
+        sources, header, files = self.__split_results(
+            lambda source, header:
+            [source, header] if source.endswith('a.cpp') else [source])
+
+        self.assertEqual(files, [sorted([sources[0], header]), [sources[1]]])
+
+        sources, header, files = self.__split_results(
+            lambda source, header: [source, header])
+
+        self.assertEqual(files, [sorted([sources[0], header]),
+                                 sorted([sources[1], header])])
+
+    def test_split_unknown_dependencies(self):
+        """
+        The reports of a header go to every source file without known
+        dependencies, or to the first source file if none includes it.
+        """
+        sources, header, files = self.__split_results(
+            lambda source, header: None)
+
+        self.assertEqual(files, [sorted([sources[0], header]),
+                                 sorted([sources[1], header])])
+
+        sources, header, files = self.__split_results(
+            lambda source, header: [source])
+
+        self.assertEqual(files, [sorted([sources[0], header]), [sources[1]]])
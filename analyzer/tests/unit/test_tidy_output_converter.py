@@ -426,3 +426,34 @@ class TidyPListConverterTestCase(unittest.TestCase):
             self.assertEqual(exp, output.getvalue())
 
         output.close()
+
+    def test_write_messages(self):
+        """Test that the streamed plist is the same as the built one."""
+        for messages in [[], self.tidy1_repr, self.tidy2_repr,
+                         self.tidy3_repr]:
+            built = tidy_out_conv.PListConverter()
+            built.add_messages(messages)
+
+            expected = StringIO()
+            built.write(expected)
+
+            output = StringIO()
+            self.plist_conv.write_messages(output, iter(messages))
+
+            self.assertEqual(expected.getvalue(), output.getvalue())
+            self.plist_conv = tidy_out_conv.PListConverter()
+
+    def test_write_parsed_messages(self):
+        """Test the conversion of the lazily parsed messages."""
+        parser = tidy_out_conv.OutputParser()
+        with open('tidy3.out', 'r') as tidy_out:
+            messages = parser.iter_messages(tidy_out)
+            self.assertNotIsInstance(messages, list)
+
+            output = StringIO()
+            self.plist_conv.write_messages(output, messages)
+
+        self.assertEqual(parser.messages, [])
+        self.assertEqual(self.plist_conv.plist['diagnostics'], [])
+        self.assertEqual(len(self.plist_conv.plist['files']), 2)
+        self.assertIn('<key>diagnostics</key>', output.getvalue())
@@ -0,0 +1,78 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+
+"""
+Test the trace event export of the analysis.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+import unittest
+
+from codechecker_analyzer import tracer
+
+
+def _analyze(source):
+    with tracer.span('Analyze', source=source):
+        pass
+
+
+class TracerTest(unittest.TestCase):
+    """
+    Test the collection of the trace events of the processes.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.trace_file = os.path.join(self.tmp_dir, 'trace.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_disabled(self):
+        """ No events are written if the tracing is not enabled. """
+        with tracer.span('Analyze'):
+            pass
+        tracer.finish()
+
+        self.assertFalse(tracer.is_enabled())
+        self.assertEqual(os.listdir(self.tmp_dir), [])
+
+    def test_worker_events(self):
+        """ The events of the worker processes are merged. """
+        tracer.enable(self.trace_file)
+
+        with tracer.span('Analysis'):
+            pool = multiprocessing.Pool(2)
+            try:
+                pool.map(_analyze, ['a.cpp', 'b.cpp'])
+            finally:
+                pool.close()
+                pool.join()
+
+        tracer.finish()
+
+        self.assertFalse(tracer.is_enabled())
+        self.assertEqual(os.listdir(self.tmp_dir), ['trace.json'])
+
+        with open(self.trace_file, 'r') as trace:
+            events = json.load(trace)['traceEvents']
+
+        spans = [e for e in events if e['ph'] == 'X']
+        self.assertEqual(sorted(e['args'].get('source') for e in spans),
+                         [None, 'a.cpp', 'b.cpp'])
+
+        analysis = [e for e in spans if e['name'] == 'Analysis'][0]
+        self.assertEqual(analysis['pid'], os.getpid())
+        for event in spans:
+            self.assertGreaterEqual(event['ts'], analysis['ts'])
+            self.assertGreaterEqual(event['dur'], 0)
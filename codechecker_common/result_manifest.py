@@ -0,0 +1,134 @@
+# -------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -------------------------------------------------------------------------
+"""
+Manifest of the result files in a report directory.
+
+The manifest lists every result file of the report directory with its size
+and modification time, so the consumers of the results don't have to list
+the directory, which is slow if it contains hundreds of thousands of files.
+
+In the sharded layout the result files are put in subdirectories named
+after the prefix of the hash of their file names, so no directory holds too
+many entries.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import errno
+import hashlib
+import json
+import os
+
+from codechecker_common.logger import get_logger
+from codechecker_common.util import load_json_or_empty
+
+LOG = get_logger('system')
+
+MANIFEST_FILE = 'manifest.json'
+
+# The length of the hash prefix which names the shard directories, so there
+# are at most 256 of them.
+SHARD_NAME_LENGTH = 2
+
+
+def get_shard_dir(output_dir, file_name):
+    """
+    Returns the directory of the result file with the given name in the
+    sharded layout. The directory is created if it does not exist.
+    """
+    shard = hashlib.md5(file_name.encode('utf-8', 'ignore')).hexdigest()
+    shard_dir = os.path.join(output_dir, shard[:SHARD_NAME_LENGTH])
+
+    try:
+        os.makedirs(shard_dir)
+    except OSError as oerr:
+        # The directory is created by another analysis process.
+        if oerr.errno != errno.EEXIST:
+            raise
+
+    return shard_dir
+
+
+def load(report_dir):
+    """
+    Returns the manifest of the report directory or None if the directory
+    has no manifest.
+    """
+    manifest_file = os.path.join(report_dir, MANIFEST_FILE)
+    if not os.path.exists(manifest_file):
+        return None
+
+    return load_json_or_empty(manifest_file, kind='manifest')
+
+
+def is_sharded(report_dir):
+    """ Returns True if the report directory has the sharded layout. """
+    manifest = load(report_dir)
+    return bool(manifest and manifest.get('sharded'))
+
+
+def write(report_dir, result_files, sharded, changed_files=()):
+    """
+    Write the manifest of the given result files to the report directory.
+
+    The entries of the previous manifest are kept for the result files
+    which were not changed, so only the changed files are checked. The
+    result files which don't exist are left out.
+    """
+    prev_manifest = load(report_dir) or {}
+    prev_entries = prev_manifest.get('files', {})
+    changed_files = set(changed_files)
+
+    entries = {}
+    for result_file in result_files:
+        path = os.path.relpath(result_file, report_dir)
+
+        entry = prev_entries.get(path)
+        if entry is None or result_file in changed_files:
+            try:
+                stat = os.stat(result_file)
+            except OSError as oerr:
+                LOG.debug("Result file is missing: %s", oerr)
+                continue
+
+            entry = {'size': stat.st_size,
+                     'mtime': stat.st_mtime}
+
+        entries[path] = entry
+
+    # The manifest is replaced at once, so the consumers never see a
+    # partially written manifest.
+    manifest_file = os.path.join(report_dir, MANIFEST_FILE)
+    tmp_manifest_file = manifest_file + '.tmp'
+    with open(tmp_manifest_file, 'w') as manifest:
+        json.dump({'version': 1,
+                   'sharded': sharded,
+                   'files': entries}, manifest)
+    os.rename(tmp_manifest_file, manifest_file)
+
+
+def get_result_files(report_dir):
+    """
+    Returns the (path, entry) pairs of the result files in the report
+    directory. The entries of the manifest contain the size and the
+    modification time of the files.
+
+    The manifest is the list of the result files only in the sharded
+    layout. In the flat layout the report directory may contain result files
+    which were not written by the analysis (e.g. converted from the output
+    of other analyzers), so its files are listed and the entries of the
+    files which are not in the manifest are None.
+    """
+    manifest = load(report_dir)
+    if manifest and manifest.get('sharded'):
+        return [(os.path.join(report_dir, path), entry)
+                for path, entry in sorted(manifest.get('files', {}).items())]
+
+    entries = manifest.get('files', {}) if manifest else {}
+    _, _, file_names = next(os.walk(report_dir), ([], [], []))
+    return [(os.path.join(report_dir, file_name), entries.get(file_name))
+            for file_name in sorted(file_names)]
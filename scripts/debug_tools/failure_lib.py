@@ -13,8 +13,13 @@ from __future__ import absolute_import
 import json
 import os
 import re
+import shutil
 import subprocess
 
+# The file in the failure zips which maps the paths of the source files to
+# their hashes in the source store of the failed directory.
+SOURCES_MANIFEST = 'sources.json'
+
 
 def find_path_end(string, path_begin):
     """
@@ -74,6 +79,38 @@ def load_json_file(filename):
     return data
 
 
+def restore_sources(manifest, store, sources_root):
+    """
+    Copy the source files listed in the manifest of the failure zip from the
+    source store to the sources-root directory.
+    """
+    for path, file_hash in load_json_file(manifest).items():
+        target = os.path.join(sources_root, path.lstrip(os.path.sep))
+        if not os.path.isdir(os.path.dirname(target)):
+            os.makedirs(os.path.dirname(target))
+
+        shutil.copyfile(os.path.join(store, file_hash[:2], file_hash),
+                        target)
+
+
+def ensure_sources_root(sources_root, store):
+    """
+    Restore the sources-root directory of an unzipped failure zip from the
+    source store if the failure zip lists its source files in a manifest
+    instead of containing them.
+    """
+    if os.path.isdir(sources_root) or not os.path.isfile(SOURCES_MANIFEST):
+        return
+
+    if not os.path.isdir(store):
+        raise IOError("The source store '%s' of the failure zip does not "
+                      "exist, use --sources_store to set its path." % store)
+
+    print("Restoring the source files from '%s' to '%s'..." %
+          (store, sources_root))
+    restore_sources(SOURCES_MANIFEST, store, sources_root)
+
+
 def get_resource_dir(clang_bin):
     """
     Returns the resource_dir of Clang or None if the switch is not supported by
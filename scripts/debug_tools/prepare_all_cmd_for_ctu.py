@@ -13,6 +13,7 @@ import os
 import platform
 import subprocess
 
+import failure_lib as lib
 import prepare_compile_cmd
 import prepare_compiler_info
 import prepare_analyzer_cmd
@@ -58,6 +59,12 @@ if __name__ == '__main__':
         '--sources_root',
         default='./sources-root',
         help="Path of the source root.")
+    parser.add_argument(
+        '--sources_store',
+        default='./sources',
+        help="Path of the source store of the failed directory. The "
+             "sources-root is restored from it if the failure zip does not "
+             "contain the source files.")
     parser.add_argument(
         '--report_dir',
         default='..',
@@ -74,6 +81,8 @@ if __name__ == '__main__':
         help="Path to the used clang plugin.")
     args = parser.parse_args()
 
+    lib.ensure_sources_root(args.sources_root, args.sources_store)
+
     compile_cmd_debug = "compile_cmd_DEBUG.json"
     with open(compile_cmd_debug, 'w') as f:
         f.write(
@@ -99,6 +99,12 @@ if __name__ == '__main__':
         '--sources_root',
         default='./sources-root',
         help="Path of the source root.")
+    parser.add_argument(
+        '--sources_store',
+        default='./sources',
+        help="Path of the source store of the failed directory. The "
+             "sources-root is restored from it if the failure zip does not "
+             "contain the source files.")
     parser.add_argument(
         '--ctu_dir',
         default=None,
@@ -115,6 +121,8 @@ if __name__ == '__main__':
         help="Path to the used clang plugin.")
     args = parser.parse_args()
 
+    lib.ensure_sources_root(args.sources_root, args.sources_store)
+
     print(
         prepare(
             args.analyzer_command_file,
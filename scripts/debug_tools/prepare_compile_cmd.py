@@ -76,8 +76,11 @@ if __name__ == '__main__':
                                      'to execute in local environmennt.')
     parser.add_argument('compile_command_json')
     parser.add_argument('--sources_root', default='./sources-root')
+    parser.add_argument('--sources_store', default='./sources')
     args = parser.parse_args()
 
+    lib.ensure_sources_root(args.sources_root, args.sources_store)
+
     print(
         json.dumps(
             prepare(
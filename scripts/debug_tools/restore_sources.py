@@ -0,0 +1,28 @@
+#!/usr/bin/env python
+# -------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -------------------------------------------------------------------------
+"""
+Restore the sources-root directory of an unzipped failure zip from the source
+store of the failed directory.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+import argparse
+
+import failure_lib as lib
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Restore the source files '
+                                     'of a failure zip from the source '
+                                     'store.')
+    parser.add_argument('--manifest', default=lib.SOURCES_MANIFEST)
+    parser.add_argument('--store', default='./sources')
+    parser.add_argument('--sources_root', default='./sources-root')
+    args = parser.parse_args()
+
+    lib.restore_sources(args.manifest, args.store, args.sources_root)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+"""
+Micro-benchmark of the construction of the analyzer commands.
+
+The commands of the translation units are constructed from the command
+templates of the analyzers, which are built once per analysis. This script
+measures the per translation unit cost of the command construction with the
+shared template and with a template rebuilt for every translation unit, as
+the commands were constructed before.
+
+The analyzer binaries are not executed, so the script can be run without
+Clang by adding the analyzer package to the Python path:
+
+    PYTHONPATH=analyzer:. python scripts/test/analyzer_cmd_benchmark.py
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import argparse
+import timeit
+
+from codechecker_analyzer.analyzers.clangsa.analyzer import ClangSA
+from codechecker_analyzer.analyzers.clangsa.config_handler import \
+    ClangSAConfigHandler
+from codechecker_analyzer.analyzers.clangsa.version import ClangVersionInfo
+from codechecker_analyzer.analyzers.clangtidy.analyzer import ClangTidy
+from codechecker_analyzer.analyzers.clangtidy.config_handler import \
+    ClangTidyConfigHandler
+from codechecker_analyzer.analyzers.config_handler import CheckerState
+from codechecker_analyzer.buildlog.build_action import BuildAction
+
+
+class ResultHandler(object):
+    """ Result handler which only provides the output file. """
+    analyzer_result_file = '/tmp/main.cpp.plist'
+
+
+def create_config(config_handler, analyzer_binary, checker_count):
+    """
+    Create the configuration of an analyzer with the given number of enabled
+    and disabled checkers.
+    """
+    config_handler.analyzer_binary = analyzer_binary
+    for i in range(checker_count):
+        state = CheckerState.enabled if i % 2 else CheckerState.disabled
+        config_handler.add_checker('group{0}.Checker{1}'.format(i % 10, i),
+                                   state=state)
+
+    return config_handler
+
+
+def create_analyzer(analyzer_class, config_handler):
+    action = BuildAction(analyzer_options=['-DNDEBUG', '-I/usr/include/foo',
+                                           '-O2', '-fPIC'],
+                         compiler_includes={'c++': ['/usr/include/c++/7',
+                                                    '/usr/include']},
+                         compiler_standard={'c++': '-std=c++14'},
+                         analyzer_type=analyzer_class.ANALYZER_NAME,
+                         original_command='g++ -c main.cpp',
+                         directory='/tmp',
+                         output='',
+                         lang='c++',
+                         target={'c++': 'x86_64-linux-gnu'},
+                         source='/tmp/main.cpp',
+                         action_type=BuildAction.COMPILE)
+
+    analyzer = analyzer_class(config_handler, action)
+    analyzer.source_file = action.source
+
+    return analyzer
+
+
+def measure(analyzer, number, rebuild_template):
+    """
+    Returns the average cost of the command construction in microseconds.
+    """
+    config = analyzer.config_handler
+    result_handler = ResultHandler()
+
+    def construct():
+        if rebuild_template:
+            config.analyzer_cmd_template = None
+        analyzer.construct_analyzer_cmd(result_handler)
+
+    return timeit.timeit(construct, number=number) / number * 1000000
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure the cost of the analyzer command construction "
+                    "per translation unit.")
+    parser.add_argument('-n', '--number', type=int, default=10000,
+                        help="Number of the constructed commands.")
+    parser.add_argument('-c', '--checkers', type=int, default=500,
+                        help="Number of the configured checkers.")
+    args = parser.parse_args()
+
+    clangsa_config = create_config(ClangSAConfigHandler(None),
+                                   '/usr/bin/clang', args.checkers)
+    clangsa_config.version_info = ClangVersionInfo(9, 0, 0, '/usr/bin')
+
+    analyzers = [
+        create_analyzer(ClangSA, clangsa_config),
+        create_analyzer(ClangTidy, create_config(ClangTidyConfigHandler(),
+                                                 '/usr/bin/clang-tidy',
+                                                 args.checkers))]
+
+    print("{0:<12}{1:>20}{2:>20}".format('Analyzer', 'Rebuilt (us/TU)',
+                                         'Template (us/TU)'))
+    for analyzer in analyzers:
+        print("{0:<12}{1:>20.2f}{2:>20.2f}".format(
+            analyzer.ANALYZER_NAME,
+            measure(analyzer, args.number, True),
+            measure(analyzer, args.number, False)))
+
+
+if __name__ == '__main__':
+    main()
@@ -409,6 +409,25 @@ def plist_to_html(file_path, output_path, html_builder,
         return file_path, changed_source
 
 
+def get_report_files(input_dir):
+    """
+    Returns the report files in the given directory. The sharded report
+    directories of CodeChecker list their report files in a manifest file,
+    so the directory is listed only if it is not sharded.
+    """
+    manifest_file = os.path.join(input_dir, 'manifest.json')
+    if os.path.exists(manifest_file):
+        with io.open(manifest_file, 'r') as manifest:
+            content = json.load(manifest)
+
+        if content.get('sharded'):
+            return [os.path.join(input_dir, path) for path
+                    in sorted(content.get('files', {}))]
+
+    _, _, file_names = next(os.walk(input_dir), ([], [], []))
+    return [os.path.join(input_dir, file_name) for file_name in file_names]
+
+
 def parse(input_path, output_path, layout_dir, skip_report_handler=None,
           html_builder=None, trim_path_prefixes_handler=None):
     files = []
@@ -426,9 +445,7 @@ def parse(input_path, output_path, layout_dir, skip_report_handler=None,
     if os.path.isfile(input_path):
         files.append(input_path)
     elif os.path.isdir(input_path):
-        _, _, file_names = next(os.walk(input_path), ([], [], []))
-        files = [os.path.join(input_path, file_name) for file_name
-                 in file_names]
+        files = get_report_files(input_path)
 
     # Skipped plist reports from html generation because it is not a
     # plist file or there are no reports in it.
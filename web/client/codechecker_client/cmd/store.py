@@ -30,6 +30,7 @@ from codechecker_client import client as libclient
 from codechecker_common import logger
 from codechecker_common import util
 from codechecker_common import plist_parser
+from codechecker_common import result_manifest
 from codechecker_common import report as common_report
 from codechecker_common.output_formatters import twodim_to_str
 from codechecker_common.source_code_comment_handler import \
@@ -283,23 +284,38 @@ def assemble_zip(inputs, zip_file, client):
             raise OSError(errno.ENOENT,
                           "Input path does not exist", input_path)
 
+        # The modification times of the result files which are recorded in
+        # the manifest of the report directory.
+        manifest_mtimes = {}
         if os.path.isfile(input_path):
             files = [input_path]
         else:
-            _, _, files = next(os.walk(input_path), ([], [], []))
-
-        for f in files:
-
-            plist_file = os.path.join(input_path, f)
+            files = []
+            for path, entry in result_manifest.get_result_files(input_path):
+                if path.endswith(".plist"):
+                    files.append(path)
+                    if entry:
+                        manifest_mtimes[path] = entry['mtime']
+
+            # The metadata files are not listed by the manifest of the
+            # sharded layout.
+            files.extend(os.path.join(input_path, f)
+                         for f in ['metadata.json', 'skip_file']
+                         if os.path.isfile(os.path.join(input_path, f)))
+
+        for plist_file in files:
+            f = os.path.basename(plist_file)
             if f.endswith(".plist"):
                 missing_files, source_file_mod_times = \
                     collect_file_hashes_from_plist(plist_file)
                 if not missing_files:
                     LOG.debug("Copying file '%s' to ZIP assembly dir...",
                               plist_file)
-                    files_to_compress.append(os.path.join(input_path, f))
+                    files_to_compress.append(plist_file)
 
-                    plist_mtime = util.get_last_mod_time(plist_file)
+                    plist_mtime = manifest_mtimes[plist_file] \
+                        if plist_file in manifest_mtimes \
+                        else util.get_last_mod_time(plist_file)
 
                     # Check if any source file corresponding to a plist
                     # file changed since the plist file was generated.
@@ -310,10 +326,8 @@ def assemble_zip(inputs, zip_file, client):
                     LOG.warning("Skipping '%s' because it refers "
                                 "the following missing source files: %s",
                                 plist_file, missing_files)
-            elif f == 'metadata.json':
-                files_to_compress.append(os.path.join(input_path, f))
-            elif f == 'skip_file':
-                files_to_compress.append(os.path.join(input_path, f))
+            elif f in ['metadata.json', 'skip_file']:
+                files_to_compress.append(plist_file)
 
     if changed_files:
         changed_files = '\n'.join([' - ' + f for f in changed_files])
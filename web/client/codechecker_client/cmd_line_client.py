@@ -30,6 +30,7 @@ from codechecker_api_shared.ttypes import RequestFailed
 
 from codechecker_common import logger
 from codechecker_common import plist_parser
+from codechecker_common import result_manifest
 from codechecker_common.output_formatters import twodim_to_str
 from codechecker_common.report import Report, get_report_path_hash
 from codechecker_common.source_code_comment_handler import \
@@ -505,9 +506,9 @@ def handle_diff_results(args):
         all_reports = []
         processed_path_hashes = set()
         for report_dir in report_dirs:
-            for filename in os.listdir(report_dir):
-                if filename.endswith(".plist"):
-                    file_path = os.path.join(report_dir, filename)
+            for file_path, _ in \
+                    result_manifest.get_result_files(report_dir):
+                if file_path.endswith(".plist"):
                     LOG.debug("Parsing: %s", file_path)
                     files, reports = plist_parser.parse_plist_file(file_path)
                     for report in reports:
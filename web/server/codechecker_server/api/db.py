@@ -10,6 +10,14 @@ from __future__ import print_function
 from __future__ import division
 from __future__ import absolute_import
 
+import uuid
+
+from sqlalchemy import Column, insert, MetaData, String, Table
+
+from codechecker_common.logger import get_logger
+
+LOG = get_logger('server')
+
 
 class DBSession(object):
     """
@@ -33,6 +41,47 @@ class DBSession(object):
             self.__session.close()
 
 
+class TemporaryValueTable(object):
+    """
+    Creates a temporary table with one string column on the connection of
+    the given session and bulk loads the given values into it, so they can
+    be used in set operations and joins instead of long literal lists.
+
+    The table is dropped when the context is left.
+    """
+    def __init__(self, session, values, column_name='value'):
+        self.__session = session
+        self.__values = values
+        self.__column_name = column_name
+        self.__table = None
+
+    def __enter__(self):
+        self.__table = Table('tmp_values_' + uuid.uuid4().hex,
+                             MetaData(),
+                             Column(self.__column_name, String),
+                             prefixes=['TEMPORARY'])
+
+        connection = self.__session.connection()
+        self.__table.create(bind=connection)
+
+        if self.__values:
+            connection.execute(insert(self.__table),
+                               [{self.__column_name: value}
+                                for value in self.__values])
+
+        return self.__table
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        try:
+            self.__table.drop(bind=self.__session.connection())
+        except Exception as ex:
+            # The transaction may already be aborted by the original error.
+            # The table is dropped at the end of the database session anyway.
+            if exc_type is None:
+                raise
+            LOG.debug("Failed to drop temporary table: %s", str(ex))
+
+
 def escape_like(string, escape_char='*'):
     """Escape the string parameter used in SQL LIKE expressions."""
     return string.replace(escape_char, escape_char * 2) \
@@ -14,6 +14,8 @@ import base64
 import codecs
 from collections import defaultdict
 from datetime import datetime, timedelta
+from functools import wraps
+import inspect
 import io
 import os
 import re
@@ -23,8 +25,8 @@ import zipfile
 import zlib
 
 import sqlalchemy
-from sqlalchemy.sql.expression import or_, and_, not_, func, \
-    asc, desc, text, union_all, select, bindparam, literal_column, cast
+from sqlalchemy.sql.expression import or_, and_, func, \
+    asc, desc, exists, text, select, literal_column, cast
 
 import codechecker_api_shared
 from codeCheckerDBAccess_v6 import constants, ttypes
@@ -44,18 +46,20 @@ from codechecker_common.report import get_report_path_hash
 from codechecker_web.shared import webserver_context
 
 from codechecker_server.profiler import timeit
+from codechecker_server.query_cache import normalize
 
 from .. import permissions
-from ..database import db_cleanup
+from ..database import db_cleanup, report_summary, source_component
 from ..database.config_db_model import Product
 from ..database.database import conv
 from ..database.run_db_model import \
     AnalyzerStatistic, Report, ReviewStatus, File, Run, RunHistory, \
     RunLock, Comment, BugPathEvent, BugReportPoint, \
-    FileContent, SourceComponent, ExtendedReportData
+    FileContent, SourceComponent, SourceComponentFile, ExtendedReportData, \
+    ReportSummary
 from ..tmp import TemporaryDirectory
 
-from .db import DBSession, escape_like
+from .db import DBSession, TemporaryValueTable, escape_like
 from .thrift_enum_helper import detection_status_enum, \
     detection_status_str, review_status_enum, review_status_str, \
     report_extended_data_type_enum
@@ -146,35 +150,18 @@ def exc_to_thrift_reqfail(func):
     return wrapper
 
 
-def get_component_values(session, component_name):
+def cached_report_query(func):
     """
-    Get component values by component names and returns a tuple where the
-    first item contains a list path which should be skipped and the second
-    item contains a list of path which should be included.
-    E.g.:
-      +/a/b/x.cpp
-      +/a/b/y.cpp
-      -/a/b
-    On the above component value this function will return the following:
-      (['/a/b'], ['/a/b/x.cpp', '/a/b/y.cpp'])
+    Serve the result of the decorated report query from the query result
+    cache of the product while the runs it depends on are not modified.
     """
-    components = session.query(SourceComponent) \
-        .filter(SourceComponent.name.like(component_name)) \
-        .all()
-
-    skip = []
-    include = []
+    arg_names = inspect.getargspec(func).args[1:]
 
-    for component in components:
-        values = component.value.split('\n')
-        for value in values:
-            v = value[1:].strip()
-            if value[0] == '+':
-                include.append(v)
-            elif value[0] == '-':
-                skip.append(v)
+    @wraps(func)
+    def wrapper(self, *args):
+        return self._cached_query(func, arg_names, args)
 
-    return skip, include
+    return wrapper
 
 
 def process_report_filter(session, report_filter):
@@ -275,42 +262,8 @@ def process_report_filter(session, report_filter):
         AND.append(or_(*OR))
 
     if report_filter.componentNames:
-        OR = []
-
-        for component_name in report_filter.componentNames:
-            skip, include = get_component_values(session, component_name)
-
-            skip_q, include_q = None, None
-
-            if include:
-                and_q = [File.filepath.like(conv(fp)) for fp in include]
-                include_q = select([File.id]).where(or_(*and_q))
-
-            if skip:
-                and_q = [(File.filepath.like(conv(fp))) for fp in skip]
-                skip_q = select([File.id]).where(or_(*and_q))
-
-            file_ids = []
-            if skip and include:
-                skip_q = include_q.except_(skip_q).alias('component')
-                file_ids = session.query(skip_q) \
-                    .distinct() \
-                    .all()
-            elif include:
-                file_ids = session.query(include_q.alias('include')).all()
-            elif skip:
-                and_q = [not_(File.filepath.like(conv(fp))) for fp in skip]
-                skip_q = select([File.id]).where(and_(*and_q))
-                file_ids = session.query(skip_q.alias('skip')).all()
-
-            if file_ids:
-                OR.append(or_(File.id.in_([f_id[0] for f_id in file_ids])))
-            else:
-                # File id list can be empty for example when the user skips
-                # everything.
-                OR.append(False)
-
-        AND.append(or_(*OR))
+        AND.append(Report.file_id.in_(
+            component_file_ids(report_filter.componentNames)))
 
     if report_filter.bugPathLength is not None:
         min_path_length = report_filter.bugPathLength.min
@@ -325,6 +278,93 @@ def process_report_filter(session, report_filter):
     return filter_expr
 
 
+def component_file_ids(component_names):
+    """
+    Returns a subquery which selects the identifiers of the files belonging
+    to the given source components.
+    """
+    # The names are matched in the small source components table, so the
+    # membership table can be searched by its primary key.
+    OR = [SourceComponent.name.like(component_name)
+          for component_name in component_names]
+    names = select([SourceComponent.name]).where(or_(*OR))
+
+    return select([SourceComponentFile.file_id]) \
+        .where(SourceComponentFile.component_name.in_(names))
+
+
+def process_summary_filter(report_filter):
+    """
+    Process the report filter for the pre-aggregated report summary table.
+
+    Returns None if the filter refers to report properties which are not
+    available in the summary table. In this case the counts have to be
+    calculated from the reports table.
+    """
+    if report_filter is None:
+        return text('')
+
+    if report_filter.isUnique or \
+            report_filter.checkerMsg or \
+            report_filter.reportHash or \
+            report_filter.runHistoryTag or \
+            report_filter.runTag or \
+            report_filter.firstDetectionDate is not None or \
+            report_filter.fixDate is not None or \
+            report_filter.bugPathLength is not None:
+        return None
+
+    AND = []
+    if report_filter.filepath:
+        OR = [File.filepath.ilike(conv(fp))
+              for fp in report_filter.filepath]
+        AND.append(or_(*OR))
+
+    if report_filter.checkerName:
+        OR = [ReportSummary.checker_id.ilike(conv(cn))
+              for cn in report_filter.checkerName]
+        AND.append(or_(*OR))
+
+    if report_filter.runName:
+        OR = [Run.name.ilike(conv(rn))
+              for rn in report_filter.runName]
+        AND.append(or_(*OR))
+
+    if report_filter.severity:
+        AND.append(ReportSummary.severity.in_(report_filter.severity))
+
+    if report_filter.detectionStatus:
+        dst = list(map(detection_status_str,
+                       report_filter.detectionStatus))
+        AND.append(ReportSummary.detection_status.in_(dst))
+
+    if report_filter.reviewStatus:
+        rst = list(map(review_status_str, report_filter.reviewStatus))
+        AND.append(ReportSummary.review_status.in_(rst))
+
+    if report_filter.componentNames:
+        AND.append(ReportSummary.file_id.in_(
+            component_file_ids(report_filter.componentNames)))
+
+    return and_(*AND)
+
+
+def filter_summary_query(q, filter_expression, report_filter, run_ids=None):
+    """
+    Apply the run id list and the processed summary filter on the given
+    report summary query.
+    """
+    if run_ids:
+        q = q.filter(ReportSummary.run_id.in_(run_ids))
+
+    q = q.outerjoin(File, ReportSummary.file_id == File.id)
+
+    if report_filter is not None and report_filter.runName:
+        q = q.outerjoin(Run, ReportSummary.run_id == Run.id)
+
+    return q.filter(filter_expression)
+
+
 def process_run_history_filter(query, run_ids, run_history_filter):
     """
     Process run history filter.
@@ -384,25 +424,24 @@ def process_run_filter(session, query, run_filter):
     return query
 
 
-def get_diff_hashes_for_query(base_run_ids, base_line_hashes, new_run_ids,
-                              new_check_hashes, diff_type):
+def get_diff_hashes_query(base_hashes, new_hashes, diff_type):
     """
-    Get the report hash list for the result comparison.
+    Get the query of the report hashes for the result comparison. The
+    difference is calculated by the database, so the hash sets are never
+    loaded into the memory of the server.
 
-    Returns the list of hashes (NEW, RESOLVED, UNRESOLVED) and
-    the run ids which should be queried for the reports.
+    Returns the query of the hashes (NEW, RESOLVED, UNRESOLVED) and a flag
+    which is True if the reports should be queried in the new runs and
+    False if they should be queried in the base runs.
     """
     if diff_type == DiffType.NEW:
-        df = [] + list(new_check_hashes.difference(base_line_hashes))
-        return df, new_run_ids
+        return new_hashes.except_(base_hashes), True
 
     elif diff_type == DiffType.RESOLVED:
-        df = [] + list(base_line_hashes.difference(new_check_hashes))
-        return df, base_run_ids
+        return base_hashes.except_(new_hashes), False
 
     elif diff_type == DiffType.UNRESOLVED:
-        df = [] + list(base_line_hashes.intersection(new_check_hashes))
-        return df, new_run_ids
+        return base_hashes.intersect(new_hashes), True
     else:
         msg = 'Unsupported diff type: ' + str(diff_type)
         LOG.error(msg)
@@ -607,25 +646,46 @@ def filter_unresolved_reports(q):
                        ReviewStatus.bug_hash == Report.bug_id)
 
 
-def get_report_hashes(session, run_ids, tag_ids):
+def get_report_hashes(run_ids, tag_ids):
     """
-    Get report hash list for the reports which can be found in the given runs
-    and the given tags.
+    Get the query of the report hashes for the reports which can be found in
+    the given runs and the given tags.
     """
-    q = session.query(Report.bug_id)
+    q = select([Report.bug_id])
 
     if run_ids:
-        q = q.filter(Report.run_id.in_(run_ids))
+        q = q.where(Report.run_id.in_(run_ids))
 
     if tag_ids:
-        q = q.outerjoin(RunHistory,
-                        RunHistory.run_id == Report.run_id) \
-            .filter(RunHistory.id.in_(tag_ids)) \
-            .filter(Report.detected_at <= RunHistory.time) \
-            .filter(or_(Report.fixed_at.is_(None),
-                        Report.fixed_at > RunHistory.time))
+        q = q.select_from(Report.__table__.outerjoin(
+            RunHistory.__table__,
+            RunHistory.run_id == Report.run_id)) \
+            .where(RunHistory.id.in_(tag_ids)) \
+            .where(Report.detected_at <= RunHistory.time) \
+            .where(or_(Report.fixed_at.is_(None),
+                       Report.fixed_at > RunHistory.time))
+
+    return q
+
 
-    return set([t[0] for t in q])
+def invalidate_bug_hashes(session, query_cache, bug_hashes):
+    """
+    Invalidate the cached query results of the runs where reports with any
+    of the given bug hashes can be found.
+    """
+    bug_hashes = list(bug_hashes)
+    if not query_cache or not bug_hashes:
+        return
+
+    # The bug hashes are queried in chunks, so the number of the query
+    # parameters stays below the limit of SQLite.
+    run_ids = set()
+    for i in range(0, len(bug_hashes), 500):
+        run_ids.update(
+            r[0] for r in session.query(Report.run_id)
+            .filter(Report.bug_id.in_(bug_hashes[i:i + 500]))
+            .distinct())
+    query_cache.bump(list(run_ids))
 
 
 def check_remove_runs_lock(session, run_ids):
@@ -783,6 +843,76 @@ class ThriftRequestHandler(object):
                        kind,
                        datetime.now())
 
+    def __invalidate_runs(self, run_ids):
+        """
+        Invalidate the cached query results which depend on the given runs.
+        """
+        query_cache = getattr(self.__product, 'query_cache', None)
+        if query_cache:
+            query_cache.bump(run_ids)
+
+    def __invalidate_bug_hash(self, session, bug_hash):
+        """
+        Invalidate the cached query results of the runs where reports with
+        the given bug hash can be found.
+        """
+        self.__invalidate_bug_hashes(session, [bug_hash])
+
+    def __invalidate_bug_hashes(self, session, bug_hashes):
+        """
+        Invalidate the cached query results of the runs where reports with
+        any of the given bug hashes can be found.
+        """
+        invalidate_bug_hashes(session,
+                              getattr(self.__product, 'query_cache', None),
+                              bug_hashes)
+
+    def _cached_query(self, func, arg_names, args):
+        """
+        Returns the result of the given report query from the query result
+        cache of the product or executes the query and caches its result.
+
+        Access is checked before the cache lookup and the results do not
+        depend on the user, so the cache is shared between the users of the
+        product.
+        """
+        query_cache = getattr(self.__product, 'query_cache', None)
+        if not query_cache or not query_cache.enabled:
+            return func(self, *args)
+
+        self.__require_access()
+
+        named_args = dict(zip(arg_names, args))
+        run_ids = named_args.get('run_ids')
+        report_filter = named_args.get('report_filter')
+        cmp_data = named_args.get('cmp_data')
+
+        # Results of queries filtering by run names or run tags or comparing
+        # to tags may depend on any run of the product.
+        dep_run_ids = list(run_ids) if run_ids else None
+        if report_filter and (report_filter.runName or report_filter.runTag):
+            dep_run_ids = None
+        if dep_run_ids and cmp_data:
+            if cmp_data.runIds and not cmp_data.runTag:
+                dep_run_ids.extend(cmp_data.runIds)
+            else:
+                dep_run_ids = None
+
+        # The key has to be calculated before the query, because the query
+        # may modify its arguments.
+        key = (func.__name__, normalize(args))
+        tag = query_cache.generation_tag(dep_run_ids)
+
+        found, result = query_cache.get(key, tag)
+        if found:
+            LOG.debug("Query cache hit for %s.", func.__name__)
+            return result
+
+        result = func(self, *args)
+        query_cache.put(key, tag, result)
+
+        return result
+
     @timeit
     def getRunData(self, run_filter, limit, offset, sort_mode):
         self.__require_access()
@@ -1034,50 +1164,33 @@ class ThriftRequestHandler(object):
         skip_statuses_str = [detection_status_str(status)
                              for status in skip_detection_statuses]
 
-        with DBSession(self.__Session) as session:
-            if diff_type == DiffType.NEW:
-                # In postgresql we can select multiple rows filled with
-                # constants by using `unnest` function. In sqlite we have to
-                # use multiple UNION ALL.
+        if diff_type not in [DiffType.NEW, DiffType.RESOLVED,
+                             DiffType.UNRESOLVED]:
+            return []
 
-                if not report_hashes:
-                    return []
+        if diff_type == DiffType.NEW and not report_hashes:
+            return []
 
-                base_hashes = session.query(Report.bug_id.label('bug_id')) \
-                    .outerjoin(File, Report.file_id == File.id) \
-                    .filter(Report.detection_status.notin_(skip_statuses_str))
+        with DBSession(self.__Session) as session, \
+                TemporaryValueTable(session, report_hashes,
+                                    'bug_id') as client_hashes:
+            if diff_type == DiffType.NEW:
+                base_hashes = select([Report.bug_id]) \
+                    .where(Report.detection_status.notin_(skip_statuses_str))
 
                 if run_ids:
                     base_hashes = \
-                        base_hashes.filter(Report.run_id.in_(run_ids))
+                        base_hashes.where(Report.run_id.in_(run_ids))
+
+                q = select([client_hashes.c.bug_id]).except_(base_hashes)
+                return [res[0] for res in session.execute(q)]
 
-                if self.__product.driver_name == 'postgresql':
-                    new_hashes = select([func.unnest(report_hashes)
-                                        .label('bug_id')]) \
-                        .except_(base_hashes).alias('new_bugs')
-                    return [res[0] for res in session.query(new_hashes)]
-                else:
-                    # The maximum number of compound select in sqlite is 500
-                    # by default. We increased SQLITE_MAX_COMPOUND_SELECT
-                    # limit but when the number of compound select was larger
-                    # than 8435 sqlite threw a `Segmentation fault` error.
-                    # For this reason we create queries with chunks.
-                    new_hashes = []
-                    chunk_size = 500
-                    for chunk in [report_hashes[i:i + chunk_size] for
-                                  i in range(0, len(report_hashes),
-                                             chunk_size)]:
-                        new_hashes_query = union_all(*[
-                            select([bindparam('bug_id' + str(i), h)
-                                   .label('bug_id')])
-                            for i, h in enumerate(chunk)])
-                        q = select([new_hashes_query]).except_(base_hashes)
-                        new_hashes.extend([res[0] for res in session.query(q)])
-
-                    return new_hashes
             elif diff_type == DiffType.RESOLVED:
+                client_hash = exists() \
+                    .where(client_hashes.c.bug_id == Report.bug_id)
+
                 results = session.query(Report.bug_id) \
-                    .filter(Report.bug_id.notin_(report_hashes))
+                    .filter(~client_hash)
 
                 if run_ids:
                     results = results.filter(Report.run_id.in_(run_ids))
@@ -1086,7 +1199,8 @@ class ThriftRequestHandler(object):
 
             elif diff_type == DiffType.UNRESOLVED:
                 results = session.query(Report.bug_id) \
-                    .filter(Report.bug_id.in_(report_hashes)) \
+                    .filter(Report.bug_id.in_(
+                        select([client_hashes.c.bug_id]))) \
                     .filter(Report.detection_status.notin_(skip_statuses_str))
 
                 if run_ids:
@@ -1094,11 +1208,9 @@ class ThriftRequestHandler(object):
 
                 return [res[0] for res in results]
 
-            else:
-                return []
-
     @exc_to_thrift_reqfail
     @timeit
+    @cached_report_query
     def getRunResults(self, run_ids, limit, offset, sort_types,
                       report_filter, cmp_data, get_details):
         self.__require_access()
@@ -1114,9 +1226,6 @@ class ThriftRequestHandler(object):
                                                         run_ids,
                                                         report_filter,
                                                         cmp_data)
-                if not diff_hashes:
-                    # There is no difference.
-                    return results
 
             filter_expression = process_report_filter(session, report_filter)
 
@@ -1264,6 +1373,7 @@ class ThriftRequestHandler(object):
             return results
 
     @timeit
+    @cached_report_query
     def getRunReportCounts(self, run_ids, report_filter, limit, offset):
         """
           Count the results separately for multiple runs.
@@ -1306,6 +1416,7 @@ class ThriftRequestHandler(object):
 
     @exc_to_thrift_reqfail
     @timeit
+    @cached_report_query
     def getRunResultCount(self, run_ids, report_filter, cmp_data):
         self.__require_access()
 
@@ -1316,9 +1427,6 @@ class ThriftRequestHandler(object):
                                                         run_ids,
                                                         report_filter,
                                                         cmp_data)
-                if not diff_hashes:
-                    # There is no difference.
-                    return 0
 
             filter_expression = process_report_filter(session, report_filter)
             q = session.query(Report.bug_id)
@@ -1382,6 +1490,11 @@ class ThriftRequestHandler(object):
 
             review_status.status = review_status_str(status)
             review_status.author = user
+
+            report_summary.update_review_status(session,
+                                                review_status.bug_hash,
+                                                old_status,
+                                                review_status.status)
             review_status.message = message.encode('utf8')
             review_status.date = datetime.now()
             session.add(review_status)
@@ -1436,6 +1549,9 @@ class ThriftRequestHandler(object):
             res = self._setReviewStatus(report_id, status, message, session)
             session.commit()
 
+            report = session.query(Report).get(report_id)
+            self.__invalidate_bug_hash(session, report.bug_id)
+
             LOG.info("Review status of report '%s' was changed to '%s' by %s.",
                      report_id, review_status_str(status),
                      self.__get_username())
@@ -1528,6 +1644,8 @@ class ThriftRequestHandler(object):
                 session.add(comment)
                 session.commit()
 
+                self.__invalidate_bug_hash(session, report.bug_id)
+
                 return True
             else:
                 msg = 'Report id ' + str(report_id) + \
@@ -1578,6 +1696,8 @@ class ThriftRequestHandler(object):
                 session.add(comment)
 
                 session.commit()
+
+                self.__invalidate_bug_hash(session, comment.bug_hash)
                 return True
             else:
                 msg = 'Comment id ' + str(comment_id) + \
@@ -1609,6 +1729,8 @@ class ThriftRequestHandler(object):
                 session.delete(comment)
                 session.commit()
 
+                self.__invalidate_bug_hash(session, comment.bug_hash)
+
                 LOG.info("Comment '%s...' was removed from bug hash '%s' by "
                          "'%s'.", comment.message[:10], comment.bug_hash,
                          self.__get_username())
@@ -1714,7 +1836,7 @@ class ThriftRequestHandler(object):
     def _cmp_helper(self, session, run_ids, report_filter, cmp_data):
         """
         Get the report hashes for all of the runs.
-        Return the hash list which should be queried
+        Return the query of the hashes which should be queried
         in the returned run id list.
         """
         if not run_ids:
@@ -1726,9 +1848,7 @@ class ThriftRequestHandler(object):
         diff_type = cmp_data.diffType
 
         tag_ids = report_filter.runTag if report_filter else None
-        base_line_hashes = get_report_hashes(session,
-                                             base_run_ids,
-                                             tag_ids)
+        base_line_hashes = get_report_hashes(base_run_ids, tag_ids)
 
         # If run tag is set in compare data, after base line hashes are
         # calculated remove it from the report filter because we will filter
@@ -1740,20 +1860,17 @@ class ThriftRequestHandler(object):
         if not new_run_ids and not cmp_data.runTag:
             return base_line_hashes, base_run_ids
 
-        new_check_hashes = get_report_hashes(session,
-                                             new_run_ids,
-                                             cmp_data.runTag)
+        new_check_hashes = get_report_hashes(new_run_ids, cmp_data.runTag)
 
-        report_hashes, run_ids = \
-            get_diff_hashes_for_query(base_run_ids,
-                                      base_line_hashes,
-                                      new_run_ids,
-                                      new_check_hashes,
-                                      diff_type)
-        return report_hashes, run_ids
+        report_hashes, query_new_runs = \
+            get_diff_hashes_query(base_line_hashes,
+                                  new_check_hashes,
+                                  diff_type)
+        return report_hashes, new_run_ids if query_new_runs else base_run_ids
 
     @exc_to_thrift_reqfail
     @timeit
+    @cached_report_query
     def getCheckerCounts(self, run_ids, report_filter, cmp_data, limit,
                          offset):
         """
@@ -1764,15 +1881,32 @@ class ThriftRequestHandler(object):
         self.__require_access()
         results = []
         with DBSession(self.__Session) as session:
+            summary_filter = process_summary_filter(report_filter) \
+                if not cmp_data else None
+            if summary_filter is not None:
+                q = session.query(ReportSummary.checker_id,
+                                  ReportSummary.severity,
+                                  func.sum(ReportSummary.report_count))
+                q = filter_summary_query(q, summary_filter, report_filter,
+                                         run_ids) \
+                    .group_by(ReportSummary.checker_id,
+                              ReportSummary.severity) \
+                    .order_by(ReportSummary.checker_id)
+
+                if limit:
+                    q = q.limit(limit).offset(offset)
+
+                return [CheckerCount(name=name,
+                                     severity=severity,
+                                     count=int(count))
+                        for name, severity, count in q]
+
             diff_hashes = None
             if cmp_data:
                 diff_hashes, run_ids = self._cmp_helper(session,
                                                         run_ids,
                                                         report_filter,
                                                         cmp_data)
-                if not diff_hashes:
-                    # There is no difference.
-                    return results
 
             filter_expression = process_report_filter(session, report_filter)
 
@@ -1815,6 +1949,7 @@ class ThriftRequestHandler(object):
 
     @exc_to_thrift_reqfail
     @timeit
+    @cached_report_query
     def getSeverityCounts(self, run_ids, report_filter, cmp_data):
         """
           If the run id list is empty the metrics will be counted
@@ -1824,15 +1959,23 @@ class ThriftRequestHandler(object):
         self.__require_access()
         results = {}
         with DBSession(self.__Session) as session:
+            summary_filter = process_summary_filter(report_filter) \
+                if not cmp_data else None
+            if summary_filter is not None:
+                q = session.query(ReportSummary.severity,
+                                  func.sum(ReportSummary.report_count))
+                q = filter_summary_query(q, summary_filter, report_filter,
+                                         run_ids) \
+                    .group_by(ReportSummary.severity)
+
+                return {severity: int(count) for severity, count in q}
+
             diff_hashes = None
             if cmp_data:
                 diff_hashes, run_ids = self._cmp_helper(session,
                                                         run_ids,
                                                         report_filter,
                                                         cmp_data)
-                if not diff_hashes:
-                    # There is no difference.
-                    return results
 
             filter_expression = process_report_filter(session, report_filter)
 
@@ -1860,6 +2003,7 @@ class ThriftRequestHandler(object):
 
     @exc_to_thrift_reqfail
     @timeit
+    @cached_report_query
     def getCheckerMsgCounts(self, run_ids, report_filter, cmp_data, limit,
                             offset):
         """
@@ -1876,9 +2020,6 @@ class ThriftRequestHandler(object):
                                                         run_ids,
                                                         report_filter,
                                                         cmp_data)
-                if not diff_hashes:
-                    # There is no difference.
-                    return results
 
             filter_expression = process_report_filter(session, report_filter)
 
@@ -1912,6 +2053,7 @@ class ThriftRequestHandler(object):
 
     @exc_to_thrift_reqfail
     @timeit
+    @cached_report_query
     def getReviewStatusCounts(self, run_ids, report_filter, cmp_data):
         """
           If the run id list is empty the metrics will be counted
@@ -1921,15 +2063,25 @@ class ThriftRequestHandler(object):
         self.__require_access()
         results = defaultdict(int)
         with DBSession(self.__Session) as session:
+            summary_filter = process_summary_filter(report_filter) \
+                if not cmp_data else None
+            if summary_filter is not None:
+                q = session.query(ReportSummary.review_status,
+                                  func.sum(ReportSummary.report_count))
+                q = filter_summary_query(q, summary_filter, report_filter,
+                                         run_ids) \
+                    .group_by(ReportSummary.review_status)
+
+                for rev_status, count in q:
+                    results[review_status_enum(rev_status)] += int(count)
+                return results
+
             diff_hashes = None
             if cmp_data:
                 diff_hashes, run_ids = self._cmp_helper(session,
                                                         run_ids,
                                                         report_filter,
                                                         cmp_data)
-                if not diff_hashes:
-                    # There is no difference.
-                    return results
 
             filter_expression = process_report_filter(session, report_filter)
 
@@ -1967,6 +2119,7 @@ class ThriftRequestHandler(object):
 
     @exc_to_thrift_reqfail
     @timeit
+    @cached_report_query
     def getFileCounts(self, run_ids, report_filter, cmp_data, limit, offset):
         """
           If the run id list is empty the metrics will be counted
@@ -1976,12 +2129,33 @@ class ThriftRequestHandler(object):
         self.__require_access()
         results = {}
         with DBSession(self.__Session) as session:
+            summary_filter = process_summary_filter(report_filter) \
+                if not cmp_data else None
+            if summary_filter is not None:
+                q = session.query(ReportSummary.file_id,
+                                  func.sum(ReportSummary.report_count)
+                                  .label('report_count'))
+                q = filter_summary_query(q, summary_filter, report_filter,
+                                         run_ids) \
+                    .group_by(ReportSummary.file_id)
+
+                if limit:
+                    q = q.limit(limit).offset(offset)
+
+                report_count = q.subquery()
+                file_paths = session.query(File.filepath,
+                                           report_count.c.report_count) \
+                    .join(report_count,
+                          report_count.c.file_id == File.id)
+
+                return {fp: int(count) for fp, count in file_paths}
+
             if cmp_data:
                 diff_hashes, run_ids = self._cmp_helper(session,
                                                         run_ids,
                                                         report_filter,
                                                         cmp_data)
-                if not diff_hashes:
+                if not session.query(diff_hashes.alias('diff')).first():
                     # There is no difference.
                     return results
 
@@ -2027,6 +2201,7 @@ class ThriftRequestHandler(object):
 
     @exc_to_thrift_reqfail
     @timeit
+    @cached_report_query
     def getRunHistoryTagCounts(self, run_ids, report_filter, cmp_data):
         """
           If the run id list is empty the metrics will be counted
@@ -2041,7 +2216,7 @@ class ThriftRequestHandler(object):
                                                         run_ids,
                                                         report_filter,
                                                         cmp_data)
-                if not diff_hashes:
+                if not session.query(diff_hashes.alias('diff')).first():
                     # There is no difference.
                     return results
 
@@ -2113,6 +2288,7 @@ class ThriftRequestHandler(object):
 
     @exc_to_thrift_reqfail
     @timeit
+    @cached_report_query
     def getDetectionStatusCounts(self, run_ids, report_filter, cmp_data):
         """
           If the run id list is empty the metrics will be counted
@@ -2122,15 +2298,24 @@ class ThriftRequestHandler(object):
         self.__require_access()
         results = {}
         with DBSession(self.__Session) as session:
+            summary_filter = process_summary_filter(report_filter) \
+                if not cmp_data else None
+            if summary_filter is not None:
+                q = session.query(ReportSummary.detection_status,
+                                  func.sum(ReportSummary.report_count))
+                q = filter_summary_query(q, summary_filter, report_filter,
+                                         run_ids) \
+                    .group_by(ReportSummary.detection_status)
+
+                return {detection_status_enum(status): int(count)
+                        for status, count in q}
+
             diff_hashes = None
             if cmp_data:
                 diff_hashes, run_ids = self._cmp_helper(session,
                                                         run_ids,
                                                         report_filter,
                                                         cmp_data)
-                if not diff_hashes:
-                    # There is no difference.
-                    return results
 
             filter_expression = process_report_filter(session, report_filter)
 
@@ -2202,14 +2387,11 @@ class ThriftRequestHandler(object):
                                                       run_ids,
                                                       report_filter,
                                                       cmp_data)
-                    if not diff_hashes:
-                        # There is no difference.
-                        return True
 
                 filter_expression = process_report_filter(session,
                                                           report_filter)
 
-                q = session.query(Report.id) \
+                q = session.query(Report.id, Report.run_id) \
                     .outerjoin(File, Report.file_id == File.id) \
                     .outerjoin(ReviewStatus,
                                ReviewStatus.bug_hash == Report.bug_id) \
@@ -2221,15 +2403,24 @@ class ThriftRequestHandler(object):
                 if cmp_data:
                     q = q.filter(Report.bug_id.in_(diff_hashes))
 
-                reports_to_delete = [r[0] for r in q]
+                reports_to_delete = []
+                affected_run_ids = set()
+                for report_id, run_id in q:
+                    reports_to_delete.append(report_id)
+                    affected_run_ids.add(run_id)
+
                 if reports_to_delete:
                     self.__removeReports(session, reports_to_delete)
+                    report_summary.refresh_run_summaries(
+                        session, list(affected_run_ids))
 
                 # Delete files and contents that are not present
                 # in any bug paths.
                 db_cleanup.remove_unused_files(session)
                 session.commit()
                 session.close()
+
+                self.__invalidate_runs(affected_run_ids)
                 return True
             except Exception as ex:
                 session.rollback()
@@ -2249,6 +2440,10 @@ class ThriftRequestHandler(object):
             if not run_filter:
                 run_filter = RunFilter(ids=[run_id])
 
+            q = session.query(Run.id)
+            q = process_run_filter(session, q, run_filter)
+            removed_run_ids = [r[0] for r in q]
+
             q = session.query(Run)
             q = process_run_filter(session, q, run_filter)
             q.delete(synchronize_session=False)
@@ -2260,6 +2455,8 @@ class ThriftRequestHandler(object):
             session.commit()
             session.close()
 
+            self.__invalidate_runs(removed_run_ids)
+
             LOG.info("Run '%s' was removed by '%s'.", run_id,
                      self.__get_username())
         return True
@@ -2293,6 +2490,8 @@ class ThriftRequestHandler(object):
                 session.add(run_data)
                 session.commit()
 
+                self.__invalidate_runs([run_id])
+
                 LOG.info("Run name '%s' (%d) was changed to %s by '%s'.",
                          old_run_name, run_id, new_run_name,
                          self.__get_username())
@@ -2339,8 +2538,15 @@ class ThriftRequestHandler(object):
                                             user)
 
             session.add(component)
+            session.flush()
+
+            source_component.refresh_component_files(session, name)
             session.commit()
 
+            query_cache = getattr(self.__product, 'query_cache', None)
+            if query_cache:
+                query_cache.clear()
+
             return True
 
     @exc_to_thrift_reqfail
@@ -2378,6 +2584,11 @@ class ThriftRequestHandler(object):
             if component:
                 session.delete(component)
                 session.commit()
+
+                query_cache = getattr(self.__product, 'query_cache', None)
+                if query_cache:
+                    query_cache.clear()
+
                 LOG.info("Source component '%s' has been removed by '%s'",
                          name, self.__get_username())
                 return True
@@ -2446,6 +2657,12 @@ class ThriftRequestHandler(object):
                                                  file_hash,
                                                  None)
 
+        # Keep the source component membership up to date for the new files.
+        with DBSession(self.__Session) as session:
+            source_component.add_files_to_components(
+                session, file_path_to_id.values())
+            session.commit()
+
         return file_path_to_id
 
     def __store_reports(self, session, report_dir, source_root, run_id,
@@ -2454,6 +2671,9 @@ class ThriftRequestHandler(object):
                         checkers):
         """
         Parse up and store the plist report files.
+
+        Returns the bug hashes whose review status was set by a source code
+        comment. The review status is shared by every run.
         """
 
         all_reports = session.query(Report) \
@@ -2466,6 +2686,7 @@ class ThriftRequestHandler(object):
 
         already_added = set()
         new_bug_hashes = set()
+        review_status_bug_hashes = set()
 
         # Get checker names which was enabled during the analysis.
         enabled_checkers = set()
@@ -2593,6 +2814,7 @@ class ThriftRequestHandler(object):
                                               rw_status,
                                               src_comment_data[0]['message'],
                                               session)
+                        review_status_bug_hashes.add(bug_id)
                     elif len(src_comment_data) > 1:
                         LOG.warning(
                             "Multiple source code comment can be found "
@@ -2631,6 +2853,8 @@ class ThriftRequestHandler(object):
         if reports_to_delete:
             self.__removeReports(session, list(reports_to_delete))
 
+        return review_status_bug_hashes
+
     @staticmethod
     @exc_to_thrift_reqfail
     def __store_run_lock(session, name, username):
@@ -2835,6 +3059,13 @@ class ThriftRequestHandler(object):
 
                     # Actual store operation begins here.
                     user_name = self.__get_username()
+
+                    # Storing with force flag removes the previous run, so
+                    # the results of its old ID have to be invalidated too.
+                    old_run = session.query(Run.id) \
+                        .filter(Run.name == name) \
+                        .one_or_none()
+
                     run_id = store_handler.addCheckerRun(session,
                                                          command,
                                                          name,
@@ -2846,16 +3077,19 @@ class ThriftRequestHandler(object):
                                                          cc_version,
                                                          statistics)
 
-                    self.__store_reports(session,
-                                         report_dir,
-                                         source_root,
-                                         run_id,
-                                         file_path_to_id,
-                                         run_history_time,
-                                         self.__context.severity_map,
-                                         wrong_src_code_comments,
-                                         skip_handler,
-                                         checkers)
+                    review_status_bug_hashes = self.__store_reports(
+                        session,
+                        report_dir,
+                        source_root,
+                        run_id,
+                        file_path_to_id,
+                        run_history_time,
+                        self.__context.severity_map,
+                        wrong_src_code_comments,
+                        skip_handler,
+                        checkers)
+
+                    report_summary.refresh_run_summaries(session, [run_id])
 
                     store_handler.setRunDuration(session,
                                                  run_id,
@@ -2865,6 +3099,14 @@ class ThriftRequestHandler(object):
 
                     session.commit()
 
+                    self.__invalidate_runs(
+                        [run_id, old_run[0]] if old_run else [run_id])
+
+                    # The review statuses are shared by the runs, so the
+                    # other runs with these reports are invalidated too.
+                    self.__invalidate_bug_hashes(session,
+                                                 review_status_bug_hashes)
+
                 return run_id
         finally:
             # In any case if the "try" block's execution began, a run lock must
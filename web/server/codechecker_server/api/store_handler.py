@@ -14,6 +14,7 @@ import base64
 import codecs
 from datetime import datetime
 from hashlib import sha256
+import json
 import os
 import zlib
 
@@ -60,6 +61,13 @@ def metadata_info(metadata_file):
     # Get analyzer statistics.
     analyzer_statistics = metadata_dict.get('analyzer_statistics', {})
 
+    # The resource usage of the analyzed files is stored with the statistics
+    # of their analyzer.
+    for analyzer_type, usage in \
+            metadata_dict.get('resource_usage', {}).items():
+        if analyzer_type in analyzer_statistics:
+            analyzer_statistics[analyzer_type]['resource_usage'] = usage
+
     checkers = metadata_dict.get('checkers', {})
 
     return check_commands, check_durations, cc_version, analyzer_statistics, \
@@ -366,12 +374,23 @@ def addCheckerRun(session, command, name, tag, username,
                 compressed_files = zlib.compress('\n'.join(failed_sources),
                                                  zlib.Z_BEST_COMPRESSION)
 
-            analyzer_statistics = AnalyzerStatistic(run_history.id,
-                                                    analyzer_type,
-                                                    analyzer_version,
-                                                    successful,
-                                                    failed,
-                                                    compressed_files)
+            resource_usage = res.get('resource_usage')
+            if resource_usage:
+                resource_usage = zlib.compress(json.dumps(resource_usage),
+                                               zlib.Z_BEST_COMPRESSION)
+
+            analyzer_statistics = AnalyzerStatistic(
+                run_history.id,
+                analyzer_type,
+                analyzer_version,
+                successful,
+                failed,
+                compressed_files,
+                res.get('analysis_time'),
+                res.get('cpu_time'),
+                res.get('max_rss'),
+                res.get('output_size'),
+                resource_usage)
             session.add(analyzer_statistics)
 
         session.flush()
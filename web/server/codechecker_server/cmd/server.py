@@ -31,7 +31,8 @@ from codechecker_common import output_formatters
 from codechecker_common import util
 
 from codechecker_server import instance_manager, server
-from codechecker_server.database import database
+from codechecker_server.database import database, query_plan, \
+    report_summary
 from codechecker_server.database.config_db_model \
     import IDENTIFIER as CONFIG_META
 from codechecker_server.database.config_db_model \
@@ -320,6 +321,36 @@ def add_arguments_to_parser(parser):
                                      "advised to create a full backup of the "
                                      "product databases.")
 
+    database_mgmnt.add_argument('--db-check-summary',
+                                type=str,
+                                dest='product_to_check_summary',
+                                action='store',
+                                default=argparse.SUPPRESS,
+                                required=False,
+                                help="Name of the product to check the "
+                                     "consistency of the pre-aggregated "
+                                     "report count tables for. Runs with "
+                                     "inconsistent counts are listed and "
+                                     "their summaries are rebuilt from the "
+                                     "stored reports. Use 'all' to check all "
+                                     "of the products.")
+
+    database_mgmnt.add_argument('--explain-queries',
+                                type=str,
+                                dest='product_to_explain',
+                                action='store',
+                                default=argparse.SUPPRESS,
+                                required=False,
+                                help="Name of the product to explain the "
+                                     "report query shapes of the server "
+                                     "for. The execution plans are queried "
+                                     "from the product database and the "
+                                     "tables which are scanned sequentially "
+                                     "are listed. Use 'all' to explain the "
+                                     "queries for all of the products. Use "
+                                     "'--verbose debug' to print the full "
+                                     "execution plans.")
+
     logger.add_verbose_arguments(parser)
 
     def __handle(args):
@@ -607,6 +638,133 @@ def __db_migration(cfg_sql_server, migration_root, environ,
     return 0
 
 
+def __db_check_summary(cfg_sql_server, migration_root, environ,
+                       product_name='all'):
+    """
+    Compare the pre-aggregated report counts with the stored reports of the
+    given product and rebuild the summaries of the inconsistent runs.
+    """
+    engine = cfg_sql_server.create_engine()
+    config_session = sessionmaker(bind=engine)
+    sess = config_session()
+
+    products = sess.query(ORMProduct)
+    if product_name != 'all':
+        products = products.filter(ORMProduct.endpoint == product_name)
+    products = products.all()
+
+    sess.close()
+    engine.dispose()
+
+    if not products:
+        LOG.error("No product was found with this endpoint: %s",
+                  product_name)
+        return 1
+
+    header = ['Product endpoint', 'Run ID', 'Summary count', 'Report count']
+    rows = []
+    ret = 0
+    for product in products:
+        LOG.info("Checking report summaries of '%s'...", product.endpoint)
+        db = database.SQLServer.from_connection_string(product.connection,
+                                                       RUN_META,
+                                                       migration_root,
+                                                       interactive=False,
+                                                       env=environ)
+        with database.DBContext(db) as db_ctx:
+            if db_ctx.error:
+                LOG.error("Failed to connect to the database of '%s'.",
+                          product.endpoint)
+                ret = 1
+                continue
+
+            try:
+                mismatches = report_summary.check_consistency(db_ctx.session)
+                for run_id, summary_count, report_count in mismatches:
+                    rows.append([product.endpoint, str(run_id),
+                                 str(summary_count), str(report_count)])
+
+                if mismatches:
+                    report_summary.refresh_run_summaries(
+                        db_ctx.session, [m[0] for m in mismatches])
+                    db_ctx.session.commit()
+                    LOG.info("Report summaries of %d run(s) in '%s' have "
+                             "been rebuilt.", len(mismatches),
+                             product.endpoint)
+            except Exception as ex:
+                db_ctx.session.rollback()
+                LOG.error("Failed to check the report summaries of '%s'.",
+                          product.endpoint)
+                LOG.error(ex)
+                ret = 1
+
+    if rows:
+        LOG.info("Inconsistent report summaries:\n%s",
+                 output_formatters.twodim_to_str('table', header, rows))
+    else:
+        LOG.info("Report summaries are consistent.")
+
+    return ret
+
+
+def __db_explain_queries(cfg_sql_server, migration_root, environ,
+                         product_name='all'):
+    """
+    Print the tables which are scanned sequentially by the report queries
+    in the databases of the given product.
+    """
+    engine = cfg_sql_server.create_engine()
+    config_session = sessionmaker(bind=engine)
+    sess = config_session()
+
+    products = sess.query(ORMProduct)
+    if product_name != 'all':
+        products = products.filter(ORMProduct.endpoint == product_name)
+    products = products.all()
+
+    sess.close()
+    engine.dispose()
+
+    if not products:
+        LOG.error("No product was found with this endpoint: %s",
+                  product_name)
+        return 1
+
+    header = ['Product endpoint', 'Query', 'Sequential scans']
+    rows = []
+    ret = 0
+    for product in products:
+        LOG.info("Explaining report queries of '%s'...", product.endpoint)
+        db = database.SQLServer.from_connection_string(product.connection,
+                                                       RUN_META,
+                                                       migration_root,
+                                                       interactive=False,
+                                                       env=environ)
+        with database.DBContext(db) as db_ctx:
+            if db_ctx.error:
+                LOG.error("Failed to connect to the database of '%s'.",
+                          product.endpoint)
+                ret = 1
+                continue
+
+            try:
+                for name, _, seq_scans in \
+                        query_plan.explain_query_shapes(db_ctx.session):
+                    rows.append([product.endpoint, name,
+                                 ', '.join(seq_scans) if seq_scans else '-'])
+            except Exception as ex:
+                LOG.error("Failed to explain the report queries of '%s'.",
+                          product.endpoint)
+                LOG.error(ex)
+                ret = 1
+
+    if rows:
+        LOG.info("Sequential scans of the report queries:\n%s",
+                 output_formatters.twodim_to_str('table', header, rows))
+
+    return ret
+
+
 def kill_process_tree(parent_pid, recursive=False):
     """Stop the process tree try it gracefully first.
 
@@ -867,6 +1025,16 @@ def server_init_start(args):
     except AttributeError:
         LOG.debug('Product upgrade was not in the arguments.')
 
+    if 'product_to_check_summary' in args:
+        ret = __db_check_summary(cfg_sql_server, context.run_migration_root,
+                                 environ, args.product_to_check_summary)
+        sys.exit(ret)
+
+    if 'product_to_explain' in args:
+        ret = __db_explain_queries(cfg_sql_server, context.run_migration_root,
+                                   environ, args.product_to_explain)
+        sys.exit(ret)
+
     # Create the main database link from the arguments passed over the
     # command line.
     cfg_dir = os.path.abspath(args.config_directory)
@@ -20,6 +20,7 @@ from codeCheckerDBAccess_v6.ttypes import Severity
 
 from codechecker_common.logger import get_logger
 
+from . import report_summary
 from .run_db_model import BugPathEvent, BugReportPoint, File, \
     FileContent, Report, RunLock
 
@@ -114,6 +115,9 @@ def upgrade_severity_levels(session, severity_map):
 
             updated_checker_ids.add(checker_id)
 
+        if updated_checker_ids:
+            report_summary.refresh_run_summaries(session)
+
         session.commit()
 
     LOG.debug("Upgrading of severity levels finished...")
@@ -0,0 +1,219 @@
+# -------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -------------------------------------------------------------------------
+"""
+Execution plan checker for the report query shapes of the server.
+
+The queries below mirror the statements built by the report server API for
+listing, counting and comparing reports. Their execution plans are queried
+from the database with EXPLAIN, so operators can check on their own data
+whether a query scans a whole table instead of using an index.
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+
+import re
+
+from sqlalchemy.sql.expression import and_, func, literal_column, or_, \
+    select
+
+from codechecker_common.logger import get_logger
+
+from .run_db_model import File, Report, ReportSummary, ReviewStatus, Run, \
+    SourceComponent, SourceComponentFile
+
+LOG = get_logger('server')
+
+# Detection statuses which are skipped by default in the result listing.
+SKIPPED_DETECTION_STATUSES = ['resolved', 'off', 'unavailable']
+
+# Patterns of the full table scan steps in the output of EXPLAIN.
+SEQ_SCAN_PATTERNS = {
+    'postgresql': re.compile(r'Seq Scan on (\w+)'),
+    'sqlite': re.compile(r'SCAN (?:TABLE )?(?!SUBQUERY|CONSTANT)(\w+)'
+                         r'(?!.*\bINDEX\b)')
+}
+
+
+def __report_results(run_ids, other_run_ids):
+    """ Listing the reports of runs sorted by file path. """
+    return select([Report.id, Report.bug_id, Report.checker_id,
+                   Report.severity, Report.detection_status,
+                   ReviewStatus.status, File.filepath]) \
+        .select_from(Report.__table__
+                     .outerjoin(File.__table__, Report.file_id == File.id)
+                     .outerjoin(ReviewStatus.__table__,
+                                ReviewStatus.bug_hash == Report.bug_id)) \
+        .where(and_(Report.run_id.in_(run_ids),
+                    Report.detection_status.notin_(
+                        SKIPPED_DETECTION_STATUSES))) \
+        .order_by(File.filepath, Report.line) \
+        .limit(100)
+
+
+def __checker_counts(run_ids, other_run_ids):
+    """ Counting the reports of runs by checker and severity. """
+    return select([Report.checker_id, Report.severity,
+                   func.count(Report.id)]) \
+        .where(Report.run_id.in_(run_ids)) \
+        .group_by(Report.checker_id, Report.severity)
+
+
+def __detection_status_counts(run_ids, other_run_ids):
+    """ Counting the reports of runs by detection status. """
+    return select([Report.detection_status, func.count(Report.id)]) \
+        .where(Report.run_id.in_(run_ids)) \
+        .group_by(Report.detection_status)
+
+
+def __review_status_counts(run_ids, other_run_ids):
+    """ Counting the reports of runs by review status. """
+    return select([ReviewStatus.status, func.count(Report.id)]) \
+        .select_from(Report.__table__.outerjoin(
+            ReviewStatus.__table__,
+            ReviewStatus.bug_hash == Report.bug_id)) \
+        .where(Report.run_id.in_(run_ids)) \
+        .group_by(ReviewStatus.status)
+
+
+def __file_counts(run_ids, other_run_ids):
+    """ Counting the reports of runs by file. """
+    return select([Report.file_id, func.count(Report.id)]) \
+        .where(Report.run_id.in_(run_ids)) \
+        .group_by(Report.file_id)
+
+
+def __run_report_counts(run_ids, other_run_ids):
+    """ Counting the reports of the runs. """
+    return select([Run.id, Run.name, func.count(Report.id)]) \
+        .select_from(Run.__table__.outerjoin(Report.__table__,
+                                             Report.run_id == Run.id)) \
+        .group_by(Run.id, Run.name)
+
+
+def __summary_counts(run_ids, other_run_ids):
+    """ Counting the reports of runs from the pre-aggregated table. """
+    return select([ReportSummary.checker_id, ReportSummary.severity,
+                   func.sum(ReportSummary.report_count)]) \
+        .where(ReportSummary.run_id.in_(run_ids)) \
+        .group_by(ReportSummary.checker_id, ReportSummary.severity)
+
+
+def __component_filter(run_ids, other_run_ids):
+    """ Listing the reports of runs in a source component. """
+    names = select([SourceComponent.name]) \
+        .where(SourceComponent.name.like('component'))
+    component_files = select([SourceComponentFile.file_id]) \
+        .where(SourceComponentFile.component_name.in_(names))
+
+    return select([Report.id]) \
+        .where(and_(Report.run_id.in_(run_ids),
+                    Report.file_id.in_(component_files)))
+
+
+def __run_comparison(run_ids, other_run_ids):
+    """ Listing the new reports of runs compared to other runs. """
+    base_hashes = select([Report.bug_id]) \
+        .where(Report.run_id.in_(other_run_ids))
+    new_hashes = select([Report.bug_id]) \
+        .where(Report.run_id.in_(run_ids))
+
+    return select([Report.id]) \
+        .where(and_(Report.run_id.in_(run_ids),
+                    Report.bug_id.in_(new_hashes.except_(base_hashes))))
+
+
+def __report_hashes_in_tags(run_ids, other_run_ids):
+    """ Collecting the report hashes of runs valid at a point of time. """
+    return select([Report.bug_id]) \
+        .where(and_(Report.run_id.in_(run_ids),
+                    Report.detected_at <= func.current_timestamp(),
+                    or_(Report.fixed_at.is_(None),
+                        Report.fixed_at > func.current_timestamp())))
+
+
+QUERY_SHAPES = [
+    ('run results', __report_results),
+    ('checker counts', __checker_counts),
+    ('detection status counts', __detection_status_counts),
+    ('review status counts', __review_status_counts),
+    ('file counts', __file_counts),
+    ('run report counts', __run_report_counts),
+    ('summary counts', __summary_counts),
+    ('component filter', __component_filter),
+    ('run comparison', __run_comparison),
+    ('report hashes in tags', __report_hashes_in_tags)
+]
+
+
+def __sample_run_ids(session):
+    """
+    Returns a run id list and a list of other run ids for the queries. The
+    largest runs are used, because their plans are the most relevant.
+    """
+    run_ids = [r[0] for r in session.query(Report.run_id)
+               .group_by(Report.run_id)
+               .order_by(func.count(literal_column('*')).desc())
+               .limit(2)]
+
+    if not run_ids:
+        return [1], [2]
+
+    return run_ids[:1], run_ids[1:] or run_ids[:1]
+
+
+def explain(session, statement):
+    """
+    Returns the lines of the execution plan of the given statement.
+    """
+    dialect = session.bind.dialect
+    sql = str(statement.compile(dialect=dialect,
+                                compile_kwargs={'literal_binds': True}))
+
+    if dialect.name == 'sqlite':
+        # The last column of the query plan rows contains the description.
+        return [row[-1] for row in
+                session.execute('EXPLAIN QUERY PLAN ' + sql)]
+
+    return [row[0] for row in session.execute('EXPLAIN ' + sql)]
+
+
+def sequential_scans(dialect_name, plan):
+    """
+    Returns the names of the tables which are scanned sequentially according
+    to the given execution plan.
+    """
+    pattern = SEQ_SCAN_PATTERNS.get(dialect_name)
+    if not pattern:
+        return []
+
+    tables = []
+    for line in plan:
+        match = pattern.search(line)
+        if match and match.group(1) not in tables:
+            tables.append(match.group(1))
+
+    return tables
+
+
+def explain_query_shapes(session):
+    """
+    Explain every report query shape on the database of the given session.
+
+    Returns a list of (query name, execution plan lines, sequentially
+    scanned tables) tuples.
+    """
+    dialect_name = session.bind.dialect.name
+    run_ids, other_run_ids = __sample_run_ids(session)
+
+    results = []
+    for name, query_shape in QUERY_SHAPES:
+        plan = explain(session, query_shape(run_ids, other_run_ids))
+        LOG.debug("Execution plan of '%s':\n%s", name, '\n'.join(plan))
+
+        results.append((name, plan, sequential_scans(dialect_name, plan)))
+
+    return results
@@ -0,0 +1,186 @@
+# -------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -------------------------------------------------------------------------
+"""
+Maintenance of the pre-aggregated report count tables.
+
+The report_summaries table contains the number of reports for each
+(run, file, checker, severity, detection status, review status) tuple. The
+report counting endpoints of the server read this table instead of grouping
+the whole reports table when the report filter can be expressed on these
+columns.
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+
+import sqlalchemy
+from sqlalchemy.sql.expression import cast, func, literal_column, select
+
+from codechecker_common.logger import get_logger
+
+from .run_db_model import Report, ReportSummary, ReviewStatus
+
+LOG = get_logger('server')
+
+UNREVIEWED = 'unreviewed'
+
+SUMMARY_COLUMNS = ['run_id', 'file_id', 'checker_id', 'severity',
+                   'detection_status', 'review_status', 'report_count']
+
+
+def __live_summary_query(run_ids=None):
+    """
+    Returns a select statement which aggregates the reports of the given runs
+    the same way as they are stored in the summary table.
+    """
+    review_status = func.coalesce(cast(ReviewStatus.status,
+                                       sqlalchemy.String),
+                                  UNREVIEWED)
+    detection_status = cast(Report.detection_status, sqlalchemy.String)
+
+    q = select([Report.run_id,
+                Report.file_id,
+                Report.checker_id,
+                Report.severity,
+                detection_status,
+                review_status,
+                func.count(literal_column('*'))]) \
+        .select_from(Report.__table__.outerjoin(
+            ReviewStatus.__table__,
+            ReviewStatus.bug_hash == Report.bug_id))
+
+    if run_ids is not None:
+        q = q.where(Report.run_id.in_(run_ids))
+
+    return q.group_by(Report.run_id,
+                      Report.file_id,
+                      Report.checker_id,
+                      Report.severity,
+                      detection_status,
+                      review_status)
+
+
+def refresh_run_summaries(session, run_ids=None):
+    """
+    Recompute the summary rows of the given runs from the reports table.
+    If no run id list is given the whole summary table is rebuilt.
+    """
+    if run_ids is not None and not run_ids:
+        return
+
+    LOG.debug("Refreshing report summaries of runs: %s",
+              'all' if run_ids is None else ', '.join(map(str, run_ids)))
+
+    delete_q = session.query(ReportSummary)
+    if run_ids is not None:
+        delete_q = delete_q.filter(ReportSummary.run_id.in_(run_ids))
+    delete_q.delete(synchronize_session=False)
+
+    session.execute(ReportSummary.__table__.insert().from_select(
+        SUMMARY_COLUMNS, __live_summary_query(run_ids)))
+
+
+def __adjust_summary(session, key, delta):
+    """
+    Add delta to the report count of the summary row identified by the given
+    key. Rows reaching zero are removed.
+    """
+    run_id, file_id, checker_id, severity, detection_status, \
+        review_status = key
+
+    row = session.query(ReportSummary) \
+        .filter(ReportSummary.run_id == run_id,
+                ReportSummary.file_id == file_id,
+                ReportSummary.checker_id == checker_id,
+                ReportSummary.severity == severity,
+                ReportSummary.detection_status == detection_status,
+                ReportSummary.review_status == review_status) \
+        .first()
+
+    if row is None:
+        if delta > 0:
+            session.add(ReportSummary(run_id, file_id, checker_id, severity,
+                                      detection_status, review_status,
+                                      delta))
+        return
+
+    row.report_count += delta
+    if row.report_count <= 0:
+        session.delete(row)
+
+
+def update_review_status(session, bug_hash, old_status, new_status):
+    """
+    Move the reports with the given bug hash from the old review status to
+    the new one in every run where they can be found.
+    """
+    old_status = old_status or UNREVIEWED
+    new_status = new_status or UNREVIEWED
+    if old_status == new_status:
+        return
+
+    groups = session.query(Report.run_id,
+                           Report.file_id,
+                           Report.checker_id,
+                           Report.severity,
+                           Report.detection_status,
+                           func.count(literal_column('*'))) \
+        .filter(Report.bug_id == bug_hash) \
+        .group_by(Report.run_id,
+                  Report.file_id,
+                  Report.checker_id,
+                  Report.severity,
+                  Report.detection_status)
+
+    for run_id, file_id, checker_id, severity, detection_status, count \
+            in groups:
+        key = (run_id, file_id, checker_id, severity, detection_status)
+        __adjust_summary(session, key + (old_status,), -count)
+        __adjust_summary(session, key + (new_status,), count)
+
+    session.flush()
+
+
+def check_consistency(session):
+    """
+    Compare the summary table with the live aggregation of the reports table.
+
+    Returns a list of (run_id, summary_count, live_count) tuples for the runs
+    where the two differ in any group.
+    """
+    live = {}
+    for row in session.execute(__live_summary_query()):
+        live[tuple(row[:-1])] = row[-1]
+
+    stored = {}
+    q = session.query(ReportSummary.run_id,
+                      ReportSummary.file_id,
+                      ReportSummary.checker_id,
+                      ReportSummary.severity,
+                      ReportSummary.detection_status,
+                      ReportSummary.review_status,
+                      func.sum(ReportSummary.report_count)) \
+        .group_by(ReportSummary.run_id,
+                  ReportSummary.file_id,
+                  ReportSummary.checker_id,
+                  ReportSummary.severity,
+                  ReportSummary.detection_status,
+                  ReportSummary.review_status)
+    for row in q:
+        stored[tuple(row[:-1])] = int(row[-1])
+
+    mismatching_runs = set()
+    for key in set(live) | set(stored):
+        if live.get(key, 0) != stored.get(key, 0):
+            mismatching_runs.add(key[0])
+
+    result = []
+    for run_id in sorted(mismatching_runs):
+        summary_count = sum(v for k, v in stored.items() if k[0] == run_id)
+        live_count = sum(v for k, v in live.items() if k[0] == run_id)
+        result.append((run_id, summary_count, live_count))
+
+    return result
@@ -17,7 +17,8 @@ from math import ceil
 import os
 
 from sqlalchemy import MetaData, Column, Integer, UniqueConstraint, String, \
-    DateTime, Boolean, ForeignKey, Binary, Enum, Text
+    DateTime, Boolean, ForeignKey, Binary, Enum, Index, Text, Float, \
+    BigInteger
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql.expression import true
@@ -122,14 +123,31 @@ class AnalyzerStatistic(Base):
     failed = Column(Integer)
     failed_files = Column(Binary, nullable=True)
 
+    # Sum of the wall and CPU time of the analyses in seconds, the largest
+    # maximum resident set size and the sum of the result file sizes in
+    # bytes.
+    analysis_time = Column(Float, nullable=True)
+    cpu_time = Column(Float, nullable=True)
+    max_rss = Column(BigInteger, nullable=True)
+    output_size = Column(BigInteger, nullable=True)
+
+    # Compressed JSON list of the resource usage of the analyzed files.
+    resource_usage = Column(Binary, nullable=True)
+
     def __init__(self, run_history_id, analyzer_type, version, successful,
-                 failed, failed_files):
+                 failed, failed_files, analysis_time=None, cpu_time=None,
+                 max_rss=None, output_size=None, resource_usage=None):
         self.run_history_id = run_history_id
         self.analyzer_type = analyzer_type
         self.version = version
         self.successful = successful
         self.failed = failed
         self.failed_files = failed_files
+        self.analysis_time = analysis_time
+        self.cpu_time = cpu_time
+        self.max_rss = max_rss
+        self.output_size = output_size
+        self.resource_usage = resource_usage
 
 
 class RunHistory(Base):
@@ -328,6 +346,17 @@ class Report(Base):
     detected_at = Column(DateTime, nullable=False)
     fixed_at = Column(DateTime)
 
+    # Composite indexes for the most frequent report query shapes: filtering
+    # the reports of runs by detection status, counting them by checker and
+    # severity and collecting their hashes for run comparison.
+    __table_args__ = (
+        Index('ix_reports_run_id_detection_status',
+              'run_id', 'detection_status'),
+        Index('ix_reports_run_id_checker_id_severity',
+              'run_id', 'checker_id', 'severity'),
+        Index('ix_reports_run_id_bug_id', 'run_id', 'bug_id'),
+    )
+
     # Cascade delete might remove rows, SQLAlchemy warns about this.
     # To remove warnings about already deleted items set this to False.
     __mapper_args__ = {
@@ -353,6 +382,42 @@ class Report(Base):
         self.path_length = path_length
 
 
+class ReportSummary(Base):
+    """
+    Pre-aggregated report counts maintained at store time. Each row holds
+    the number of reports in a run which share the same file, checker,
+    severity, detection status and review status.
+    """
+    __tablename__ = 'report_summaries'
+
+    id = Column(Integer, autoincrement=True, primary_key=True)
+    run_id = Column(Integer,
+                    ForeignKey('runs.id', deferrable=True,
+                               initially="DEFERRED", ondelete='CASCADE'),
+                    index=True)
+    file_id = Column(Integer, ForeignKey('files.id', deferrable=True,
+                                         initially="DEFERRED",
+                                         ondelete='CASCADE'),
+                     index=True)
+    checker_id = Column(String)
+    severity = Column(Integer)
+    detection_status = Column(String)
+
+    # Reports without a review status entry are counted as 'unreviewed'.
+    review_status = Column(String)
+    report_count = Column(Integer, nullable=False)
+
+    def __init__(self, run_id, file_id, checker_id, severity,
+                 detection_status, review_status, report_count):
+        self.run_id = run_id
+        self.file_id = file_id
+        self.checker_id = checker_id
+        self.severity = severity
+        self.detection_status = detection_status
+        self.review_status = review_status
+        self.report_count = report_count
+
+
 class Comment(Base):
     __tablename__ = 'comments'
 
@@ -410,6 +475,32 @@ class SourceComponent(Base):
         self.username = user_name
 
 
+class SourceComponentFile(Base):
+    """
+    Membership of the files in the source components. It is maintained when
+    a source component or a new file is stored.
+    """
+    __tablename__ = 'source_component_files'
+
+    component_name = Column(String,
+                            ForeignKey('source_components.name',
+                                       deferrable=True,
+                                       initially="DEFERRED",
+                                       ondelete='CASCADE'),
+                            primary_key=True)
+    file_id = Column(Integer,
+                     ForeignKey('files.id',
+                                deferrable=True,
+                                initially="DEFERRED",
+                                ondelete='CASCADE'),
+                     primary_key=True,
+                     index=True)
+
+    def __init__(self, component_name, file_id):
+        self.component_name = component_name
+        self.file_id = file_id
+
+
 IDENTIFIER = {
     'identifier': "RunDatabase",
     'orm_meta': CC_META,
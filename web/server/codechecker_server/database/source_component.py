@@ -0,0 +1,138 @@
+# -------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -------------------------------------------------------------------------
+"""
+Maintenance of the source component membership table.
+
+The source_component_files table contains the identifier of every file which
+belongs to a source component. The report filters use this table instead of
+matching the path patterns of the components against the whole files table
+for every request.
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+
+from sqlalchemy.sql.expression import and_, exists, literal, not_, or_, \
+    select
+
+from codechecker_common.logger import get_logger
+
+from .database import conv
+from .run_db_model import File, SourceComponent, SourceComponentFile
+
+LOG = get_logger('server')
+
+
+def split_component_value(value):
+    """
+    Split the value of a source component and returns a tuple where the
+    first item contains a list path which should be skipped and the second
+    item contains a list of path which should be included.
+    E.g.:
+      +/a/b/x.cpp
+      +/a/b/y.cpp
+      -/a/b
+    On the above component value this function will return the following:
+      (['/a/b'], ['/a/b/x.cpp', '/a/b/y.cpp'])
+    """
+    skip = []
+    include = []
+
+    for line in value.split('\n'):
+        if not line:
+            continue
+
+        path = line[1:].strip()
+        if line[0] == '+':
+            include.append(path)
+        elif line[0] == '-':
+            skip.append(path)
+
+    return skip, include
+
+
+def __membership_condition(value):
+    """
+    Returns the condition on the files table which selects the files of a
+    source component with the given value. None is returned if the component
+    does not contain any files.
+    """
+    skip, include = split_component_value(value)
+
+    if include:
+        cond = or_(*[File.filepath.like(conv(fp)) for fp in include])
+        if skip:
+            cond = and_(cond, *[not_(File.filepath.like(conv(fp)))
+                                for fp in skip])
+        return cond
+    elif skip:
+        return and_(*[not_(File.filepath.like(conv(fp))) for fp in skip])
+
+    # File id list can be empty for example when the user skips everything.
+    return None
+
+
+def __insert_members(session, component, file_ids=None):
+    """
+    Insert the files of the given component into the membership table which
+    are not in there yet. If a file id list is given only these files are
+    checked.
+    """
+    cond = __membership_condition(component.value)
+    if cond is None:
+        return
+
+    already_member = exists().where(and_(
+        SourceComponentFile.component_name == component.name,
+        SourceComponentFile.file_id == File.id))
+
+    q = select([literal(component.name), File.id]) \
+        .where(and_(cond, not_(already_member)))
+
+    if file_ids is not None:
+        q = q.where(File.id.in_(file_ids))
+
+    session.execute(SourceComponentFile.__table__.insert().from_select(
+        ['component_name', 'file_id'], q))
+
+
+def refresh_component_files(session, component_name=None):
+    """
+    Recompute the members of the given source component. If no component
+    name is given the whole membership table is rebuilt.
+    """
+    LOG.debug("Refreshing files of source component: %s",
+              component_name or 'all')
+
+    delete_q = session.query(SourceComponentFile)
+    components = session.query(SourceComponent)
+    if component_name is not None:
+        delete_q = delete_q.filter(
+            SourceComponentFile.component_name == component_name)
+        components = components.filter(
+            SourceComponent.name == component_name)
+    delete_q.delete(synchronize_session=False)
+
+    for component in components:
+        __insert_members(session, component)
+
+
+def add_files_to_components(session, file_ids, chunk_size=500):
+    """
+    Add the given (newly stored) files to the source components they belong
+    to. Files which are already members of a component are skipped.
+    """
+    file_ids = sorted(set(fid for fid in file_ids if fid is not None))
+    if not file_ids:
+        return
+
+    components = session.query(SourceComponent).all()
+    for component in components:
+        # SQLite limits the number of host parameters in a statement, so
+        # the file id list is processed in chunks.
+        for i in range(0, len(file_ids), chunk_size):
+            __insert_members(session, component,
+                             file_ids[i:i + chunk_size])
@@ -0,0 +1,32 @@
+"""Composite report indexes
+
+Revision ID: 5f6e9b0a7c3d
+Revises: f8291ab1d6be
+Create Date: 2019-07-29 11:42:08.532176
+
+Add composite indexes for the most frequent report query shapes.
+"""
+
+# revision identifiers, used by Alembic.
+revision = '5f6e9b0a7c3d'
+down_revision = 'f8291ab1d6be'
+branch_labels = None
+depends_on = None
+
+from alembic import op
+
+
+def upgrade():
+    op.create_index('ix_reports_run_id_detection_status', 'reports',
+                    ['run_id', 'detection_status'], unique=False)
+    op.create_index('ix_reports_run_id_checker_id_severity', 'reports',
+                    ['run_id', 'checker_id', 'severity'], unique=False)
+    op.create_index('ix_reports_run_id_bug_id', 'reports',
+                    ['run_id', 'bug_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_reports_run_id_bug_id', table_name='reports')
+    op.drop_index('ix_reports_run_id_checker_id_severity',
+                  table_name='reports')
+    op.drop_index('ix_reports_run_id_detection_status', table_name='reports')
@@ -0,0 +1,63 @@
+"""Report summaries
+
+Revision ID: a24461972d2e
+Revises: 6cb6a3a41967
+Create Date: 2019-07-15 10:21:03.415206
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = 'a24461972d2e'
+down_revision = '6cb6a3a41967'
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    op.create_table('report_summaries',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('run_id', sa.Integer(), nullable=True),
+        sa.Column('file_id', sa.Integer(), nullable=True),
+        sa.Column('checker_id', sa.String(), nullable=True),
+        sa.Column('severity', sa.Integer(), nullable=True),
+        sa.Column('detection_status', sa.String(), nullable=True),
+        sa.Column('review_status', sa.String(), nullable=True),
+        sa.Column('report_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['run_id'], [u'runs.id'],
+            name=op.f('fk_report_summaries_run_id_runs'),
+            ondelete=u'CASCADE', initially=u'DEFERRED', deferrable=True),
+        sa.ForeignKeyConstraint(['file_id'], [u'files.id'],
+            name=op.f('fk_report_summaries_file_id_files'),
+            ondelete=u'CASCADE', initially=u'DEFERRED', deferrable=True),
+        sa.PrimaryKeyConstraint('id', name=op.f('pk_report_summaries')))
+
+    op.create_index(op.f('ix_report_summaries_run_id'),
+                    'report_summaries', ['run_id'], unique=False)
+    op.create_index(op.f('ix_report_summaries_file_id'),
+                    'report_summaries', ['file_id'], unique=False)
+
+    # Fill the summary table with the already stored reports.
+    op.execute("""
+        INSERT INTO report_summaries (run_id, file_id, checker_id, severity,
+                                      detection_status, review_status,
+                                      report_count)
+        SELECT r.run_id, r.file_id, r.checker_id, r.severity,
+               CAST(r.detection_status AS VARCHAR),
+               COALESCE(CAST(rs.status AS VARCHAR), 'unreviewed'),
+               COUNT(*)
+        FROM reports r
+        LEFT OUTER JOIN review_statuses rs ON rs.bug_hash = r.bug_id
+        GROUP BY r.run_id, r.file_id, r.checker_id, r.severity,
+                 r.detection_status, rs.status
+    """)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_report_summaries_file_id'),
+                  table_name='report_summaries')
+    op.drop_index(op.f('ix_report_summaries_run_id'),
+                  table_name='report_summaries')
+    op.drop_table('report_summaries')
@@ -0,0 +1,38 @@
+"""Analyzer resource usage
+
+Revision ID: c3a1f7e2d845
+Revises: 5f6e9b0a7c3d
+Create Date: 2019-08-05 10:12:31.846302
+
+Store the resource usage of the analyzers measured by the analysis.
+"""
+
+# revision identifiers, used by Alembic.
+revision = 'c3a1f7e2d845'
+down_revision = '5f6e9b0a7c3d'
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    op.add_column('analyzer_statistics',
+                  sa.Column('analysis_time', sa.Float(), nullable=True))
+    op.add_column('analyzer_statistics',
+                  sa.Column('cpu_time', sa.Float(), nullable=True))
+    op.add_column('analyzer_statistics',
+                  sa.Column('max_rss', sa.BigInteger(), nullable=True))
+    op.add_column('analyzer_statistics',
+                  sa.Column('output_size', sa.BigInteger(), nullable=True))
+    op.add_column('analyzer_statistics',
+                  sa.Column('resource_usage', sa.Binary(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('analyzer_statistics', 'resource_usage')
+    op.drop_column('analyzer_statistics', 'output_size')
+    op.drop_column('analyzer_statistics', 'max_rss')
+    op.drop_column('analyzer_statistics', 'cpu_time')
+    op.drop_column('analyzer_statistics', 'analysis_time')
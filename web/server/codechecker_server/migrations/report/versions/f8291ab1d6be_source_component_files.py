@@ -0,0 +1,79 @@
+"""Source component files
+
+Revision ID: f8291ab1d6be
+Revises: a24461972d2e
+Create Date: 2019-07-22 14:05:47.108315
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = 'f8291ab1d6be'
+down_revision = 'a24461972d2e'
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    op.create_table('source_component_files',
+        sa.Column('component_name', sa.String(), nullable=False),
+        sa.Column('file_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['component_name'],
+            [u'source_components.name'],
+            name=op.f('fk_source_component_files_component_name_'
+                      'source_components'),
+            ondelete=u'CASCADE', initially=u'DEFERRED', deferrable=True),
+        sa.ForeignKeyConstraint(['file_id'], [u'files.id'],
+            name=op.f('fk_source_component_files_file_id_files'),
+            ondelete=u'CASCADE', initially=u'DEFERRED', deferrable=True),
+        sa.PrimaryKeyConstraint('component_name', 'file_id',
+                                name=op.f('pk_source_component_files')))
+
+    op.create_index(op.f('ix_source_component_files_file_id'),
+                    'source_component_files', ['file_id'], unique=False)
+
+    # Fill the membership table with the files of the existing components.
+    conn = op.get_bind()
+
+    files = sa.table('files',
+                     sa.column('id', sa.Integer),
+                     sa.column('filepath', sa.String))
+    component_files = sa.table('source_component_files',
+                               sa.column('component_name', sa.String),
+                               sa.column('file_id', sa.Integer))
+
+    components = conn.execute(
+        "SELECT name, value FROM source_components").fetchall()
+
+    for name, value in components:
+        skip, include = [], []
+        for line in bytes(value).decode('utf-8').split('\n'):
+            if not line:
+                continue
+
+            path = line[1:].strip().replace('*', '%')
+            if line[0] == '+':
+                include.append(path)
+            elif line[0] == '-':
+                skip.append(path)
+
+        if not include and not skip:
+            continue
+
+        cond = [~files.c.filepath.like(path) for path in skip]
+        if include:
+            cond.append(sa.or_(*[files.c.filepath.like(path)
+                                 for path in include]))
+
+        conn.execute(component_files.insert().from_select(
+            ['component_name', 'file_id'],
+            sa.select([sa.literal(name), files.c.id])
+            .where(sa.and_(*cond))))
+
+
+def downgrade():
+    op.drop_index(op.f('ix_source_component_files_file_id'),
+                  table_name='source_component_files')
+    op.drop_table('source_component_files')
@@ -0,0 +1,135 @@
+# -------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -------------------------------------------------------------------------
+"""
+Result cache for the report queries of a product.
+
+Cached results are tagged with the generation counters of the runs they were
+calculated from. Every operation which changes the stored results of a run
+(storage, removal, review status change, etc.) bumps the generation of the
+affected runs, so entries depending on them are not served anymore.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+from collections import defaultdict, OrderedDict
+import threading
+
+from codechecker_common.logger import get_logger
+
+LOG = get_logger('server')
+
+
+def normalize(value):
+    """
+    Convert the given API argument to a hashable value which can be used as
+    a part of a cache key. Thrift structures are converted to a tuple of
+    their fields.
+    """
+    if hasattr(value, 'thrift_spec'):
+        return (value.__class__.__name__,) + \
+            tuple((k, normalize(v)) for k, v in sorted(vars(value).items()))
+    elif isinstance(value, (list, tuple)):
+        return tuple(normalize(v) for v in value)
+    elif isinstance(value, set):
+        return tuple(sorted(normalize(v) for v in value))
+    elif isinstance(value, dict):
+        return tuple(sorted((k, normalize(v)) for k, v in value.items()))
+
+    return value
+
+
+class QueryResultCache(object):
+    """
+    LRU cache of query results invalidated by run generation counters.
+
+    A cached entry depends either on a list of runs or on every run of the
+    product. The latter is tracked by a product wide generation counter which
+    is bumped together with the generation of any run.
+    """
+
+    def __init__(self, max_entries=1000):
+        self.__max_entries = max_entries
+        self.__lock = threading.Lock()
+        self.__entries = OrderedDict()
+        self.__run_generations = defaultdict(int)
+        self.__product_generation = 0
+        self.__hits = 0
+        self.__misses = 0
+
+    @property
+    def enabled(self):
+        return self.__max_entries > 0
+
+    @property
+    def statistics(self):
+        """ Returns the number of cache hits and misses. """
+        return self.__hits, self.__misses
+
+    def generation_tag(self, run_ids=None):
+        """
+        Returns the current generation tag of the given runs. If no run id
+        list is given the tag belongs to all of the runs of the product.
+
+        The tag has to be taken before the query is executed, so a result
+        calculated in parallel with a modification is never served later.
+        """
+        with self.__lock:
+            if not run_ids:
+                return self.__product_generation
+
+            return tuple((run_id, self.__run_generations[run_id])
+                         for run_id in sorted(set(run_ids)))
+
+    def get(self, key, tag):
+        """
+        Returns a (found, value) tuple for the given key. The entry is only
+        found if it was stored with the same generation tag.
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None or entry[0] != tag:
+                self.__misses += 1
+                return False, None
+
+            # Move the entry to the end of the LRU list.
+            del self.__entries[key]
+            self.__entries[key] = entry
+            self.__hits += 1
+
+            return True, entry[1]
+
+    def put(self, key, tag, value):
+        """ Store the value of the given key with the given tag. """
+        if not self.enabled:
+            return
+
+        with self.__lock:
+            self.__entries.pop(key, None)
+            self.__entries[key] = (tag, value)
+
+            while len(self.__entries) > self.__max_entries:
+                self.__entries.popitem(last=False)
+
+    def bump(self, run_ids):
+        """
+        Invalidate the cached results which depend on the given runs.
+        """
+        with self.__lock:
+            self.__product_generation += 1
+            for run_id in run_ids:
+                self.__run_generations[run_id] += 1
+
+        LOG.debug("Query cache generation bumped for runs: %s",
+                  ', '.join(map(str, run_ids)))
+
+    def clear(self):
+        """ Invalidate every cached result. """
+        with self.__lock:
+            self.__entries.clear()
+            self.__product_generation += 1
+            for run_id in self.__run_generations:
+                self.__run_generations[run_id] += 1
@@ -66,6 +66,7 @@ from .database import db_cleanup
 from .database.config_db_model import Product as ORMProduct, \
     Configuration as ORMConfiguration
 from .database.run_db_model import IDENTIFIER as RUN_META, Run, RunLock
+from .query_cache import QueryResultCache
 
 LOG = get_logger('server')
 
@@ -559,7 +560,7 @@ class Product(object):
     # connect() call so the next could be made.
     CONNECT_RETRY_TIMEOUT = 300
 
-    def __init__(self, orm_object, context, check_env):
+    def __init__(self, orm_object, context, check_env, query_cache_size=0):
         """
         Set up a new managed product object for the configuration given.
         """
@@ -573,6 +574,7 @@ class Product(object):
         self.__engine = None
         self.__session = None
         self.__db_status = DBStatus.MISSING
+        self.__query_cache = QueryResultCache(query_cache_size)
 
         self.__last_connect_attempt = None
 
@@ -602,6 +604,13 @@ class Product(object):
         """
         return self.__session
 
+    @property
+    def query_cache(self):
+        """
+        Returns the result cache of the report queries of this product.
+        """
+        return self.__query_cache
+
     @property
     def driver_name(self):
         """
@@ -871,7 +880,8 @@ class CCSimpleHttpServer(HTTPServer):
 
         prod = Product(orm_product,
                        self.context,
-                       self.check_env)
+                       self.check_env,
+                       self.manager.get_query_cache_size())
 
         # Update the product database status.
         prod.connect()
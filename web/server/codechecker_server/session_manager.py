@@ -183,6 +183,7 @@ class SessionManager(object):
         self.__worker_processes = get_worker_processes(scfg_dict)
         self.__max_run_count = scfg_dict.get('max_run_count', None)
         self.__store_config = scfg_dict.get('store', {})
+        self.__query_cache_size = scfg_dict.get('query_cache_size', 1000)
         self.__auth_config = scfg_dict['authentication']
 
         if force_auth:
@@ -606,6 +607,13 @@ class SessionManager(object):
         """
         return self.__max_run_count
 
+    def get_query_cache_size(self):
+        """
+        Returns the maximum number of cached report query results per product.
+        If the value is 0 the query result cache is disabled.
+        """
+        return self.__query_cache_size
+
     def get_analysis_statistics_dir(self):
         """
         Get directory where the compressed analysis statistics files should be
@@ -0,0 +1,87 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+""" Unit tests for the report query result cache. """
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import unittest
+
+from codechecker_server.query_cache import normalize, QueryResultCache
+
+
+class FakeFilter(object):
+    """ Mimics a generated Thrift structure. """
+    thrift_spec = None
+
+    def __init__(self, **kwargs):
+        self.filepath = None
+        self.checkerName = None
+        for key, value in kwargs.items():
+            setattr(self, key, value)
+
+
+class QueryResultCacheTest(unittest.TestCase):
+    """
+    Test the generation based invalidation of the query result cache.
+    """
+
+    def test_normalize(self):
+        """ Equal API arguments give equal hashable keys. """
+        key1 = normalize(([1, 2], FakeFilter(filepath=['*.c'])))
+        key2 = normalize(([1, 2], FakeFilter(filepath=['*.c'])))
+        key3 = normalize(([1, 2], FakeFilter(checkerName=['*.c'])))
+
+        self.assertEqual(key1, key2)
+        self.assertEqual(hash(key1), hash(key2))
+        self.assertNotEqual(key1, key3)
+
+    def test_run_invalidation(self):
+        """ Bumping a run drops only the results depending on it. """
+        cache = QueryResultCache()
+        cache.put('run1', cache.generation_tag([1]), 'result1')
+        cache.put('run2', cache.generation_tag([2]), 'result2')
+        cache.put('all', cache.generation_tag(), 'all')
+
+        cache.bump([1])
+
+        self.assertEqual(cache.get('run1', cache.generation_tag([1])),
+                         (False, None))
+        self.assertEqual(cache.get('run2', cache.generation_tag([2])),
+                         (True, 'result2'))
+        self.assertEqual(cache.get('all', cache.generation_tag()),
+                         (False, None))
+        self.assertEqual(cache.statistics, (1, 2))
+
+    def test_stale_tag(self):
+        """ Result calculated in parallel with a bump is not served. """
+        cache = QueryResultCache()
+        tag = cache.generation_tag([1])
+        cache.bump([1])
+        cache.put('run1', tag, 'stale')
+
+        self.assertEqual(cache.get('run1', cache.generation_tag([1])),
+                         (False, None))
+
+    def test_lru_limit(self):
+        """ The least recently used entries are evicted. """
+        cache = QueryResultCache(2)
+        cache.put('a', 0, 'a')
+        cache.put('b', 0, 'b')
+        cache.get('a', 0)
+        cache.put('c', 0, 'c')
+
+        self.assertEqual(cache.get('a', 0), (True, 'a'))
+        self.assertEqual(cache.get('b', 0), (False, None))
+        self.assertEqual(cache.get('c', 0), (True, 'c'))
+
+    def test_disabled(self):
+        """ Nothing is stored when the cache size is zero. """
+        cache = QueryResultCache(0)
+        cache.put('a', 0, 'a')
+
+        self.assertFalse(cache.enabled)
+        self.assertEqual(cache.get('a', 0), (False, None))
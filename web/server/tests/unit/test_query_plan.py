@@ -0,0 +1,56 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+""" Unit tests for the report query plan checker. """
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import unittest
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from codechecker_server.database import query_plan
+from codechecker_server.database.run_db_model import Base
+
+
+class QueryPlanTest(unittest.TestCase):
+    """
+    Test the detection of sequential scans in the report query plans.
+    """
+
+    def test_postgresql_plan(self):
+        """ Sequential scans are found in PostgreSQL plans. """
+        plan = ['Hash Join  (cost=1.04..2.10 rows=1 width=4)',
+                '  ->  Seq Scan on reports  (cost=0.00..1.03 rows=3)',
+                '  ->  Index Scan using ix_files_id on files']
+
+        self.assertEqual(query_plan.sequential_scans('postgresql', plan),
+                         ['reports'])
+
+    def test_sqlite_plan(self):
+        """ Sequential scans are found in SQLite plans. """
+        plan = ['SCAN TABLE reports',
+                'SCAN runs USING COVERING INDEX sqlite_autoindex_runs_1',
+                'SEARCH files USING INTEGER PRIMARY KEY (rowid=?)',
+                'SCAN SUBQUERY 1']
+
+        self.assertEqual(query_plan.sequential_scans('sqlite', plan),
+                         ['reports'])
+
+    def test_report_indexes(self):
+        """ The report query shapes do not scan the reports table. """
+        engine = create_engine('sqlite://')
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+
+        results = query_plan.explain_query_shapes(session)
+        session.close()
+
+        self.assertEqual(len(results), len(query_plan.QUERY_SHAPES))
+        for name, plan, seq_scans in results:
+            self.assertTrue(plan, name)
+            self.assertNotIn('reports', seq_scans, name)
@@ -0,0 +1,88 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+""" Unit tests for the report summary maintenance. """
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+from datetime import datetime
+import unittest
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from codechecker_server.database import report_summary
+from codechecker_server.database.run_db_model import Base, File, \
+    FileContent, Report, ReportSummary, ReviewStatus, Run
+
+
+class ReportSummaryTest(unittest.TestCase):
+    """
+    Test the pre-aggregated report count maintenance.
+    """
+
+    def setUp(self):
+        engine = create_engine('sqlite://')
+        Base.metadata.create_all(engine)
+        self.session = sessionmaker(bind=engine)()
+
+        self.session.add(Run('run1', '1.0', 'cmd'))
+        self.session.add(Run('run2', '1.0', 'cmd'))
+        self.session.add(FileContent('hash', 'content'))
+        self.session.flush()
+
+        source_file = File('/src/main.c', 'hash')
+        self.session.add(source_file)
+        self.session.flush()
+
+        for run_id, bug_hash in [(1, 'a'), (1, 'a'), (1, 'b'), (2, 'a')]:
+            self.session.add(Report(run_id, bug_hash, source_file.id, 'msg',
+                                    'core.DivideZero', 'cat', 'type', 1, 1,
+                                    3, 'new', datetime.now(), 1))
+        self.session.flush()
+
+    def tearDown(self):
+        self.session.close()
+
+    def __summary(self):
+        return sorted(self.session.query(ReportSummary.run_id,
+                                         ReportSummary.review_status,
+                                         ReportSummary.report_count))
+
+    def test_refresh(self):
+        """ Summaries are recalculated from the reports table. """
+        report_summary.refresh_run_summaries(self.session)
+
+        self.assertEqual(self.__summary(),
+                         [(1, 'unreviewed', 3), (2, 'unreviewed', 1)])
+        self.assertEqual(report_summary.check_consistency(self.session), [])
+
+    def test_review_status_change(self):
+        """ Review status change moves the counts in every run. """
+        report_summary.refresh_run_summaries(self.session)
+
+        review_status = ReviewStatus()
+        review_status.bug_hash = 'a'
+        review_status.status = 'confirmed'
+        review_status.author = 'user'
+        review_status.message = b''
+        review_status.date = datetime.now()
+        self.session.add(review_status)
+
+        report_summary.update_review_status(self.session, 'a', None,
+                                            'confirmed')
+
+        self.assertEqual(self.__summary(),
+                         [(1, 'confirmed', 2), (1, 'unreviewed', 1),
+                          (2, 'confirmed', 1)])
+        self.assertEqual(report_summary.check_consistency(self.session), [])
+
+    def test_inconsistency(self):
+        """ Missing summary rows are reported per run. """
+        report_summary.refresh_run_summaries(self.session, [1])
+
+        self.assertEqual(report_summary.check_consistency(self.session),
+                         [(2, 0, 1)])
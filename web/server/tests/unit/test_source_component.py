@@ -0,0 +1,82 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+""" Unit tests for the source component membership maintenance. """
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import unittest
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from codechecker_server.database import source_component
+from codechecker_server.database.run_db_model import Base, File, \
+    FileContent, SourceComponent, SourceComponentFile
+
+
+class SourceComponentTest(unittest.TestCase):
+    """
+    Test the maintenance of the source component membership table.
+    """
+
+    def setUp(self):
+        engine = create_engine('sqlite://')
+        Base.metadata.create_all(engine)
+        self.session = sessionmaker(bind=engine)()
+
+        self.session.add(FileContent('hash', 'content'))
+        self.session.flush()
+
+        for path in ['/a/b/x.cpp', '/a/b/y.cpp', '/a/c/z.cpp']:
+            self.session.add(File(path, 'hash'))
+
+        self.session.add(SourceComponent('b', '+/a/b/*\n-/a/b/y.cpp'))
+        self.session.add(SourceComponent('not_c', '-/a/c/*'))
+        self.session.add(SourceComponent('empty', ''))
+        self.session.flush()
+
+    def tearDown(self):
+        self.session.close()
+
+    def __members(self):
+        return sorted(
+            (name, path) for name, path in
+            self.session.query(SourceComponentFile.component_name,
+                               File.filepath)
+            .join(File, SourceComponentFile.file_id == File.id))
+
+    def test_split_value(self):
+        """ Component values are split to skip and include lists. """
+        self.assertEqual(
+            source_component.split_component_value(
+                '+/a/b/x.cpp\n+/a/b/y.cpp\n-/a/b\n'),
+            (['/a/b'], ['/a/b/x.cpp', '/a/b/y.cpp']))
+
+    def test_refresh(self):
+        """ Members are calculated from the path patterns. """
+        source_component.refresh_component_files(self.session)
+
+        self.assertEqual(self.__members(),
+                         [('b', '/a/b/x.cpp'),
+                          ('not_c', '/a/b/x.cpp'),
+                          ('not_c', '/a/b/y.cpp')])
+
+    def test_new_files(self):
+        """ Newly stored files are added to the matching components. """
+        source_component.refresh_component_files(self.session, 'b')
+
+        new_file = File('/a/b/w.cpp', 'hash')
+        self.session.add(new_file)
+        self.session.flush()
+
+        source_component.add_files_to_components(self.session,
+                                                 [new_file.id, None])
+
+        self.assertEqual(self.__members(),
+                         [('b', '/a/b/w.cpp'),
+                          ('b', '/a/b/x.cpp'),
+                          ('not_c', '/a/b/w.cpp')])
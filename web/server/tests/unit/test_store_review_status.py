@@ -0,0 +1,88 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+""" Unit tests for the review statuses set by a store. """
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+from datetime import datetime
+import unittest
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from codechecker_server.api.report_server import invalidate_bug_hashes
+from codechecker_server.database.run_db_model import Base, File, \
+    FileContent, Report, Run
+from codechecker_server.query_cache import QueryResultCache
+
+
+class StoreReviewStatusTest(unittest.TestCase):
+    """
+    Test the invalidation of the cached results by the review statuses of
+    the source code comments.
+    """
+
+    def setUp(self):
+        engine = create_engine('sqlite://')
+        Base.metadata.create_all(engine)
+        self.Session = sessionmaker(bind=engine)
+
+        session = self.Session()
+        runs = [Run(name, '1.0', 'cmd') for name in ['run1', 'run2', 'run3']]
+        session.add_all(runs)
+        session.add(FileContent('content_hash', 'content'))
+        session.flush()
+
+        source = File('/main.c', 'content_hash')
+        session.add(source)
+        session.flush()
+
+        for run, bug_hash in zip(runs, ['hash', 'hash', 'other']):
+            session.add(Report(run.id, bug_hash, source.id, 'Division by zero',
+                               'core.DivideZero', 'Logic error',
+                               'Division by zero', 3, 12, 'HIGH', 'new',
+                               datetime.now(), 1))
+        session.commit()
+
+        self.run_ids = [run.id for run in runs]
+        session.close()
+
+        self.query_cache = QueryResultCache()
+
+    def __put(self, run_id):
+        self.query_cache.put(run_id, self.query_cache.generation_tag([run_id]),
+                             'cached')
+
+    def __is_cached(self, run_id):
+        found, _ = self.query_cache.get(
+            run_id, self.query_cache.generation_tag([run_id]))
+        return found
+
+    def test_review_status_of_other_run(self):
+        """ The review status invalidates every run of the bug hash. """
+        for run_id in self.run_ids:
+            self.__put(run_id)
+
+        session = self.Session()
+        invalidate_bug_hashes(session, self.query_cache, set(['hash']))
+        session.close()
+
+        self.assertEqual([self.__is_cached(run_id)
+                          for run_id in self.run_ids],
+                         [False, False, True])
+
+    def test_no_bug_hashes(self):
+        """ Nothing is invalidated without changed review statuses. """
+        for run_id in self.run_ids:
+            self.__put(run_id)
+
+        session = self.Session()
+        invalidate_bug_hashes(session, self.query_cache, set())
+        session.close()
+
+        self.assertTrue(all(self.__is_cached(run_id)
+                            for run_id in self.run_ids))